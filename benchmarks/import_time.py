@@ -0,0 +1,79 @@
+# Description: Guards the import of the quoridor package: importing it must print nothing and must stay cheap, since
+#              every worker process of a process pool imports it again. Every module is imported in a fresh
+#              interpreter several times, and the median time over a bare interpreter start is compared with a
+#              budget. The modules are found with pkgutil, so a new module is guarded as soon as it is added; the
+#              numpy-backed ones are exempt from the budget, since importing numpy alone takes longer, but must
+#              still print nothing. The script exits with 1 if an import prints anything or goes over the budget.
+#              Run it from the repository root:
+#                  python benchmarks/import_time.py [--repeat N] [--budget-ms MS] [module ...]
+
+import argparse
+import os
+import pkgutil
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import quoridor  # noqa: E402
+
+# the modules which import numpy, exempt from the budget
+BUDGET_EXEMPT_MODULES = {'quoridor.batch', 'quoridor.features'}
+DEFAULT_MODULES = ['quoridor'] + sorted('quoridor.' + module_info.name
+                                        for module_info in pkgutil.iter_modules(quoridor.__path__)
+                                        if module_info.name != '__main__')
+
+
+def time_statement(statement, repeat):
+    """
+    Takes a Python statement and an amount of runs, runs the statement that many times in a fresh interpreter
+    started from the repository root, and returns a tuple of the median seconds of a run and the output of the last
+    run.
+    """
+    seconds_list = []
+    output = b''
+    for _ in range(0, repeat):
+        start_time = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-c', statement], cwd=ROOT, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, check=True)
+        seconds_list.append(time.perf_counter() - start_time)
+        output = completed.stdout
+    return statistics.median(seconds_list), output
+
+
+def main():
+    """
+    Times the import of every module, prints a table and returns the exit code.
+    """
+    parser = argparse.ArgumentParser(description='Check that importing the quoridor package is silent and cheap.')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help='modules to import')
+    parser.add_argument('--repeat', type=int, default=7, help='fresh interpreters per module')
+    parser.add_argument('--budget-ms', type=float, default=50.0,
+                        help='most milliseconds an import may add to a bare interpreter start')
+    args = parser.parse_args()
+    base_seconds = time_statement('pass', args.repeat)[0]
+    print('bare interpreter start: %.1f ms' % (base_seconds * 1000))
+    print('%-26s %10s  %s' % ('module', 'import ms', 'result'))
+    failed = False
+    for module in args.modules:
+        seconds, output = time_statement('import %s' % module, args.repeat)
+        import_ms = (seconds - base_seconds) * 1000
+        if output:
+            result = 'FAIL: printed %d bytes' % len(output)
+            failed = True
+        elif module in BUDGET_EXEMPT_MODULES:
+            result = 'ok (exempt from the budget)'
+        elif import_ms > args.budget_ms:
+            result = 'FAIL: over the %.0f ms budget' % args.budget_ms
+            failed = True
+        else:
+            result = 'ok'
+        print('%-26s %10.1f  %s' % (module, import_ms, result))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+# Description: Shows how the playouts per second of ParallelMCTS scale with the amount of worker processes. Every
+#              worker runs the same amount of playouts from the same position, so with perfect scaling the playouts per
+#              second grow linearly with the workers. Run it from the repository root:
+#                  python benchmarks/mcts_scaling.py [playouts per worker]
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from quoridor import QuoridorGame
+from quoridor.mcts import ParallelMCTS
+
+
+def main():
+    """
+    Runs the search with 1, 2, 4, ... workers up to the amount of cores and prints the playouts per second and the
+    speed-up over one worker for each.
+    """
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    game = QuoridorGame()
+    worker_amounts = [1]
+    while worker_amounts[-1] * 2 <= (os.cpu_count() or 1):
+        worker_amounts.append(worker_amounts[-1] * 2)
+    if worker_amounts[-1] != (os.cpu_count() or 1):
+        worker_amounts.append(os.cpu_count() or 1)
+    base_rate = None
+    print('workers  playouts  seconds  playouts/s  speed-up  efficiency')
+    for workers in worker_amounts:
+        with ParallelMCTS(workers=workers, iterations=iterations, seed=1) as mcts:
+            # warm the pool up so process start-up is not measured
+            mcts.search(game)
+            result = mcts.search(game)
+        rate = result['playouts_per_second']
+        if base_rate is None:
+            base_rate = rate
+        print('%7d  %8d  %7.2f  %10.1f  %8.2f  %9.0f%%' % (workers, result['playouts'], result['seconds'], rate,
+                                                             rate / base_rate, 100 * rate / base_rate / workers))
+
+
+if __name__ == '__main__':
+    main()
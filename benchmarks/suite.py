@@ -0,0 +1,350 @@
+# Description: A reproducible benchmark suite for the hot paths of QuoridorGame and for whole games. Every scenario is
+#              built from seeded random games, so the same seed measures the same calls on every run:
+#                  move_pawn.step, move_pawn.jump, move_pawn.diagonal      one call of move_pawn per position
+#                  place_fence.accepted, place_fence.fair_play_rejected    one call of place_fence per position
+#                  no_room_left.crowded                                    _if_no_room_left_for_this_player on boards
+#                                                                          with many fences
+#                  full_game.moves_per_second, full_game.peak_bytes        random games played to the end
+#              Each scenario is timed for several rounds on fresh copies of its positions, and the best round is
+#              kept, since the slower rounds mostly measure whatever else the machine was doing. The results are
+#              written to a JSON file, and a previous one can be given to compare against: the script exits with 1 if
+#              a result got worse by more than the threshold. Run it from the repository root:
+#                  python benchmarks/suite.py [--output FILE] [--compare BASELINE] [--threshold 0.1] [--seed N]
+#                                             [--quick] [scenario name prefix ...]
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from quoridor import QuoridorGame
+
+FORMAT_VERSION = 1
+CROWDED_FENCE_AMOUNT = 12
+
+
+def play_random_game(game, rng, fence_probability=0.15, path_probability=0.6, max_moves=400, state_list=None):
+    """
+    Takes a two-player QuoridorGame, a random.Random, the chance of trying a random fence slot on a turn, the chance
+    of stepping along a shortest path instead of making a random pawn move, the most moves to play and an optional
+    list, and plays the game with move_pawn and place_fence until a player wins, the player to move has no move or
+    the move limit is reached. If a list is given, the state of the game before every move is appended to it.
+    Returns the amount of moves made.
+    """
+    board_size = game.get_board_size()
+    move_amount = 0
+    while move_amount < max_moves and not game.is_winner(1) and not game.is_winner(2):
+        player_id = game.get_which_turn()
+        if state_list is not None:
+            state_list.append(game.get_state())
+        if game.get_fence_amount(player_id) > 0 and rng.random() < fence_probability:
+            fence_address = (rng.randrange(board_size), rng.randrange(board_size))
+            if game.place_fence(player_id, rng.choice('vh'), fence_address) is True:
+                move_amount += 1
+                continue
+        pawn_moves = game.legal_pawn_moves(player_id)
+        if not pawn_moves:
+            break
+        pawn_aiming_address = rng.choice(pawn_moves)
+        if rng.random() < path_probability:
+            path = game.shortest_path(player_id)
+            if path is not None and len(path) > 1 and path[1] in pawn_moves:
+                pawn_aiming_address = path[1]
+        game.move_pawn(player_id, pawn_aiming_address)
+        move_amount += 1
+    return move_amount
+
+
+def position_pool(rng, game_amount, fence_probability):
+    """
+    Takes a random.Random, an amount of games and the chance of trying a fence on a turn, plays that many random games
+    and returns the list of the states before every move.
+    """
+    state_list = []
+    for _ in range(0, game_amount):
+        play_random_game(QuoridorGame(), rng, fence_probability, state_list=state_list)
+    return state_list
+
+
+def _scenario_rng(seed, name):
+    """
+    Takes the suite seed and a scenario name and returns the random.Random of that scenario, so that every scenario
+    gets the same positions whichever other scenarios are run.
+    """
+    return random.Random('%d:%s' % (seed, name))
+
+
+def _pawn_move_kind(from_address, to_address):
+    """
+    Takes the cell a pawn moves from and the cell it moves to and returns 'step', 'jump' or 'diagonal'.
+    """
+    diff_x = abs(to_address[0] - from_address[0])
+    diff_y = abs(to_address[1] - from_address[1])
+    if diff_x + diff_y == 1:
+        return 'step'
+    if diff_x == 1 and diff_y == 1:
+        return 'diagonal'
+    return 'jump'
+
+
+def move_pawn_samples(rng, sample_amount, kind):
+    """
+    Takes a random.Random, the amount of samples and the kind of pawn move ('step', 'jump' or 'diagonal'), and returns
+    a list of (state, (player_id, cell)) samples for which move_pawn makes a move of that kind. For jumps and diagonal
+    moves the other pawn is put next to the pawn to move, since random games seldom bring the pawns together.
+    """
+    pool = position_pool(rng, max(4, sample_amount // 40), 0.15)
+    sample_list = []
+    while len(sample_list) < sample_amount:
+        which_turn, player_states, fence_list = rng.choice(pool)
+        curr_pos = player_states[which_turn - 1][0]
+        if kind != 'step':
+            diff_x, diff_y = rng.choice(((0, -1), (1, 0), (0, 1), (-1, 0)))
+            oppo_pos = (curr_pos[0] + diff_x, curr_pos[1] + diff_y)
+            if not (0 <= oppo_pos[0] < 9 and 0 <= oppo_pos[1] < 9):
+                continue
+            oppo_index = 1 if which_turn == 1 else 0
+            player_state_list = list(player_states)
+            player_state_list[oppo_index] = (oppo_pos,) + player_states[oppo_index][1:]
+            player_states = tuple(player_state_list)
+        state = (which_turn, player_states, fence_list)
+        game = QuoridorGame.from_state(state)
+        aiming_list = [pawn_aiming_address for pawn_aiming_address in game.legal_pawn_moves(which_turn)
+                       if _pawn_move_kind(curr_pos, pawn_aiming_address) == kind]
+        if aiming_list:
+            sample_list.append((state, (which_turn, rng.choice(aiming_list))))
+    return sample_list
+
+
+def place_fence_samples(rng, sample_amount, rejected):
+    """
+    Takes a random.Random, the amount of samples and whether the fences should break the fair-play rule, and returns
+    a list of (state, (player_id, v or h, fence address)) samples: fences place_fence accepts, or fences on free slots
+    which it turns down with 'breaks the fair play rule'. The rejected fences are looked for on crowded boards.
+    """
+    pool = position_pool(rng, max(4, sample_amount // 20), 0.5 if rejected else 0.15)
+    if rejected:
+        pool = [state for state in pool if len(state[2]) >= CROWDED_FENCE_AMOUNT]
+    sample_list = []
+    attempts = 0
+    while len(sample_list) < sample_amount and attempts < 50 * sample_amount:
+        attempts += 1
+        state = rng.choice(pool)
+        which_turn = state[0]
+        game = QuoridorGame.from_state(state)
+        if not rejected:
+            fence_list = game.legal_fences(which_turn)
+            if fence_list:
+                v_or_h, fence_address = rng.choice(fence_list)
+                sample_list.append((state, (which_turn, v_or_h, fence_address)))
+            continue
+        legal_mask = game.legal_fence_mask(which_turn)[0]
+        fence_list = []
+        for move_index in range(81, game.get_move_amount()):
+            v_or_h, fence_address = game.index_move(move_index)
+            if not legal_mask[move_index] and game._if_fence_exist(fence_address, v_or_h) is False:
+                fence_list.append((v_or_h, fence_address))
+        rng.shuffle(fence_list)
+        for v_or_h, fence_address in fence_list[:4]:
+            if game.place_fence(which_turn, v_or_h, fence_address) == 'breaks the fair play rule':
+                sample_list.append((state, (which_turn, v_or_h, fence_address)))
+                break
+    return sample_list
+
+
+def no_room_left_samples(rng, sample_amount):
+    """
+    Takes a random.Random and the amount of samples, and returns a list of (state, (player_id, (v or h, fence
+    address))) samples on boards with many fences: the check place_fence makes for the opponent of the player to move,
+    for a random free fence slot.
+    """
+    pool = position_pool(rng, max(4, sample_amount // 20), 0.5)
+    pool = [state for state in pool if len(state[2]) >= CROWDED_FENCE_AMOUNT]
+    sample_list = []
+    while len(sample_list) < sample_amount:
+        state = rng.choice(pool)
+        game = QuoridorGame.from_state(state)
+        v_or_h = rng.choice('vh')
+        fence_address = (rng.randrange(9), rng.randrange(9))
+        if game._if_fence_exist(fence_address, v_or_h) is False:
+            sample_list.append((state, (2 if state[0] == 1 else 1, (v_or_h, fence_address))))
+    return sample_list
+
+
+def time_calls(method_name, sample_list, rounds):
+    """
+    Takes the name of a QuoridorGame method, a list of (state, argument tuple) samples and an amount of rounds. Every
+    round builds a fresh game for each sample, then calls the method once on each of them with the garbage collector
+    off. Returns the list of the seconds per call of every round.
+    """
+    round_list = []
+    for _ in range(0, rounds):
+        call_list = [getattr(QuoridorGame.from_state(state), method_name) for state, _ in sample_list]
+        argument_list = [argument_tuple for _, argument_tuple in sample_list]
+        gc.collect()
+        gc.disable()
+        start_time = time.perf_counter()
+        for call, argument_tuple in zip(call_list, argument_list):
+            call(*argument_tuple)
+        seconds = time.perf_counter() - start_time
+        gc.enable()
+        round_list.append(seconds / len(sample_list))
+    return round_list
+
+
+def call_result(round_list, sample_amount):
+    """
+    Takes the seconds per call of every round and the amount of samples and returns the result dict of a call
+    scenario. Its value is the nanoseconds per call of the best round.
+    """
+    nanosecond_list = [seconds * 1e9 for seconds in round_list]
+    return {'unit': 'ns/call', 'higher_is_better': False, 'value': min(nanosecond_list),
+            'median': statistics.median(nanosecond_list), 'rounds': nanosecond_list, 'samples': sample_amount}
+
+
+def full_game_results(seed, game_amount, rounds, memory_game_amount):
+    """
+    Takes the suite seed, the amount of games, the amount of rounds and the amount of games to trace the memory of,
+    plays the same seeded random games in every round and returns a dict of two results: the moves per second of the
+    best round, and the peak memory allocated while playing one game (constructing it included), traced with
+    tracemalloc on separate runs since tracing slows the games down.
+    """
+    QuoridorGame()  # the cached tables are built once for the whole process, so they are not counted per game
+    rate_list = []
+    move_amount = 0
+    for _ in range(0, rounds):
+        rng = _scenario_rng(seed, 'full_game')
+        move_amount = 0
+        gc.collect()
+        start_time = time.perf_counter()
+        for _ in range(0, game_amount):
+            move_amount += play_random_game(QuoridorGame(), rng)
+        rate_list.append(move_amount / (time.perf_counter() - start_time))
+    peak_list = []
+    rng = _scenario_rng(seed, 'full_game')
+    for _ in range(0, memory_game_amount):
+        gc.collect()
+        tracemalloc.start()
+        play_random_game(QuoridorGame(), rng)
+        peak_list.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        'full_game.moves_per_second': {'unit': 'moves/s', 'higher_is_better': True,
+                                       'value': max(rate_list), 'median': statistics.median(rate_list),
+                                       'rounds': rate_list, 'games': game_amount,
+                                       'moves_per_game': move_amount / game_amount},
+        'full_game.peak_bytes': {'unit': 'bytes/game', 'higher_is_better': False,
+                                 'value': statistics.median(peak_list), 'max': max(peak_list),
+                                 'games': memory_game_amount},
+    }
+
+
+def run_suite(seed, sample_amount, game_amount, rounds, prefix_list):
+    """
+    Takes the seed, the amount of samples of each call scenario, the amount of full games, the amount of rounds and a
+    list of scenario name prefixes (an empty list runs everything), runs the scenarios and returns a dict of the
+    result dict of every scenario by name.
+    """
+    call_scenarios = [
+        ('move_pawn.step', 'move_pawn', lambda rng: move_pawn_samples(rng, sample_amount, 'step')),
+        ('move_pawn.jump', 'move_pawn', lambda rng: move_pawn_samples(rng, sample_amount, 'jump')),
+        ('move_pawn.diagonal', 'move_pawn', lambda rng: move_pawn_samples(rng, sample_amount, 'diagonal')),
+        ('place_fence.accepted', 'place_fence', lambda rng: place_fence_samples(rng, sample_amount, False)),
+        ('place_fence.fair_play_rejected', 'place_fence', lambda rng: place_fence_samples(rng, sample_amount, True)),
+        ('no_room_left.crowded', '_if_no_room_left_for_this_player',
+         lambda rng: no_room_left_samples(rng, sample_amount)),
+    ]
+    result_dict = {}
+    for name, method_name, make_samples in call_scenarios:
+        if prefix_list and not any(name.startswith(prefix) for prefix in prefix_list):
+            continue
+        sample_list = make_samples(_scenario_rng(seed, name))
+        if not sample_list:
+            continue
+        result_dict[name] = call_result(time_calls(method_name, sample_list, rounds), len(sample_list))
+        print('  %-32s %12.0f %s' % (name, result_dict[name]['value'], result_dict[name]['unit']), file=sys.stderr)
+    if not prefix_list or any('full_game'.startswith(prefix) or prefix.startswith('full_game')
+                              for prefix in prefix_list):
+        for name, result in full_game_results(seed, game_amount, rounds, max(1, game_amount // 10)).items():
+            result_dict[name] = result
+            print('  %-32s %12.0f %s' % (name, result['value'], result['unit']), file=sys.stderr)
+    return result_dict
+
+
+def compare_results(result_dict, baseline_dict, threshold):
+    """
+    Takes the results of this run, the results of a previous run and the allowed relative change, prints a table of
+    the change of every scenario found in both and returns the list of the names of the scenarios which got worse by
+    more than the threshold.
+    """
+    worse_list = []
+    print('%-32s %14s %14s %9s' % ('scenario', 'baseline', 'this run', 'change'))
+    for name, result in result_dict.items():
+        if name not in baseline_dict or not baseline_dict[name]['value']:
+            continue
+        change = result['value'] / baseline_dict[name]['value'] - 1
+        got_worse = change < -threshold if result['higher_is_better'] else change > threshold
+        if got_worse:
+            worse_list.append(name)
+        print('%-32s %14.1f %14.1f %+8.1f%%%s' % (name, baseline_dict[name]['value'], result['value'], 100 * change,
+                                                  '  WORSE' if got_worse else ''))
+    return worse_list
+
+
+def main():
+    """
+    Parses the command line, runs the suite, writes the JSON file, compares it with the baseline if one is given and
+    returns the exit code.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the hot paths of QuoridorGame and whole games.')
+    parser.add_argument('scenarios', nargs='*', help='only run the scenarios whose names start with these')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON file to write the results to')
+    parser.add_argument('--compare', help='JSON file of a previous run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed relative change before failing')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--samples', type=int, default=2000, help='positions of each call scenario')
+    parser.add_argument('--games', type=int, default=100, help='games of the full game scenario')
+    parser.add_argument('--rounds', type=int, default=5, help='timed rounds of each scenario')
+    parser.add_argument('--quick', action='store_true', help='a tenth of the samples and games, and 3 rounds')
+    args = parser.parse_args()
+    if args.quick:
+        args.samples = max(1, args.samples // 10)
+        args.games = max(1, args.games // 10)
+        args.rounds = 3
+    print('running the benchmarks with seed %d' % args.seed, file=sys.stderr)
+    result_dict = run_suite(args.seed, args.samples, args.games, args.rounds, args.scenarios)
+    report = {
+        'format': FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'settings': {'seed': args.seed, 'samples': args.samples, 'games': args.games, 'rounds': args.rounds},
+        'machine': {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                    'platform': platform.platform(), 'processor': platform.machine(), 'cpu_count': os.cpu_count()},
+        'results': result_dict,
+    }
+    with open(args.output, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+    print('wrote %s' % args.output, file=sys.stderr)
+    if args.compare is None:
+        return 0
+    with open(args.compare) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get('settings') != report['settings']:
+        print('warning: the baseline was run with other settings: %s' % baseline.get('settings'), file=sys.stderr)
+    worse_list = compare_results(result_dict, baseline['results'], args.threshold)
+    if worse_list:
+        print('%d scenario(s) got worse by more than %.0f%%: %s' % (len(worse_list), 100 * args.threshold,
+                                                                    ', '.join(worse_list)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
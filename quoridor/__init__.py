@@ -0,0 +1,9 @@
+# Description: The quoridor package. Importing it only defines the game classes: no game is played, nothing is
+#              printed and no tables are built until a QuoridorGame is created. The engines, encoders and tools live in
+#              their own modules (quoridor.search, quoridor.mcts, quoridor.batch, ...) and are imported only when
+#              needed, so a worker process which only needs the rules starts quickly. The scripted demo game runs with
+#              python -m quoridor.
+
+from .game import QuoridorGame, Player
+
+__all__ = ['QuoridorGame', 'Player']
@@ -0,0 +1,5 @@
+# Description: The python -m quoridor entry point, which plays the scripted demo game.
+
+from .demo import main
+
+main()
@@ -0,0 +1,258 @@
+# Description: A memory-compact arena for hosting a very large number of live two-player 9x9 games. Every game of an
+#              arena is one fixed-size record of five 64-bit words in a single preallocated array('Q') shared by the
+#              whole arena, instead of a QuoridorGame with its players, its dict of fence lists and its distance maps:
+#                  word 0, 1   the horizontal fences placed, in the bit layout of quoridor.bitboard, low and high half
+#                  word 2, 3   the vertical fences placed, the same way
+#                  word 4      both pawn cells, both fence amounts, the turn, the winner and the generation of the slot
+#              The fences on the four sides of the board are the same for every game, so they are not stored: they are
+#              put back when a record is read. A game is used through an ArenaGame, a handle of two slots which
+#              exposes the same API as BitboardQuoridorGame (move_pawn, place_fence, is_winner, get_state, ...). The
+#              rules are not written again here: each call loads the record into one scratch BitboardQuoridorGame of
+#              the arena, runs the method there and writes the record back if the position changed. Records are
+#              read and written through BitboardQuoridorGame.load and BitboardQuoridorGame.pack.
+#              A released slot is reused by the next new game, and the generation stored in the record makes a handle
+#              of a released game fail instead of silently reading the game which took its slot.
+
+from array import array
+
+from .bitboard import BitboardQuoridorGame, bit_to_address
+
+_WORDS = 5
+_LOW_MASK = (1 << 64) - 1
+
+# the fields of the last word of a record, as (shift, mask)
+_PAWN_1 = (0, 0x7f)
+_PAWN_2 = (7, 0x7f)
+_FENCES_1 = (14, 0x1f)
+_FENCES_2 = (19, 0x1f)
+_TURN = (24, 0x3)
+_WINNER = (26, 0x3)
+_IN_USE = (28, 0x1)
+_GENERATION = (29, 0xffffffff)
+
+
+def _get_field(word, field):
+    """
+    Takes the last word of a record and a (shift, mask) field and returns the value of that field.
+    """
+    return (word >> field[0]) & field[1]
+
+
+class GameArena:
+    """
+    Represents an arena of games stored in one shared array. It grows by doubling when every slot is in use, and a
+    released slot is reused by the next new game.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Takes the amount of games to preallocate room for.
+        """
+        self._words = array('Q', bytes(8 * _WORDS * max(1, capacity)))
+        self._free_slots = list(range(max(1, capacity) - 1, -1, -1))
+        self._scratch = BitboardQuoridorGame()
+        self._game_amount = 0
+
+    def new_game(self):
+        """
+        Returns an ArenaGame handle of a new game in the starting position.
+        """
+        return self.from_state(BitboardQuoridorGame().get_state())
+
+    def from_state(self, state):
+        """
+        Takes a tuple returned by get_state (of a QuoridorGame, a BitboardQuoridorGame or an ArenaGame) and returns an
+        ArenaGame handle of a new game in that position.
+        Raises ValueError if the state is not of a two-player game or a player has more fences than a record holds.
+        """
+        if len(state[1]) != 2 or any(fence_amount > _FENCES_1[1] for _, fence_amount, _ in state[1]):
+            raise ValueError('an arena only holds two-player games with at most %d fences each' % _FENCES_1[1])
+        if not self._free_slots:
+            self._grow()
+        slot = self._free_slots.pop()
+        generation = (_get_field(self._words[slot * _WORDS + 4], _GENERATION) + 1) & _GENERATION[1]
+        self._store(slot, BitboardQuoridorGame.from_state(state), generation)
+        self._game_amount += 1
+        return ArenaGame(self, slot, generation)
+
+    def release(self, game):
+        """
+        Takes an ArenaGame of this arena and frees its slot for a new game. The handle can't be used afterwards.
+        """
+        self._live_word(game._slot, game._generation)
+        base = game._slot * _WORDS
+        self._words[base + 4] = game._generation << _GENERATION[0]
+        self._free_slots.append(game._slot)
+        self._game_amount -= 1
+
+    def get_game_amount(self):
+        """
+        Returns the amount of games in the arena.
+        """
+        return self._game_amount
+
+    def get_capacity(self):
+        """
+        Returns the amount of games the arena has room for before it grows.
+        """
+        return len(self._words) // _WORDS
+
+    def get_buffer_bytes(self):
+        """
+        Returns the size of the shared array in bytes.
+        """
+        return len(self._words) * self._words.itemsize
+
+    def _grow(self):
+        """
+        A private method which doubles the amount of slots.
+        """
+        capacity = self.get_capacity()
+        self._words.frombytes(bytes(8 * _WORDS * capacity))
+        self._free_slots.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def _live_word(self, slot, generation):
+        """
+        A private method which takes the slot and generation of a handle and returns the last word of its record.
+        Raises ValueError if the handle's game has been released.
+        """
+        word = self._words[slot * _WORDS + 4]
+        # the in-use flag and the generation are the top bits of the word
+        if word >> _IN_USE[0] != (generation << 1) | 1:
+            raise ValueError('the game of this handle has been released')
+        return word
+
+    def _load(self, slot, generation):
+        """
+        A private method which takes the slot and generation of a handle, puts that game's position into the scratch
+        BitboardQuoridorGame and returns it.
+        """
+        word = self._live_word(slot, generation)
+        words = self._words
+        base = slot * _WORDS
+        scratch = self._scratch
+        # the fields are unpacked inline, this runs for every move
+        scratch.load(words[base] | words[base + 1] << 64, words[base + 2] | words[base + 3] << 64, word & 0x7f,
+                     word >> 7 & 0x7f, word >> 14 & 0x1f, word >> 19 & 0x1f, word >> 24 & 0x3, word >> 26 & 0x3)
+        return scratch
+
+    def _store(self, slot, game, generation):
+        """
+        A private method which takes a slot, a BitboardQuoridorGame and the generation of the slot, and writes the
+        position of that game into the slot's record, leaving out the side fences.
+        """
+        words = self._words
+        base = slot * _WORDS
+        h_fences, v_fences, pawn_1, pawn_2, fences_1, fences_2, which_turn, winner = game.pack()
+        words[base] = h_fences & _LOW_MASK
+        words[base + 1] = h_fences >> 64
+        words[base + 2] = v_fences & _LOW_MASK
+        words[base + 3] = v_fences >> 64
+        # the fields are packed inline, in the order of the (shift, mask) fields above, with the in-use flag set
+        words[base + 4] = (pawn_1 | pawn_2 << 7 | fences_1 << 14 | fences_2 << 19 | which_turn << 24 | winner << 26 |
+                           1 << 28 | generation << 29)
+
+
+class ArenaGame:
+    """
+    Represents a handle of one game of a GameArena. It holds nothing but the arena, the slot and the generation of the
+    slot, and plays by the same rules and with the same public methods as BitboardQuoridorGame.
+    """
+
+    __slots__ = ('_arena', '_slot', '_generation')
+
+    def __init__(self, arena, slot, generation):
+        """
+        Takes the arena, the slot of the game and the generation of the slot. Handles are made by GameArena.
+        """
+        self._arena = arena
+        self._slot = slot
+        self._generation = generation
+
+    def _read(self):
+        """
+        A private method which returns the arena's scratch BitboardQuoridorGame loaded with this game.
+        """
+        return self._arena._load(self._slot, self._generation)
+
+    def _write(self, game):
+        """
+        A private method which takes the scratch BitboardQuoridorGame and writes its position back into this game.
+        """
+        self._arena._store(self._slot, game, self._generation)
+
+    def get_state(self):
+        """
+        Returns the current position as the same compact tuple QuoridorGame.get_state returns.
+        """
+        return self._read().get_state()
+
+    def get_which_turn(self):
+        """
+        Returns the integer of the player (1 or 2) whose turn it is.
+        """
+        word = self._arena._live_word(self._slot, self._generation)
+        return _get_field(word, _TURN)
+
+    def get_player_position(self, player_id):
+        """
+        Takes player_id and returns the position tuple of that player's pawn.
+        """
+        word = self._arena._live_word(self._slot, self._generation)
+        return bit_to_address(1 << _get_field(word, _PAWN_1 if player_id == 1 else _PAWN_2))
+
+    def get_fence_amount(self, player_id):
+        """
+        Takes player_id and returns the left amount of fences for that player to use.
+        """
+        word = self._arena._live_word(self._slot, self._generation)
+        return _get_field(word, _FENCES_1 if player_id == 1 else _FENCES_2)
+
+    def move_pawn(self, player_id, pawn_aiming_address):
+        """
+        Takes the player (1 or 2) making the move and the position tuple the pawn is moved to, and returns the same
+        as QuoridorGame.move_pawn.
+        """
+        game = self._read()
+        result = game.move_pawn(player_id, pawn_aiming_address)
+        if result is True:
+            self._write(game)
+        return result
+
+    def place_fence(self, player_id, v_or_h, fence_aiming_address):
+        """
+        Takes the player (1 or 2) making the move, the letter (v or h) of the fence and its position tuple, and returns
+        the same as QuoridorGame.place_fence, including the string "breaks the fair play rule".
+        """
+        game = self._read()
+        result = game.place_fence(player_id, v_or_h, fence_aiming_address)
+        if result is True:
+            self._write(game)
+        return result
+
+    def pawn_move_bits(self, player_id):
+        """
+        Takes player_id and returns the bitmask of every cell the pawn of that player can legally move to, as
+        BitboardQuoridorGame.pawn_move_bits does.
+        """
+        return self._read().pawn_move_bits(player_id)
+
+    def get_winner(self):
+        """
+        Returns the integer of the player who has won, or None if no player has won yet.
+        """
+        word = self._arena._live_word(self._slot, self._generation)
+        return _get_field(word, _WINNER) or None
+
+    def is_winner(self, player_id):
+        """
+        Takes a single integer representing the player number as a parameter and returns True if that player has won
+        and False if that player has not won.
+        """
+        return self.get_winner() == player_id
+
+    def print_board(self):
+        """
+        Prints the board
+        """
+        self._read().print_board()
@@ -0,0 +1,353 @@
+# Description: A batch engine which steps many Quoridor games at once with NumPy, for self-play and training data
+#              generation. BatchQuoridor keeps N games as struct-of-arrays buffers: pawn coordinates, horizontal and
+#              vertical fence planes (including the fences on the four sides, as in QuoridorGame._game_board), fences
+#              left, turn and winner. Legality masks over the 243 moves of QuoridorGame.move_index are computed for
+#              all the games with array operations, including the fair-play rule, whose fence vertex components are
+#              found for every game at once by label propagation. It plays by the same rules as QuoridorGame move for
+#              move.
+
+import numpy as np
+
+from .game import QuoridorGame
+
+ACTION_AMOUNT = 243
+
+# results of step, in the place of what place_fence / move_pawn return
+MOVE_MADE = 1
+MOVE_REFUSED = 0
+BREAKS_FAIR_PLAY = -1
+
+_LEFT_SIDE = 1
+_RIGHT_SIDE = 2
+
+
+class BatchQuoridor:
+    """
+    Represents N Quoridor games stored in shared NumPy buffers and played one move per game per step.
+    """
+
+    def __init__(self, game_amount):
+        """
+        Takes the amount of games and initializes all of them to the starting position.
+        """
+        self._game_amount = game_amount
+        self._pawn_x = np.zeros((game_amount, 2), np.int8)  # column 0 is player 1, column 1 is player 2
+        self._pawn_y = np.zeros((game_amount, 2), np.int8)
+        self._h_fences = np.zeros((game_amount, 10, 10), bool)  # indexed [game, y, x]
+        self._v_fences = np.zeros((game_amount, 10, 10), bool)
+        self._fence_amount = np.zeros((game_amount, 2), np.int8)
+        self._which_turn = np.zeros(game_amount, np.int8)
+        self._winner = np.zeros(game_amount, np.int8)  # 0 while no player has won
+        self._masks = None  # the legal and fair-play masks of the current positions, once computed
+        self.reset()
+
+    def __len__(self):
+        """
+        Returns the amount of games.
+        """
+        return self._game_amount
+
+    def reset(self, game_indexes=None):
+        """
+        Puts the given games (all of them by default) back to the starting position.
+        """
+        if game_indexes is None:
+            game_indexes = slice(None)
+        self._pawn_x[game_indexes] = 4
+        self._pawn_y[game_indexes] = (0, 8)
+        self._h_fences[game_indexes] = False
+        self._v_fences[game_indexes] = False
+        self._h_fences[game_indexes, 0, 0:9] = True
+        self._h_fences[game_indexes, 9, 0:9] = True
+        self._v_fences[game_indexes, 0:9, 0] = True
+        self._v_fences[game_indexes, 0:9, 9] = True
+        self._fence_amount[game_indexes] = 10
+        self._which_turn[game_indexes] = 1
+        self._winner[game_indexes] = 0
+        self._masks = None
+
+    @classmethod
+    def from_states(cls, states):
+        """
+        Takes a list of tuples returned by QuoridorGame.get_state and returns a BatchQuoridor holding those positions.
+        """
+        batch = cls(len(states))
+        for game_index, (which_turn, player_states, fence_list) in enumerate(states):
+            for column, (position, fence_amount, is_winner) in enumerate(player_states):
+                batch._pawn_x[game_index, column] = position[0]
+                batch._pawn_y[game_index, column] = position[1]
+                batch._fence_amount[game_index, column] = fence_amount
+                if is_winner:
+                    batch._winner[game_index] = column + 1
+            for v_or_h, fence_address in fence_list:
+                plane = batch._h_fences if v_or_h == 'h' else batch._v_fences
+                plane[game_index, fence_address[1], fence_address[0]] = True
+            batch._which_turn[game_index] = which_turn
+        batch._masks = None
+        return batch
+
+    def get_state(self, game_index):
+        """
+        Takes the index of a game and returns its position as the tuple QuoridorGame.get_state returns.
+        """
+        player_states = tuple(((int(self._pawn_x[game_index, column]), int(self._pawn_y[game_index, column])),
+                               int(self._fence_amount[game_index, column]),
+                               bool(self._winner[game_index] == column + 1)) for column in (0, 1))
+        fence_list = []
+        for co_y, co_x in zip(*np.nonzero(self._v_fences[game_index, 0:9, 1:9])):
+            fence_list.append(('v', (int(co_x) + 1, int(co_y))))
+        for co_y, co_x in zip(*np.nonzero(self._h_fences[game_index, 1:9, 0:9])):
+            fence_list.append(('h', (int(co_x), int(co_y) + 1)))
+        return int(self._which_turn[game_index]), player_states, tuple(sorted(fence_list))
+
+    def to_game(self, game_index):
+        """
+        Takes the index of a game and returns a QuoridorGame in the same position.
+        """
+        return QuoridorGame.from_state(self.get_state(game_index))
+
+    def get_which_turn(self):
+        """
+        Returns the array of the player (1 or 2) to move in every game.
+        """
+        return self._which_turn
+
+    def get_winner(self):
+        """
+        Returns the array of the winner of every game, 0 for the games no player has won yet.
+        """
+        return self._winner
+
+    def get_fence_amount(self):
+        """
+        Returns the (N, 2) array of the fences left for player 1 and player 2 of every game.
+        """
+        return self._fence_amount
+
+    def get_pawn_positions(self):
+        """
+        Returns the (N, 2) arrays of the x and of the y coordinates of the pawns of player 1 and player 2.
+        """
+        return self._pawn_x, self._pawn_y
+
+    def get_fence_planes(self):
+        """
+        Returns the (N, 10, 10) boolean planes of the horizontal and of the vertical fences, indexed [game, y, x].
+        """
+        return self._h_fences, self._v_fences
+
+    def legal_mask(self):
+        """
+        Returns an (N, 243) boolean array which tells, for every game, which moves (in QuoridorGame.move_index order)
+        the player to move can make. The array is shared until the next step, so it should not be changed.
+        """
+        return self._legal_and_fair_play_masks()[0]
+
+    def step(self, actions):
+        """
+        Takes an array of one move index per game (a negative index leaves that game alone) and makes every legal
+        move, for the player to move in its game.
+        Returns an array with MOVE_MADE for the moves made, MOVE_REFUSED for the illegal ones and BREAKS_FAIR_PLAY for
+        the fences refused by the fair-play rule, matching what move_pawn / place_fence return.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        game_index = np.arange(self._game_amount)
+        legal, fair_play_break = self._legal_and_fair_play_masks()
+        chosen = actions >= 0
+        clipped = np.where(chosen, actions, 0)
+        made = chosen & legal[game_index, clipped]
+        results = np.where(made, MOVE_MADE, MOVE_REFUSED).astype(np.int8)
+        results[chosen & fair_play_break[game_index, clipped]] = BREAKS_FAIR_PLAY
+        column = self._which_turn.astype(np.int64) - 1
+        cell = clipped % 81
+        co_x = (cell % 9).astype(np.int8)
+        co_y = (cell // 9).astype(np.int8)
+        pawn_games = made & (clipped < 81)
+        self._pawn_x[pawn_games, column[pawn_games]] = co_x[pawn_games]
+        self._pawn_y[pawn_games, column[pawn_games]] = co_y[pawn_games]
+        reached_goal = pawn_games & (co_y == np.where(column == 0, 8, 0))
+        self._winner[reached_goal] = column[reached_goal] + 1
+        h_games = made & (clipped >= 81) & (clipped < 162)
+        self._h_fences[h_games, co_y[h_games], co_x[h_games]] = True
+        v_games = made & (clipped >= 162)
+        self._v_fences[v_games, co_y[v_games], co_x[v_games]] = True
+        fence_games = h_games | v_games
+        self._fence_amount[fence_games, column[fence_games]] -= 1
+        self._which_turn[made] = 3 - self._which_turn[made]
+        if made.any():
+            self._masks = None
+        return results
+
+    def _fence_at(self, plane, game_index, co_x, co_y):
+        """
+        A private method which takes a fence plane and arrays of game indexes and coordinates, and returns whether
+        there is a fence at each of them. Coordinates off the planes have no fence.
+        """
+        inside = (co_x >= 0) & (co_x <= 9) & (co_y >= 0) & (co_y <= 9)
+        return plane[game_index, np.clip(co_y, 0, 9), np.clip(co_x, 0, 9)] & inside
+
+    def _legal_and_fair_play_masks(self):
+        """
+        A private method which returns two (N, 243) boolean arrays: the legal moves of the player to move in every
+        game, and the fences which are refused only because they break the fair-play rule. They are computed once per
+        position and kept until the next move is made.
+        """
+        if self._masks is not None:
+            return self._masks
+        game_amount = self._game_amount
+        game_index = np.arange(game_amount)
+        column = self._which_turn.astype(np.int64) - 1
+        can_move = self._winner == 0
+        legal = np.zeros((game_amount, ACTION_AMOUNT), bool)
+        legal[:, 0:81] = self._pawn_move_mask(game_index, column) & can_move[:, None]
+        free_h, free_v, break_h, break_v = self._fence_masks(game_index, column)
+        can_place = can_move & (self._fence_amount[game_index, column] > 0)
+        legal[:, 81:162] = free_h & ~break_h & can_place[:, None]
+        legal[:, 162:243] = free_v & ~break_v & can_place[:, None]
+        fair_play_break = np.zeros((game_amount, ACTION_AMOUNT), bool)
+        fair_play_break[:, 81:162] = free_h & break_h & can_place[:, None]
+        fair_play_break[:, 162:243] = free_v & break_v & can_place[:, None]
+        self._masks = (legal, fair_play_break)
+        return self._masks
+
+    def _pawn_move_mask(self, game_index, column):
+        """
+        A private method which takes the game indexes and the column of the player to move and returns an (N, 81)
+        boolean array of the cells the pawn can move to: one cell horizontally or vertically, a jump over the opposite
+        pawn, or a diagonal move next to it, with the same fence checks as QuoridorGame.
+        """
+        h_fences = self._h_fences
+        v_fences = self._v_fences
+        pos_x = self._pawn_x[game_index, column].astype(np.int64)
+        pos_y = self._pawn_y[game_index, column].astype(np.int64)
+        oppo_x = self._pawn_x[game_index, 1 - column].astype(np.int64)
+        oppo_y = self._pawn_y[game_index, 1 - column].astype(np.int64)
+        fence_at = self._fence_at
+        open_u = ~fence_at(h_fences, game_index, pos_x, pos_y)
+        open_r = ~fence_at(v_fences, game_index, pos_x + 1, pos_y)
+        open_d = ~fence_at(h_fences, game_index, pos_x, pos_y + 1)
+        open_l = ~fence_at(v_fences, game_index, pos_x, pos_y)
+        oppo_u = (oppo_x == pos_x) & (oppo_y == pos_y - 1)
+        oppo_r = (oppo_x == pos_x + 1) & (oppo_y == pos_y)
+        oppo_d = (oppo_x == pos_x) & (oppo_y == pos_y + 1)
+        oppo_l = (oppo_x == pos_x - 1) & (oppo_y == pos_y)
+        candidate_list = [
+            # one cell horizontally or vertically
+            (pos_x, pos_y - 1, open_u & ~oppo_u),
+            (pos_x + 1, pos_y, open_r & ~oppo_r),
+            (pos_x, pos_y + 1, open_d & ~oppo_d),
+            (pos_x - 1, pos_y, open_l & ~oppo_l),
+            # jumping over the opposite pawn
+            (oppo_x, oppo_y - 1, oppo_u & open_u & ~fence_at(h_fences, game_index, oppo_x, oppo_y)),
+            (oppo_x + 1, oppo_y, oppo_r & open_r & ~fence_at(v_fences, game_index, oppo_x + 1, oppo_y)),
+            (oppo_x, oppo_y + 1, oppo_d & open_d & ~fence_at(h_fences, game_index, oppo_x, oppo_y + 1)),
+            (oppo_x - 1, oppo_y, oppo_l & open_l & ~fence_at(v_fences, game_index, oppo_x, oppo_y)),
+        ]
+        # diagonal moves: the opposite pawn above or on the left needs a fence behind it, while on the right or below
+        # each diagonal cell needs a fence on itself, as in QuoridorGame
+        behind_u = oppo_u & fence_at(h_fences, game_index, oppo_x, oppo_y)
+        behind_l = oppo_l & fence_at(v_fences, game_index, oppo_x, oppo_y)
+        for side in (-1, 1):
+            candidate_list.append((oppo_x + side, oppo_y, behind_u))
+            candidate_list.append((oppo_x, oppo_y + side, behind_l))
+            candidate_list.append((oppo_x, oppo_y + side,
+                                   oppo_r & fence_at(v_fences, game_index, oppo_x, oppo_y + side)))
+            candidate_list.append((oppo_x + side, oppo_y,
+                                   oppo_d & fence_at(h_fences, game_index, oppo_x + side, oppo_y)))
+        mask = np.zeros((self._game_amount, 81), bool)
+        for aim_x, aim_y, allowed in candidate_list:
+            allowed = allowed & (aim_x >= 0) & (aim_x <= 8) & (aim_y >= 0) & (aim_y <= 8)
+            mask[game_index[allowed], (aim_y * 9 + aim_x)[allowed]] = True
+        return mask
+
+    def _vertex_components(self):
+        """
+        A private method which finds the fence vertex components of every game, like FenceVertexGraph does for one
+        game. Returns two (N, 9, 9) arrays indexed [game, y, x] over the vertices which are walked from: the label of
+        the component of each vertex, and the sides that component touches.
+        The smallest vertex index of each component is spread along the fences, and every vertex also jumps to the
+        label of its label, so the labels settle in few rounds even for long chains of fences.
+        """
+        game_amount = self._game_amount
+        h_fences = self._h_fences
+        v_fences = self._v_fences
+        h_edges = h_fences[:, 0:9, 0:8]  # joins (x, y) and (x + 1, y)
+        v_edges = v_fences[:, 0:8, 0:9]  # joins (x, y) and (x, y + 1)
+        no_label = np.int16(81)
+        label = np.broadcast_to(np.arange(81, dtype=np.int16).reshape(9, 9), (game_amount, 9, 9)).copy()
+        while True:
+            new_label = label.copy()
+            joined = np.where(h_edges, np.minimum(label[:, :, 0:8], label[:, :, 1:9]), no_label)
+            np.minimum(new_label[:, :, 0:8], joined, out=new_label[:, :, 0:8])
+            np.minimum(new_label[:, :, 1:9], joined, out=new_label[:, :, 1:9])
+            joined = np.where(v_edges, np.minimum(label[:, 0:8, :], label[:, 1:9, :]), no_label)
+            np.minimum(new_label[:, 0:8, :], joined, out=new_label[:, 0:8, :])
+            np.minimum(new_label[:, 1:9, :], joined, out=new_label[:, 1:9, :])
+            flat_label = new_label.reshape(game_amount, 81)
+            new_label = np.take_along_axis(flat_label, flat_label.astype(np.intp), axis=1).reshape(game_amount, 9, 9)
+            if np.array_equal(new_label, label):
+                break
+            label = new_label
+        # the vertices on x = 0 touch the left side, and a horizontal fence at (8, y) reaches the right side vertex
+        # (9, y); every component touches the sides of all of its vertices
+        vertex_side = np.zeros((game_amount, 9, 9), np.int8)
+        vertex_side[:, :, 0] = _LEFT_SIDE
+        vertex_side[:, :, 8] |= np.where(h_fences[:, 0:9, 8], _RIGHT_SIDE, 0).astype(np.int8)
+        vertex_side = vertex_side.reshape(game_amount, 81)
+        flat_label = label.reshape(game_amount, 81).astype(np.intp)
+        component_side = np.zeros((game_amount, 81), np.int8)
+        for one_side in (_LEFT_SIDE, _RIGHT_SIDE):
+            side_games, side_vertices = np.nonzero(vertex_side & one_side)
+            component_side[side_games, flat_label[side_games, side_vertices]] |= one_side
+        side = np.take_along_axis(component_side, flat_label, axis=1).reshape(game_amount, 9, 9)
+        return label, side
+
+    def _fence_masks(self, game_index, column):
+        """
+        A private method which takes the game indexes and the column of the player to move and returns four (N, 81)
+        boolean arrays: the free horizontal and vertical fence slots, and the horizontal and vertical fences which
+        would break the fair-play rule for the opposite player.
+        """
+        game_amount = self._game_amount
+        h_fences = self._h_fences[:, 0:9, 0:9]
+        v_fences = self._v_fences[:, 0:9, 0:9]
+        label, side = self._vertex_components()
+        # the fair-play rule is checked for the opposite player: player 1 must not be walled off from the right
+        # side, player 2 from the left side
+        oppo_column = 1 - column
+        oppo_x = self._pawn_x[game_index, oppo_column].astype(np.int64)
+        oppo_y = self._pawn_y[game_index, oppo_column].astype(np.int64)
+        closed_side = np.where(oppo_column == 0, _RIGHT_SIDE, _LEFT_SIDE).astype(np.int8)[:, None, None]
+        rows = np.arange(9)[None, :, None]
+        cols = np.arange(9)[None, None, :]
+        in_front = np.where((oppo_column == 0)[:, None, None], rows > oppo_y[:, None, None],
+                            (rows <= oppo_y[:, None, None]) & (rows >= 1))
+        in_front = in_front & (cols == oppo_x[:, None, None])
+        front_fences = in_front & h_fences
+        already_closed = ((side & closed_side) != 0) & front_fences
+        already_closed = already_closed.reshape(game_amount, 81).any(axis=1)
+        # the labels of the components holding a fence in front, with one more always-False label for the
+        # vertices on the right and bottom side
+        front_label = np.zeros((game_amount, 82), bool)
+        front_games, front_y, front_x = np.nonzero(front_fences)
+        front_label[front_games, label[front_games, front_y, front_x]] = True
+        flat_index = np.arange(game_amount)[:, None, None]
+        # a horizontal fence at (x, y) joins (x, y) and (x + 1, y), the latter on the right side when x = 8
+        label_b = np.full((game_amount, 9, 9), 81, np.int16)
+        label_b[:, :, 0:8] = label[:, :, 1:9]
+        side_b = np.full((game_amount, 9, 9), _RIGHT_SIDE, np.int8)
+        side_b[:, :, 0:8] = side[:, :, 1:9]
+        reaches_front = front_label[flat_index, label] | front_label[flat_index, label_b] | in_front
+        break_h = ((side | side_b) & closed_side != 0) & reaches_front
+        # a vertical fence at (x, y) joins (x, y) and (x, y + 1), the latter on the bottom side when y = 8
+        label_b = np.full((game_amount, 9, 9), 81, np.int16)
+        label_b[:, 0:8, :] = label[:, 1:9, :]
+        side_b = np.zeros((game_amount, 9, 9), np.int8)
+        side_b[:, 0:8, :] = side[:, 1:9, :]
+        side_b[:, 8, 0] = _LEFT_SIDE
+        reaches_front = front_label[flat_index, label] | front_label[flat_index, label_b]
+        break_v = ((side | side_b) & closed_side != 0) & reaches_front
+        break_h |= already_closed[:, None, None]
+        break_v |= already_closed[:, None, None]
+        return (~h_fences).reshape(game_amount, 81), (~v_fences).reshape(game_amount, 81), \
+            break_h.reshape(game_amount, 81), break_v.reshape(game_amount, 81)
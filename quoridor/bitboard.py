@@ -0,0 +1,370 @@
+# Description: An alternative board backend for the Quoridor game. It follows exactly the same rules and exposes the
+#              same move_pawn / place_fence / is_winner / print_board API as QuoridorGame, but keeps the whole state
+#              in a handful of integers instead of a dict of lists of strings. Horizontal fences, vertical fences and
+#              every pawn are stored as bitmasks over a padded grid with a row stride of 10, so the bit of (x, y) is
+#              1 << (y * 10 + x). The padding column x = 9 and the padding row y = 9 hold the right and the bottom
+#              side fences, so fence tests are a single AND and the neighbours of a cell (or of a whole set of cells)
+#              are found with one shift and one mask per direction.
+
+from .render import board_lines
+
+_SIZE = 9
+_STRIDE = _SIZE + 1
+
+
+def _bit(x, y):
+    """
+    Takes the x and y coordinates and returns the bit which represents that cell, fence slot or fence vertex.
+    """
+    return 1 << (y * _STRIDE + x)
+
+
+def _bit_to_address(bit):
+    """
+    Takes a single bit and returns the coordinate tuple it represents.
+    """
+    index = bit.bit_length() - 1
+    return index % _STRIDE, index // _STRIDE
+
+
+def address_to_bit(address_tuple):
+    """
+    Takes a cell or fence position tuple and returns the bit which represents it in a BitboardQuoridorGame.
+    """
+    return _bit(address_tuple[0], address_tuple[1])
+
+
+def bit_to_address(bit):
+    """
+    Takes a single bit of a BitboardQuoridorGame mask and returns the position tuple it represents.
+    """
+    return _bit_to_address(bit)
+
+
+# every cell of the board, (0, 0) to (8, 8)
+_CELLS = 0
+for _y in range(0, _SIZE):
+    for _x in range(0, _SIZE):
+        _CELLS |= _bit(_x, _y)
+
+# the fences on the four sides of the board, exactly as QuoridorGame initializes its _game_board; every position
+# holds them, so a packed position can leave them out
+BOUNDARY_H_FENCES = 0
+BOUNDARY_V_FENCES = 0
+for _index in range(0, _SIZE):
+    BOUNDARY_H_FENCES |= _bit(_index, 0) | _bit(_index, _SIZE)
+    BOUNDARY_V_FENCES |= _bit(0, _index) | _bit(_SIZE, _index)
+
+# the fence vertices with x = 0 and with x = 9, used by the fair-play rule
+_LEFT_VERTICES = 0
+_RIGHT_VERTICES = 0
+for _index in range(0, _STRIDE):
+    _LEFT_VERTICES |= _bit(0, _index)
+    _RIGHT_VERTICES |= _bit(_SIZE, _index)
+
+# the goal line of each player
+_GOAL_ROWS = {1: 0, 2: 0}
+for _index in range(0, _SIZE):
+    _GOAL_ROWS[1] |= _bit(_index, _SIZE - 1)
+    _GOAL_ROWS[2] |= _bit(_index, 0)
+
+# for every player and every cell, the horizontal fence slots in front of a pawn standing on that cell
+_FRONT_H_FENCE_SLOTS = {1: {}, 2: {}}
+for _y in range(0, _SIZE):
+    for _x in range(0, _SIZE):
+        _FRONT_H_FENCE_SLOTS[1][_bit(_x, _y)] = sum(_bit(_x, _remain_y) for _remain_y in range(_y + 1, _SIZE))
+        _FRONT_H_FENCE_SLOTS[2][_bit(_x, _y)] = sum(_bit(_x, _remain_y) for _remain_y in range(_y, 0, -1))
+
+
+class BitboardQuoridorGame:
+    """
+    Represents a QuoridorGame whose board is stored as integer bitmasks.
+    It plays by the same rules as QuoridorGame and can be used everywhere a QuoridorGame is used through its public
+    methods.
+    """
+
+    def __init__(self):
+        """
+        Initializes the board with the fences on the four sides and the pawns placed in the correct positions.
+        """
+        self._h_fences = BOUNDARY_H_FENCES
+        self._v_fences = BOUNDARY_V_FENCES
+        self._pawns = {1: _bit(4, 0), 2: _bit(4, _SIZE - 1)}
+        self._fence_amount = {1: 10, 2: 10}
+        self._which_turn = 1
+        self._winner = None
+
+    def get_state(self):
+        """
+        Returns the current position as the same compact tuple QuoridorGame.get_state returns.
+        """
+        player_states = tuple((_bit_to_address(self._pawns[player_id]), self._fence_amount[player_id],
+                               self._winner == player_id) for player_id in (1, 2))
+        fence_list = []
+        for v_or_h, fences, boundary_fences in (('v', self._v_fences, BOUNDARY_V_FENCES),
+                                                ('h', self._h_fences, BOUNDARY_H_FENCES)):
+            fences &= ~boundary_fences
+            while fences:
+                fence = fences & -fences
+                fence_list.append((v_or_h, _bit_to_address(fence)))
+                fences ^= fence
+        return self._which_turn, player_states, tuple(sorted(fence_list))
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Takes a tuple returned by QuoridorGame.get_state or BitboardQuoridorGame.get_state and returns a new
+        BitboardQuoridorGame in that position.
+        """
+        game = cls()
+        which_turn, player_states, fence_list = state
+        for player_id, (position, fence_amount, is_winner) in zip((1, 2), player_states):
+            game._pawns[player_id] = _bit(position[0], position[1])
+            game._fence_amount[player_id] = fence_amount
+            if is_winner:
+                game._winner = player_id
+        for v_or_h, fence_address in fence_list:
+            if v_or_h == 'h':
+                game._h_fences |= _bit(fence_address[0], fence_address[1])
+            else:
+                game._v_fences |= _bit(fence_address[0], fence_address[1])
+        game._which_turn = which_turn
+        return game
+
+    def pack(self):
+        """
+        Returns the position as a tuple of integers: the horizontal and the vertical fences placed as bitmasks, with
+        the fences on the four sides left out, the bit numbers of the cells of both pawns, the fences left of both
+        players, the turn and the winner (0 while no player has won). It is the compact form load takes back.
+        """
+        return (self._h_fences & ~BOUNDARY_H_FENCES, self._v_fences & ~BOUNDARY_V_FENCES,
+                self._pawns[1].bit_length() - 1, self._pawns[2].bit_length() - 1, self._fence_amount[1],
+                self._fence_amount[2], self._which_turn, self._winner or 0)
+
+    def load(self, h_fences, v_fences, pawn_1, pawn_2, fences_1, fences_2, which_turn, winner):
+        """
+        Takes the integers of a tuple returned by pack, in the same order, and puts that position into this game in
+        place, so one game can stand in for many stored positions without a new object for each.
+        """
+        self._h_fences = h_fences | BOUNDARY_H_FENCES
+        self._v_fences = v_fences | BOUNDARY_V_FENCES
+        self._pawns[1] = 1 << pawn_1
+        self._pawns[2] = 1 << pawn_2
+        self._fence_amount[1] = fences_1
+        self._fence_amount[2] = fences_2
+        self._which_turn = which_turn
+        self._winner = winner or None
+
+    def get_which_turn(self):
+        """
+        Returns the integer of the player (1 or 2) whose turn it is.
+        """
+        return self._which_turn
+
+    def get_player_position(self, player_id):
+        """
+        Takes player_id and returns the position tuple of that player's pawn.
+        """
+        return _bit_to_address(self._pawns[player_id])
+
+    def get_fence_amount(self, player_id):
+        """
+        Takes player_id and returns the left amount of fences for that player to use.
+        """
+        return self._fence_amount[player_id]
+
+    def move_pawn(self, player_id, pawn_aiming_address):
+        """
+        Takes following two parameters in order: an integer that represents which player (1 or 2) is making the
+        move and a tuple with the coordinates of where the pawn is going to be moved to.
+        Returns False if the move is forbidden by the rule or blocked by the fence or if the game has been already won.
+        Returns True if the move was successful or if the move makes the player win.
+        """
+        if self._which_turn != player_id or self._winner is not None:
+            return False
+        if pawn_aiming_address[0] not in range(0, _SIZE) or pawn_aiming_address[1] not in range(0, _SIZE):
+            return False
+        aim = _bit(pawn_aiming_address[0], pawn_aiming_address[1])
+        if not aim & self.pawn_move_bits(player_id):
+            return False
+        self.make_pawn_move_bit(player_id, aim)
+        return True
+
+    def make_pawn_move_bit(self, player_id, aim):
+        """
+        Takes player_id and the bit of a cell in pawn_move_bits, moves the pawn there, passes the turn and updates the
+        winner. No rule is checked: it is the fast path for callers which already know the move is legal.
+        """
+        self._pawns[player_id] = aim
+        self._which_turn = 3 - player_id
+        if aim & _GOAL_ROWS[player_id]:
+            self._winner = player_id
+
+    def pawn_move_bits(self, player_id):
+        """
+        Takes player_id and returns the bitmask of every cell the pawn of that player can legally move to: one cell
+        horizontally or vertically, jumping over the opposite pawn, or moving diagonally next to it. Whose turn it is
+        and whether the game has been won are not checked.
+        """
+        h_fences = self._h_fences
+        v_fences = self._v_fences
+        pawn = self._pawns[player_id]
+        oppo = self._pawns[3 - player_id]
+        pos_u = (pawn & ~h_fences) >> _STRIDE
+        pos_r = (pawn & ~(v_fences >> 1)) << 1
+        pos_d = (pawn & ~(h_fences >> _STRIDE)) << _STRIDE
+        pos_l = (pawn & ~v_fences) >> 1
+        moves = (pos_u | pos_r | pos_d | pos_l) & ~oppo
+        # a jump needs the cells on both sides of the opposite pawn to be open, while, as in QuoridorGame, a diagonal
+        # move only looks at the fence named for each case below
+        # the opposite pawn is right above, the diagonal cells need a fence behind the opposite pawn
+        if pawn >> _STRIDE == oppo:
+            if pos_u:
+                moves |= (oppo & ~h_fences) >> _STRIDE
+            if oppo & h_fences:
+                moves |= (oppo << 1) | (oppo >> 1)
+        # the opposite pawn is right next to it on the right, each diagonal cell needs a vertical fence on itself
+        elif pawn << 1 == oppo:
+            if pos_r:
+                moves |= (oppo & ~(v_fences >> 1)) << 1
+            moves |= ((oppo >> _STRIDE) | (oppo << _STRIDE)) & v_fences
+        # the opposite pawn is right below, each diagonal cell needs a horizontal fence on itself
+        elif pawn << _STRIDE == oppo:
+            if pos_d:
+                moves |= (oppo & ~(h_fences >> _STRIDE)) << _STRIDE
+            moves |= ((oppo >> 1) | (oppo << 1)) & h_fences
+        # the opposite pawn is right next to it on the left, the diagonal cells need a fence behind the opposite pawn
+        elif pawn >> 1 == oppo:
+            if pos_l:
+                moves |= (oppo & ~v_fences) >> 1
+            if oppo & v_fences:
+                moves |= (oppo >> _STRIDE) | (oppo << _STRIDE)
+        return moves & _CELLS
+
+    def distance_to_goal(self, player_id):
+        """
+        Takes player_id and returns the least amount of one cell moves the pawn of that player needs to reach its goal
+        line, going around the fences and ignoring the other pawn. Returns None if the goal line can't be reached.
+        All the cells at the same distance are grown at once, with one shift and one mask per direction.
+        """
+        h_fences = self._h_fences
+        v_fences = self._v_fences
+        v_fences_from_right = v_fences >> 1
+        h_fences_from_below = h_fences >> _STRIDE
+        goal_row = _GOAL_ROWS[player_id]
+        reached = frontier = self._pawns[player_id]
+        distance = 0
+        while frontier:
+            if frontier & goal_row:
+                return distance
+            frontier = (((frontier & ~h_fences) >> _STRIDE) | ((frontier & ~v_fences_from_right) << 1) |
+                        ((frontier & ~h_fences_from_below) << _STRIDE) | ((frontier & ~v_fences) >> 1))
+            frontier &= _CELLS & ~reached
+            reached |= frontier
+            distance += 1
+        return None
+
+    def place_fence(self, player_id, v_or_h, fence_aiming_address):
+        """
+        Takes following parameters in order: an integer that represents which player (1 or 2) is making the move,
+        a letter indicating whether it is vertical (v) or horizontal (h) fence, a tuple of integers that represents
+        the position on which the fence is to be placed.
+        Returns False if player has no fence left, or if the fence is out of the boundaries of the board,
+        or if there is already a fence there and the new fence will overlap or intersect with the existing fence.
+        Returns False if the game has been already won.
+        Returns True if the fence can be placed.
+        Returns exactly the string "breaks the fair play rule" if it breaks the fair-play rule.
+        """
+        if self._which_turn != player_id:
+            return False
+        if self._fence_amount[player_id] <= 0 or self._winner is not None:
+            return False
+        if fence_aiming_address[0] not in range(0, _SIZE) or fence_aiming_address[1] not in range(0, _SIZE):
+            return False
+        fence = _bit(fence_aiming_address[0], fence_aiming_address[1])
+        h_fences = self._h_fences
+        v_fences = self._v_fences
+        if v_or_h == 'h':
+            if h_fences & fence:
+                return False
+            h_fences |= fence
+        elif v_or_h == 'v':
+            if v_fences & fence:
+                return False
+            v_fences |= fence
+        else:
+            return False
+        if self._if_no_room_left_for_this_player(3 - player_id, h_fences, v_fences):
+            return 'breaks the fair play rule'
+        self.make_fence_bit(player_id, v_or_h, fence)
+        return True
+
+    def if_fence_bit_allowed(self, player_id, v_or_h, fence):
+        """
+        Takes player_id, a letter (v or h) and the bit of a fence slot on the board, and returns whether that slot is
+        free and the fence keeps to the fair play rule. Whose turn it is, the fences left and whether the game has been
+        won are not checked.
+        """
+        if v_or_h == 'h':
+            if self._h_fences & fence:
+                return False
+            return not self._if_no_room_left_for_this_player(3 - player_id, self._h_fences | fence, self._v_fences)
+        if self._v_fences & fence:
+            return False
+        return not self._if_no_room_left_for_this_player(3 - player_id, self._h_fences, self._v_fences | fence)
+
+    def make_fence_bit(self, player_id, v_or_h, fence):
+        """
+        Takes player_id, a letter (v or h) and the bit of a fence slot, places the fence and passes the turn. No rule
+        is checked: it is the fast path for callers which already know the fence is legal.
+        """
+        if v_or_h == 'h':
+            self._h_fences |= fence
+        else:
+            self._v_fences |= fence
+        self._fence_amount[player_id] -= 1
+        self._which_turn = 3 - player_id
+
+    def _if_no_room_left_for_this_player(self, player_id, h_fences, v_fences):
+        """
+        A private method which takes player_id and the fence bitmasks to test and returns if the access to the goal
+        line of that player is closed. Like QuoridorGame, it collects the fence vertices connected to the horizontal
+        fences right in front of the pawn and checks whether they reach the side of the board, but the whole set of
+        vertices is grown at once with shifts instead of one vertex at a time.
+        """
+        frontier = _FRONT_H_FENCE_SLOTS[player_id][self._pawns[player_id]] & h_fences
+        if not frontier:
+            return False
+        target = _RIGHT_VERTICES if player_id == 1 else _LEFT_VERTICES
+        h_fences_from_left = h_fences << 1
+        v_fences_from_above = v_fences << _STRIDE
+        used_vertex = frontier
+        while frontier:
+            if used_vertex & target:
+                return True
+            # the vertices on x = 9 and y = 9 are reached but never grown from
+            frontier &= _CELLS
+            frontier = (((frontier & h_fences) << 1) | ((frontier & v_fences) << _STRIDE) |
+                        ((frontier & h_fences_from_left) >> 1) | ((frontier & v_fences_from_above) >> _STRIDE))
+            frontier &= ~used_vertex
+            used_vertex |= frontier
+        return bool(used_vertex & target)
+
+    def get_winner(self):
+        """
+        Returns the integer of the player who has won, or None if no player has won yet.
+        """
+        return self._winner
+
+    def is_winner(self, player_id):
+        """
+        Takes a single integer representing the player number as a parameter and returns True if that player has won
+        and False if that player has not won.
+        """
+        return self._winner == player_id
+
+    def print_board(self):
+        """
+        Prints the board
+        """
+        print('\n'.join(board_lines(self.get_state())))
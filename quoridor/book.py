@@ -0,0 +1,353 @@
+# Description: An opening book and endgame tablebases for the two-player game, stored as sorted hash-keyed files which
+#              are memory-mapped for reading. Every entry is keyed by the Zobrist hash of a position
+#              (QuoridorGame.get_zobrist_hash, which is the same in every process) and holds the move to play, its
+#              score for the player to move in SearchEngine units and a depth. The entries are sorted by key, so a
+#              lookup is a binary search over the map: nothing is loaded when a file is opened, and every process
+#              which opens the same file shares its pages through the operating system.
+#              The opening book is built by searching every position reached from the starting position within a
+#              given amount of plies with SearchEngine, following the best moves and a few promising replies.
+#              The endgame tablebase covers the positions where both players have no fence left: with the fences
+#              fixed the game is a pure pawn race, and every placement of the two pawns (12960 positions on 9x9) is
+#              solved exactly by retrograde analysis, since jumps and blocking pawns make the distance maps only a
+#              bound. A position with no fence left has all 20 fences on the board, so only layouts of 20 fences are
+#              solved, such as the final layouts of archived games which used all their fences.
+#              Build them from the command line with:
+#                  python -m quoridor.book opening OUTPUT [--plies N] [--width N] [--time SECONDS]
+#                  python -m quoridor.book tablebase OUTPUT --games GAMES_FILE [--limit N]
+
+import mmap
+import struct
+import sys
+from collections import deque
+
+from .bitboard import BitboardQuoridorGame, bit_to_address
+from .game import QuoridorGame
+from .search import SearchEngine, WIN_SCORE, promising_moves
+
+BOOK_MAGIC = b'QRDB'
+OPENING_KIND = ord('O')
+TABLEBASE_KIND = ord('T')
+NO_MOVE = 0xFFFF
+# the fences on the board of every tablebase position: both players placed all of their 10
+TABLEBASE_FENCES = 2 * 10
+
+# magic, kind, board size, amount of players, fences each player starts with, amount of entries
+_HEADER = struct.Struct('<4sBBBBI')
+# Zobrist hash, move index, depth, score
+_ENTRY = struct.Struct('<QHHi')
+_KEY = struct.Struct('<Q')
+
+
+def write_table(path, kind, entries, size=9, players=2, fences=None):
+    """
+    Takes the path of the file to create, the kind of table (OPENING_KIND or TABLEBASE_KIND), a dict of (move index,
+    depth, score) tuples keyed by Zobrist hash and the board configuration, and writes the entries sorted by hash.
+    """
+    if fences is None:
+        fences = 10 if players == 2 else 5
+    with open(path, 'wb') as table_file:
+        table_file.write(_HEADER.pack(BOOK_MAGIC, kind, size, players, fences, len(entries)))
+        for key in sorted(entries):
+            table_file.write(_ENTRY.pack(key, *entries[key]))
+
+
+class PositionTable:
+    """
+    Represents an opening book or endgame tablebase file opened for reading through a read-only memory map.
+    """
+
+    def __init__(self, path):
+        """
+        Takes the path of a table file, maps it and checks its header. Raises ValueError if it is not a table file.
+        """
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError('%s is empty, not a table file' % path)
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError('%s is too short to be a table file' % path)
+        magic, self._kind, size, players, fences, self._entry_amount = _HEADER.unpack_from(self._map, 0)
+        if magic != BOOK_MAGIC or len(self._map) != _HEADER.size + self._entry_amount * _ENTRY.size:
+            self.close()
+            raise ValueError('%s is not a table file' % path)
+        self._configuration = (size, players, fences)
+
+    def __enter__(self):
+        """
+        Returns the table itself, so it can be used in a with block.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the file at the end of the with block.
+        """
+        self.close()
+
+    def __len__(self):
+        """
+        Returns the amount of entries.
+        """
+        return self._entry_amount
+
+    def get_kind(self):
+        """
+        Returns the kind of the table, OPENING_KIND or TABLEBASE_KIND.
+        """
+        return self._kind
+
+    def get_configuration(self):
+        """
+        Returns the tuple of the board size, the amount of players and the amount of fences each player starts with.
+        """
+        return self._configuration
+
+    def lookup(self, key):
+        """
+        Takes a Zobrist hash and returns its (move index, depth, score) tuple, or None if it is not in the table.
+        It is a binary search over the sorted entries.
+        """
+        table_map = self._map
+        low = 0
+        high = self._entry_amount
+        while low < high:
+            middle = (low + high) // 2
+            middle_key = _KEY.unpack_from(table_map, _HEADER.size + middle * _ENTRY.size)[0]
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                return _ENTRY.unpack_from(table_map, _HEADER.size + middle * _ENTRY.size)[1:]
+        return None
+
+    def probe(self, game):
+        """
+        Takes a QuoridorGame and returns a dict with the move to play (a move tuple as returned by legal_moves), its
+        score for the player to move and the depth of the entry, or None if the position is not in the table, the
+        game is of another board configuration, or the move found is not legal in the game (a hash collision).
+        """
+        if (game.get_board_size(), game.get_player_amount()) != self._configuration[:2]:
+            return None
+        entry = self.lookup(game.get_zobrist_hash())
+        if entry is None or entry[0] == NO_MOVE:
+            return None
+        move_index, depth, score = entry
+        move = game.index_move(move_index)
+        if move not in game.legal_moves(game.get_which_turn()):
+            return None
+        return {'move': move, 'score': score, 'depth': depth}
+
+    def close(self):
+        """
+        Unmaps and closes the file.
+        """
+        self._map.close()
+        self._file.close()
+
+
+def build_opening_book(path, plies=4, width=3, time_limit=1.0, max_depth=32, size=9, fences=None, progress=None):
+    """
+    Takes the path of the book to write, the amount of plies from the starting position to cover, how many replies to
+    follow from each position besides the best move, the search time per position, the deepest search depth, the
+    board configuration and an optional function called with the amount of positions searched so far. Searches every
+    position reached by the best move and the most promising replies with SearchEngine and writes the book.
+    Returns the amount of entries.
+    """
+    game = QuoridorGame(size, fences)
+    engine = SearchEngine(time_limit=time_limit, max_depth=max_depth)
+    entries = {}
+    queue = deque([(game.get_state(), 0)])
+    while queue:
+        state, ply = queue.popleft()
+        position = QuoridorGame.from_state(state, size, fences)
+        key = position.get_zobrist_hash()
+        if key in entries or position.is_winner(1) or position.is_winner(2):
+            continue
+        result = engine.search(position)
+        if result['move'] is None:
+            continue
+        entries[key] = (position.move_index(result['move']), result['depth'], result['score'])
+        if progress is not None:
+            progress(len(entries))
+        if ply + 1 >= plies:
+            continue
+        follow_list = [result['move']]
+        for move in promising_moves(position, width):
+            if move not in follow_list:
+                follow_list.append(move)
+        for move in follow_list:
+            position.push_move(position.get_which_turn(), move)
+            queue.append((position.get_state(), ply + 1))
+            position.pop_move()
+    write_table(path, OPENING_KIND, entries, size, 2, fences)
+    return len(entries)
+
+
+def solve_pawn_race(fence_list):
+    """
+    Takes the fences of a 9x9 two-player position as (v or h, position tuple) tuples and solves every position with
+    those fences, both players without fences and no winner yet, by retrograde analysis over the pawn moves.
+    Returns a dict of (move index, plies to the end, score) tuples keyed by Zobrist hash. The score is
+    WIN_SCORE - plies for a win of the player to move, -(WIN_SCORE - plies) for a loss and 0 for a draw (the pawns
+    block each other forever, or a pawn is walled in); the plies of a draw are 0.
+    Raises ValueError unless there are TABLEBASE_FENCES fences, since no game reaches the positions of other layouts.
+    """
+    if len(fence_list) != TABLEBASE_FENCES:
+        raise ValueError('a pawn race is played on %d fences, not %d' % (TABLEBASE_FENCES, len(fence_list)))
+    move_game = QuoridorGame()
+    pawn_keys, _, _, turn_keys = move_game.get_zobrist_keys()
+    layout_game = QuoridorGame.from_state((1, (((4, 0), 0, False), ((4, 8), 0, False)), tuple(fence_list)))
+    layout_key = (layout_game.get_zobrist_hash() ^ pawn_keys[(1, (4, 0))] ^ pawn_keys[(2, (4, 8))] ^
+                  turn_keys[1])
+    cells = [(co_x, co_y) for co_y in range(0, 9) for co_x in range(0, 9)]
+    # a node is (turn, cell of pawn 1, cell of pawn 2), numbered turn * 6561 + cell_1 * 81 + cell_2 from turn 0
+    successors = {}
+    predecessors = {}
+    result = {}
+    queue = deque()
+    for turn in (1, 2):
+        for cell_1 in range(0, 81):
+            for cell_2 in range(0, 81):
+                if cell_1 == cell_2:
+                    continue
+                node = (turn - 1) * 6561 + cell_1 * 81 + cell_2
+                pos_1 = cells[cell_1]
+                pos_2 = cells[cell_2]
+                if pos_1[1] == 8 or pos_2[1] == 0:
+                    continue  # a player is already on its goal line, the game is over
+                board = BitboardQuoridorGame.from_state((turn, ((pos_1, 0, False), (pos_2, 0, False)),
+                                                         tuple(fence_list)))
+                moves = board.pawn_move_bits(turn)
+                node_successors = []
+                while moves:
+                    aim = moves & -moves
+                    moves ^= aim
+                    aim_address = bit_to_address(aim)
+                    aim_cell = aim_address[1] * 9 + aim_address[0]
+                    if turn == 1:
+                        successor = 6561 + aim_cell * 81 + cell_2
+                        reaches_goal = aim_address[1] == 8
+                    else:
+                        successor = cell_1 * 81 + aim_cell
+                        reaches_goal = aim_address[1] == 0
+                    if reaches_goal:
+                        result[node] = (1, 1, aim_address)
+                        continue
+                    node_successors.append((successor, aim_address))
+                    predecessors.setdefault(successor, []).append((node, aim_address))
+                successors[node] = node_successors
+    # result: node -> (1 for a win or -1 for a loss of the player to move, plies to the end, move to play)
+    queue.extend(result)
+    unsolved_amount = {node: len(node_successors) for node, node_successors in successors.items()}
+    while queue:
+        node = queue.popleft()
+        outcome, plies, _ = result[node]
+        for predecessor, aim_address in predecessors.get(node, ()):
+            if predecessor in result:
+                continue
+            if outcome == -1:
+                result[predecessor] = (1, plies + 1, aim_address)
+                queue.append(predecessor)
+            else:
+                unsolved_amount[predecessor] -= 1
+                if unsolved_amount[predecessor] == 0:
+                    # every move loses, play the one which loses last: its successor was solved last
+                    result[predecessor] = (-1, plies + 1, aim_address)
+                    queue.append(predecessor)
+    entries = {}
+    for node, node_successors in successors.items():
+        turn = node // 6561 + 1
+        pos_1 = cells[node % 6561 // 81]
+        pos_2 = cells[node % 81]
+        key = layout_key ^ pawn_keys[(1, pos_1)] ^ pawn_keys[(2, pos_2)] ^ turn_keys[turn]
+        if node in result:
+            outcome, plies, aim_address = result[node]
+            score = outcome * (WIN_SCORE - plies)
+        else:
+            plies = 0
+            score = 0
+            aim_address = next((address for successor, address in node_successors if successor not in result),
+                               None)
+        move_index = NO_MOVE if aim_address is None else move_game.move_index(('p', aim_address))
+        entries[key] = (move_index, plies, score)
+    return entries
+
+
+def build_tablebase(path, fence_layouts, progress=None):
+    """
+    Takes the path of the tablebase to write, an iterable of fence layouts (each one a tuple of (v or h, position
+    tuple) fences of the 9x9 two-player game) and an optional function called with the amount of layouts solved so
+    far. Solves every layout of TABLEBASE_FENCES fences with solve_pawn_race and writes the tablebase; the other
+    layouts are skipped. Returns the amount of entries.
+    """
+    entries = {}
+    seen_layouts = set()
+    for fence_list in fence_layouts:
+        fence_list = tuple(sorted(fence_list))
+        if len(fence_list) != TABLEBASE_FENCES or fence_list in seen_layouts:
+            continue
+        seen_layouts.add(fence_list)
+        entries.update(solve_pawn_race(fence_list))
+        if progress is not None:
+            progress(len(seen_layouts))
+    write_table(path, TABLEBASE_KIND, entries, 9, 2, 10)
+    return len(entries)
+
+
+def final_fence_layouts(games, limit=None):
+    """
+    Takes an iterable of (game id, move list) tuples as read by quoridor.replay.read_games and yields the fences of
+    the last position of each game (before its first illegal move, if any), for at most limit games. Games which used
+    all their fences give the layouts their pawn races were played on.
+    """
+    from .replay import GameReplayer
+    replayer = GameReplayer()
+    for game_number, (game_id, move_list) in enumerate(games):
+        if limit is not None and game_number >= limit:
+            return
+        if not isinstance(move_list, (list, tuple)):
+            continue
+        _, game = replayer.replay_game(game_id, move_list)
+        yield game.get_state()[2]
+
+
+def main(argv=None):
+    """
+    Parses the command line and builds an opening book or a tablebase.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description='Build an opening book or an endgame tablebase.')
+    subparsers = parser.add_subparsers(dest='kind', required=True)
+    opening_parser = subparsers.add_parser('opening', help='search the openings from the starting position')
+    opening_parser.add_argument('output', help='book file to write')
+    opening_parser.add_argument('--plies', type=int, default=4, help='plies from the starting position to cover')
+    opening_parser.add_argument('--width', type=int, default=3, help='replies followed from each position')
+    opening_parser.add_argument('--time', type=float, default=1.0, help='search seconds per position')
+    tablebase_parser = subparsers.add_parser('tablebase', help='solve the pawn races of fence layouts')
+    tablebase_parser.add_argument('output', help='tablebase file to write')
+    tablebase_parser.add_argument('--games', required=True,
+                                  help='take the final fence layouts of the games of this file which used all their '
+                                       'fences')
+    tablebase_parser.add_argument('--limit', type=int, default=None, help='most games to take layouts from')
+    args = parser.parse_args(argv)
+    if args.kind == 'opening':
+        entry_amount = build_opening_book(args.output, args.plies, args.width, args.time,
+                                          progress=lambda amount: print('%d positions' % amount, file=sys.stderr))
+    else:
+        from .replay import read_games
+        layouts = [fence_list for fence_list in final_fence_layouts(read_games(args.games), args.limit)
+                   if len(fence_list) == TABLEBASE_FENCES]
+        if not layouts:
+            parser.error('no game of %s ended with all %d fences on the board' % (args.games, TABLEBASE_FENCES))
+        entry_amount = build_tablebase(args.output, layouts,
+                                       progress=lambda amount: print('%d layouts' % amount, file=sys.stderr))
+    print('wrote %d entries to %s' % (entry_amount, args.output), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,380 @@
+# Description: An opt-in, size-bounded LRU cache of the rule results of QuoridorGame, shared by any amount of games.
+#              Positions come up again and again in real play (common openings, transpositions, replays during
+#              analysis), and each time move_pawn, place_fence and the move generators work the same answers out again.
+#              PositionCache.attach puts caching wrappers on one game object as instance attributes, the same way
+#              quoridor.instrumentation does, and detach deletes them again, so a game which is not attached runs the
+#              plain class methods and pays nothing. It caches:
+#                  the legal pawn destinations (legal_pawn_moves, and move_pawn answers from them)
+#                  the legal fence slots (legal_fence_mask / legal_fences, and the fair-play check of place_fence)
+#                  the slots which would cut a pawn off from its goal line (legal_fence_mask)
+#              Entries are keyed by the Zobrist hash of the position, which holds every pawn, every fence, the fences
+#              left and the turn: a move changes the key, so an entry never goes stale, and nothing is cached once the
+#              game has a winner (the only part of a position which is not in the hash).
+#              With mirror=True a two-player position and its left-right mirror image share their entries, keyed by
+#              the smaller of the two hashes, for the results which are symmetric under that mirror: the cut-off
+#              slots and the pawn destinations when no pawn is next to the one moving. The fair-play rule (player 1 is
+#              closed in by the right side of the board and player 2 by the left side) and the diagonal moves around
+#              a pawn are not symmetric in these rules, so those are always cached for the position as it is.
+#                  cache = PositionCache(capacity=100000)
+#                  cache.attach(game)
+#                  ... play ...
+#                  cache.detach(game)
+#                  print(cache.get_stats())
+
+from collections import OrderedDict
+
+# the wrapped methods of QuoridorGame
+CACHED_METHODS = ('legal_pawn_moves', 'move_pawn', '_fence_masks', '_if_break_fair_play_rule')
+
+# the kinds of entries
+_PAWN = 0
+_MIRRORED_PAWN = 1
+_FENCE = 2
+_CUT_OFF = 3
+
+# the order legal_pawn_moves lists the destinations in, by their offset from the pawn
+_PAWN_MOVE_ORDER = {(0, -1): 0, (1, 0): 1, (0, 1): 2, (-1, 0): 3, (0, -2): 4, (2, 0): 5, (0, 2): 6, (-2, 0): 7,
+                    (1, -1): 8, (1, 1): 9, (-1, 1): 10, (-1, -1): 11}
+
+_MIRROR_INDEXES = {}
+
+
+def _mirror_indexes(size):
+    """
+    Takes the board size and returns a list which gives, for each move index, the move index of its left-right mirror
+    image. The vertical fences on the left side of the board are kept where they are: they always exist, so their
+    mask entries are always False.
+    """
+    if size not in _MIRROR_INDEXES:
+        index_list = []
+        for kind in (0, 1, 2):
+            for co_y in range(0, size):
+                for co_x in range(0, size):
+                    if kind < 2:
+                        mirror_x = size - 1 - co_x
+                    else:
+                        mirror_x = size - co_x if co_x > 0 else 0
+                    index_list.append((kind * size + co_y) * size + mirror_x)
+        _MIRROR_INDEXES[size] = index_list
+    return _MIRROR_INDEXES[size]
+
+
+class PositionCache:
+    """
+    Represents an LRU cache of rule results keyed by position, with counters of its hits, misses and evictions.
+    """
+
+    def __init__(self, capacity=65536, mirror=True):
+        """
+        Takes the most entries to keep (the least recently used one is evicted beyond that) and whether mirrored
+        two-player positions share their symmetric entries.
+        """
+        self._capacity = max(1, capacity)
+        self._mirror = mirror
+        self._entries = OrderedDict()
+        self._attached = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Sets the counters back to zero. The entries are kept.
+        """
+        self._hits = 0
+        self._mirrored_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def clear(self):
+        """
+        Removes every entry. The counters are kept.
+        """
+        self._entries.clear()
+
+    def __len__(self):
+        """
+        Returns the amount of entries.
+        """
+        return len(self._entries)
+
+    def get_stats(self):
+        """
+        Returns a dict of the counters: hits (of which mirrored_hits were answered from the mirror image of the
+        position), misses, evictions, the hit rate, the amount of entries and the capacity.
+        """
+        lookups = self._hits + self._misses
+        return {'hits': self._hits, 'mirrored_hits': self._mirrored_hits, 'misses': self._misses,
+                'evictions': self._evictions, 'hit_rate': self._hits / lookups if lookups else 0.0,
+                'entries': len(self._entries), 'capacity': self._capacity}
+
+    def attach(self, game):
+        """
+        Takes a QuoridorGame and starts answering its rule checks from the cache. Attaching a game twice does nothing,
+        and the cache holds on to the game until it is detached. When a game is also attached to an Instrumentation,
+        detach them in the reverse order they were attached in.
+        """
+        if id(game) in self._attached:
+            return
+        original_dict = {method_name: getattr(game, method_name) for method_name in CACHED_METHODS}
+        position = _PositionKeys(game, self._mirror)
+        game.__dict__['legal_pawn_moves'] = self._make_legal_pawn_moves(game, original_dict, position)
+        game.__dict__['move_pawn'] = self._make_move_pawn(game, original_dict, position)
+        game.__dict__['_fence_masks'] = self._make_fence_masks(game, original_dict, position)
+        game.__dict__['_if_break_fair_play_rule'] = self._make_fair_play_check(game, original_dict, position)
+        self._attached[id(game)] = game
+
+    def detach(self, game):
+        """
+        Takes an attached QuoridorGame and stops answering its rule checks from the cache. The entries are kept.
+        """
+        if self._attached.pop(id(game), None) is None:
+            return
+        for method_name in CACHED_METHODS:
+            game.__dict__.pop(method_name, None)
+
+    def _get(self, key):
+        """
+        A private method which takes a key and returns its entry, marked as the most recently used one, or None.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _put(self, key, entry):
+        """
+        A private method which takes a key and an entry and stores it, evicting the least recently used entry if the
+        cache is full.
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _make_legal_pawn_moves(self, game, original_dict, position):
+        """
+        A private method which takes a game, its original methods and its _PositionKeys, and returns a legal_pawn_moves
+        which answers from the cache.
+        """
+        original = original_dict['legal_pawn_moves']
+        board_size = game.get_board_size()
+
+        def legal_pawn_moves(player_id):
+            if game._which_turn != player_id or game._if_winner_exist() is True:
+                return original(player_id)
+            curr_pos = game._search_player(player_id).get_player_position()
+            if position.has_mirror() and not position.pawn_next_to(player_id, curr_pos):
+                canonical_hash, mirrored = position.get_canonical()
+                key = (_MIRRORED_PAWN, board_size, 2, canonical_hash)
+            else:
+                key = (_PAWN, board_size, position.player_amount, game._zobrist_hash)
+                mirrored = False
+            entry = self._get(key)
+            if entry is None:
+                self._misses += 1
+                legal_list = original(player_id)
+                if mirrored:
+                    mirror_pos = (board_size - 1 - curr_pos[0], curr_pos[1])
+                    self._put(key, tuple(_sort_pawn_moves(_mirror_cells(legal_list, board_size), mirror_pos)))
+                else:
+                    self._put(key, tuple(legal_list))
+                return legal_list
+            self._hits += 1
+            if not mirrored:
+                return list(entry)
+            self._mirrored_hits += 1
+            return _sort_pawn_moves(_mirror_cells(entry, board_size), curr_pos)
+        return legal_pawn_moves
+
+    @staticmethod
+    def _make_move_pawn(game, original_dict, position):
+        """
+        A private method which takes a game, its original methods and its _PositionKeys, and returns a move_pawn which
+        checks the move against the cached legal pawn destinations instead of working out its moving type.
+        """
+        original = original_dict['move_pawn']
+
+        def move_pawn(player_id, pawn_aiming_address):
+            if game._which_turn != player_id or game._if_winner_exist() is True:
+                return original(player_id, pawn_aiming_address)
+            if pawn_aiming_address not in game.legal_pawn_moves(player_id):
+                return False
+            game._move_player_pawn(player_id, pawn_aiming_address)
+            return True
+        return move_pawn
+
+    def _make_fence_masks(self, game, original_dict, position):
+        """
+        A private method which takes a game, its original methods and its _PositionKeys, and returns a _fence_masks
+        which answers from the cache: the legal slots for the position as it is, the cut-off slots for the position or
+        its mirror image.
+        """
+        original = original_dict['_fence_masks']
+        board_size = game.get_board_size()
+
+        def fence_masks(player_id, find_cut_off):
+            if game._which_turn != player_id or game._if_winner_exist() is True:
+                return original(player_id, find_cut_off)
+            # the four-player game works the cut-off slots out in any case, its fair-play rule is made of them
+            find_cut_off = find_cut_off or position.player_amount != 2
+            fence_key = (_FENCE, board_size, position.player_amount, game._zobrist_hash)
+            fence_entry = self._get(fence_key)
+            cut_off_key = None
+            cut_off_mask = None
+            mirrored = False
+            if find_cut_off:
+                if position.has_mirror():
+                    canonical_hash, mirrored = position.get_canonical()
+                    cut_off_key = (_CUT_OFF, board_size, 2, canonical_hash)
+                else:
+                    cut_off_key = (_CUT_OFF, board_size, position.player_amount, game._zobrist_hash)
+                cut_off_mask = self._get(cut_off_key)
+            legal_cached = fence_entry is not None and fence_entry[0] is not None
+            if legal_cached and (not find_cut_off or cut_off_mask is not None):
+                self._hits += 1
+                if not find_cut_off:
+                    return list(fence_entry[0]), [False] * len(fence_entry[0])
+                if mirrored:
+                    self._mirrored_hits += 1
+                    return list(fence_entry[0]), _mirror_mask(cut_off_mask, board_size)
+                return list(fence_entry[0]), list(cut_off_mask)
+            self._misses += 1
+            legal_mask, new_cut_off_mask = original(player_id, find_cut_off)
+            if fence_entry is None:
+                self._put(fence_key, [tuple(legal_mask), {}])
+            else:
+                fence_entry[0] = tuple(legal_mask)
+            if find_cut_off:
+                self._put(cut_off_key, tuple(_mirror_mask(new_cut_off_mask, board_size) if mirrored
+                                             else new_cut_off_mask))
+            return legal_mask, new_cut_off_mask
+        return fence_masks
+
+    def _make_fair_play_check(self, game, original_dict, position):
+        """
+        A private method which takes a game, its original methods and its _PositionKeys, and returns an
+        _if_break_fair_play_rule which answers from the cached legal slots of the position, or from the answers for
+        single slots kept when no legal slots were cached yet.
+        """
+        original = original_dict['_if_break_fair_play_rule']
+        board_size = game.get_board_size()
+
+        def if_break_fair_play_rule(player_id, v_or_h, fence_aiming_address):
+            if (v_or_h not in ('v', 'h') or game._which_turn != player_id or game._if_winner_exist() is True or
+                    not game._if_address_on_board(fence_aiming_address) or
+                    game._if_fence_exist(fence_aiming_address, v_or_h) is True):
+                return original(player_id, v_or_h, fence_aiming_address)
+            fence_key = (_FENCE, board_size, position.player_amount, game._zobrist_hash)
+            fence_entry = self._get(fence_key)
+            if fence_entry is not None:
+                if fence_entry[0] is not None and game._search_player(player_id).get_fence_amount() > 0:
+                    self._hits += 1
+                    index = ((1 if v_or_h == 'h' else 2) * board_size + fence_aiming_address[1]) * board_size + \
+                        fence_aiming_address[0]
+                    return not fence_entry[0][index]
+                breaks = fence_entry[1].get((v_or_h, fence_aiming_address))
+                if breaks is not None:
+                    self._hits += 1
+                    return breaks
+            else:
+                fence_entry = [None, {}]
+                self._put(fence_key, fence_entry)
+            self._misses += 1
+            breaks = original(player_id, v_or_h, fence_aiming_address)
+            fence_entry[1][(v_or_h, fence_aiming_address)] = breaks
+            return breaks
+        return if_break_fair_play_rule
+
+
+class _PositionKeys:
+    """
+    Represents the keys of the current position of one attached game: its Zobrist hash, and for a two-player game
+    cached with mirror=True the hash of its left-right mirror image, worked out once for each position.
+    """
+
+    def __init__(self, game, mirror):
+        """
+        Takes a QuoridorGame and whether its mirror image is looked up.
+        """
+        self._game = game
+        self.player_amount = game.get_player_amount()
+        self._mirror = mirror and self.player_amount == 2
+        self._last_hash = None
+        self._last_mirror_hash = None
+
+    def has_mirror(self):
+        """
+        Returns whether the mirror image of the position is looked up.
+        """
+        return self._mirror
+
+    def pawn_next_to(self, player_id, curr_pos):
+        """
+        Takes a player and the position of its pawn and returns whether another pawn stands next to it.
+        """
+        for player in self._game._other_players(player_id):
+            oppo_pos = player.get_player_position()
+            if abs(oppo_pos[0] - curr_pos[0]) + abs(oppo_pos[1] - curr_pos[1]) == 1:
+                return True
+        return False
+
+    def get_canonical(self):
+        """
+        Returns a tuple of the smaller of the hashes of the position and of its mirror image, and whether that one is
+        the mirror image's.
+        """
+        game = self._game
+        zobrist_hash = game._zobrist_hash
+        if zobrist_hash != self._last_hash:
+            self._last_hash = zobrist_hash
+            self._last_mirror_hash = self._compute_mirror_hash()
+        if self._last_mirror_hash < zobrist_hash:
+            return self._last_mirror_hash, True
+        return zobrist_hash, False
+
+    def _compute_mirror_hash(self):
+        """
+        A private method which returns the Zobrist hash of the left-right mirror image of the position. The turn and
+        the fences left are the same in both, and so are the fences on the four sides, so only the pawns and the
+        fences are swapped for their mirror images.
+        """
+        game = self._game
+        board_size = game.get_board_size()
+        pawn_keys = game._zobrist_pawn_keys
+        fence_keys = game._zobrist_fence_keys
+        mirror_hash = game._zobrist_hash
+        for player in game._players:
+            player_id = player.get_player_id()
+            pos = player.get_player_position()
+            mirror_hash ^= pawn_keys[(player_id, pos)] ^ pawn_keys[(player_id, (board_size - 1 - pos[0], pos[1]))]
+        for fence_address, fence_list in game._game_board.items():
+            if fence_list[0] == 'v_fence':
+                mirror_hash ^= fence_keys[('v', fence_address)]
+                mirror_hash ^= fence_keys[('v', (board_size - fence_address[0], fence_address[1]))]
+            if fence_list[1] == 'h_fence':
+                mirror_hash ^= fence_keys[('h', fence_address)]
+                mirror_hash ^= fence_keys[('h', (board_size - 1 - fence_address[0], fence_address[1]))]
+        return mirror_hash
+
+
+def _mirror_cells(cell_list, board_size):
+    """
+    Takes an iterable of cell position tuples and the board size and returns the list of their mirror images.
+    """
+    return [(board_size - 1 - address[0], address[1]) for address in cell_list]
+
+
+def _sort_pawn_moves(cell_list, curr_pos):
+    """
+    Takes a list of pawn destinations and the position of the pawn, and sorts the list in the order legal_pawn_moves
+    lists them in. Returns the list.
+    """
+    cell_list.sort(key=lambda address: _PAWN_MOVE_ORDER[(address[0] - curr_pos[0], address[1] - curr_pos[1])])
+    return cell_list
+
+
+def _mirror_mask(mask, board_size):
+    """
+    Takes a list of booleans in move_index order and the board size and returns the list for the mirror image.
+    """
+    return [mask[mirror_index] for mirror_index in _mirror_indexes(board_size)]
@@ -0,0 +1,55 @@
+# Description: The scripted demo game which used to run at the bottom of the game module: it places fences, moves
+#              both pawns, prints what some of the moves return and prints the final board. Run it with:
+#                  python -m quoridor
+
+from .game import QuoridorGame
+
+
+def main():
+    """
+    Plays the scripted demo game and prints the results and the board.
+    """
+    game_1 = QuoridorGame()
+    game_1.place_fence(1,'h',(4,1))
+    game_1.place_fence(1,'h',(4,2))
+    game_1.place_fence(2,'v',(4,1))
+    game_1.place_fence(1,'v',(4,2))
+    game_1.place_fence(2,'v',(4,9))
+    game_1.place_fence(2,'h',(8,8))
+    game_1.move_pawn(1, (3, 0))
+    game_1.move_pawn(2, (4, 7))
+    game_1.move_pawn(1, (3, 1))
+    game_1.move_pawn(2, (4, 6))
+    game_1.move_pawn(1, (3, 2))
+    game_1.move_pawn(2, (4, 5))
+    game_1.place_fence(1, 'v', (3, 3))
+    game_1.move_pawn(2, (4, 4))
+    game_1.move_pawn(1, (3, 3))
+    game_1.place_fence(2, 'h', (4, 3))
+    game_1.place_fence(1, 'h', (3, 3))
+    game_1.move_pawn(2, (4, 3))
+    game_1.move_pawn(1, (5, 3))
+    game_1.move_pawn(2, (4, 4))
+    game_1.place_fence(1, 'h', (3, 1))
+    game_1.place_fence(2, 'h', (2, 1))
+    game_1.place_fence(1, 'h', (1, 1))
+    game_1.place_fence(2, 'h', (7, 5))
+    print(game_1.place_fence(1, 'h', (0, 1)))
+    game_1.place_fence(1, 'h', (6, 4))
+    game_1.place_fence(2, 'h', (8, 5))
+    game_1.move_pawn(1, (6, 3))
+    game_1.place_fence(2, 'v', (6, 3))
+    game_1.move_pawn(1, (6, 2))
+    print(game_1.place_fence(2, 'v', (7, 4)))
+    print(game_1.move_pawn(2, (4, 3)))
+    print(game_1.move_pawn(1, (5, 2)))
+    print(game_1.move_pawn(2, (5, 3)))
+    print(game_1.place_fence(1, 'h', (5, 2)))
+    print(game_1.move_pawn(2, (6, 2)))
+    print(game_1.move_pawn(1, (5, 3)))
+    print(game_1.move_pawn(2, (6, 1)))
+    print(game_1.place_fence(1, 'h', (0, 1)))
+    print(game_1.move_pawn(2, (6, 0)))
+    print(game_1.move_pawn(1, (5, 4)))
+
+    game_1.print_board()
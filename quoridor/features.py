@@ -0,0 +1,242 @@
+# Description: A feature encoder which turns QuoridorGame positions into NumPy feature planes for batched neural-net
+#              inference, and maps the policy vector returned by the net back to legal moves. The planes are written
+#              in place into one array preallocated for the largest batch, so encoding a batch allocates nothing big.
+#              Positions are read from the compact tuple of QuoridorGame.get_state (pawns, fences left, turn and the
+#              fences placed so far), so only the fences on the board are visited instead of every cell.
+#              Every plane is 9 x 9 and indexed [y, x], the same cell layout as the rest of the game, so only
+#              positions of the 9x9 two-player game can be encoded; the others raise ValueError.
+
+import numpy as np
+
+from .game import QuoridorGame
+
+# plane indexes
+P1_PAWN_PLANE = 0
+P2_PAWN_PLANE = 1
+H_FENCE_PLANE = 2
+V_FENCE_PLANE = 3
+P1_FENCE_AMOUNT_PLANE = 4
+P2_FENCE_AMOUNT_PLANE = 5
+SIDE_TO_MOVE_PLANE = 6
+P1_DISTANCE_PLANE = 7
+P2_DISTANCE_PLANE = 8
+
+PLANE_AMOUNT = 7
+PLANE_AMOUNT_WITH_DISTANCE = 9
+POLICY_SIZE = 243
+UNREACHABLE_DISTANCE = 81
+
+
+def check_board_configuration(game):
+    """
+    Takes a QuoridorGame, or a tuple returned by QuoridorGame.get_state, and raises ValueError unless it is of the 9x9
+    two-player game, the only board the planes and the policy vector cover. A state tuple doesn't carry the board
+    size, so it is checked for its amount of players and for pawns or fences off the 9x9 board.
+    """
+    if isinstance(game, QuoridorGame):
+        size = game.get_board_size()
+        players = game.get_player_amount()
+        if size != 9 or players != 2:
+            raise ValueError('the features cover the 9x9 two-player board only, not a %dx%d board with %d players'
+                             % (size, size, players))
+        return
+    which_turn, player_states, fence_list = game
+    if len(player_states) != 2:
+        raise ValueError('the features cover the two-player game only, not a position with %d players'
+                         % len(player_states))
+    for address in [position for position, _, _ in player_states] + [address for _, address in fence_list]:
+        if not (0 <= address[0] < 9 and 0 <= address[1] < 9):
+            raise ValueError('the features cover the 9x9 board only, not a position with %r on it' % (address,))
+
+
+class FeatureEncoder:
+    """
+    Represents a feature encoder with a preallocated (max batch size, planes, 9, 9) array which is filled in place by
+    every call of encode. The planes are:
+    the pawn of player 1 and of player 2 (1 on the cell of the pawn), the horizontal and the vertical fences placed on
+    the board (1 on the address of the fence, the fences on the four sides are left out), the fences left for player 1
+    and for player 2 (the whole plane holds the amount), the side to move (1 everywhere when it's the turn of player
+    1), and optionally the distance map of player 1 and of player 2 (the least amount of one cell moves from each cell
+    to the goal line of that player, going around the fences and ignoring the pawns, UNREACHABLE_DISTANCE if the goal
+    line can't be reached).
+    """
+
+    def __init__(self, max_batch_size, with_distance=False, dtype=np.float32):
+        """
+        Takes the largest batch which will be encoded, whether to add the two distance map planes and the dtype of
+        the feature array.
+        """
+        self._max_batch_size = max_batch_size
+        self._with_distance = with_distance
+        plane_amount = PLANE_AMOUNT_WITH_DISTANCE if with_distance else PLANE_AMOUNT
+        self._planes = np.zeros((max_batch_size, plane_amount, 9, 9), dtype)
+        self._legal_masks = np.zeros((max_batch_size, POLICY_SIZE), bool)
+        self._fence_amounts = np.zeros((max_batch_size, 2), dtype)
+        self._player_1_turns = np.zeros(max_batch_size, dtype)
+        # the distance maps and the scratch arrays they are relaxed in
+        self._distances = np.zeros((max_batch_size, 2, 9, 9), np.int16)
+        self._previous = np.zeros((max_batch_size, 2, 9, 9), np.int16)
+        self._changed = np.zeros((max_batch_size, 2, 9, 9), bool)
+        self._up_blocks = np.zeros((max_batch_size, 1, 8, 9), np.int16)
+        self._left_blocks = np.zeros((max_batch_size, 1, 9, 8), np.int16)
+        self._up_steps = np.zeros((max_batch_size, 2, 8, 9), np.int16)
+        self._left_steps = np.zeros((max_batch_size, 2, 9, 8), np.int16)
+
+    def get_plane_amount(self):
+        """
+        Returns the amount of planes of every encoded position.
+        """
+        return self._planes.shape[1]
+
+    def encode(self, games):
+        """
+        Takes a list of QuoridorGame objects, or of tuples returned by QuoridorGame.get_state, and writes their
+        feature planes into the preallocated array.
+        Returns a view of the first len(games) rows of the array, of shape (len(games), planes, 9, 9). The view is
+        overwritten by the next call of encode, so it should be copied if it has to be kept.
+        Raises ValueError if a position is not of the 9x9 two-player game.
+        """
+        batch_size = len(games)
+        if batch_size > self._max_batch_size:
+            raise ValueError('the batch has %d positions, more than the %d the encoder was made for'
+                             % (batch_size, self._max_batch_size))
+        planes = self._planes[0:batch_size]
+        planes[:, 0:P1_FENCE_AMOUNT_PLANE] = 0
+        pawn_games = []
+        pawn_planes = []
+        pawn_ys = []
+        pawn_xs = []
+        fence_games = []
+        fence_planes = []
+        fence_ys = []
+        fence_xs = []
+        fence_amounts = self._fence_amounts[0:batch_size]
+        player_1_turns = self._player_1_turns[0:batch_size]
+        for game_index, game in enumerate(games):
+            which_turn, player_states, fence_list = self._state_of(game)
+            for plane, (position, fence_amount, is_winner) in enumerate(player_states):
+                pawn_games.append(game_index)
+                pawn_planes.append(plane)
+                pawn_xs.append(position[0])
+                pawn_ys.append(position[1])
+                fence_amounts[game_index, plane] = fence_amount
+            player_1_turns[game_index] = which_turn == 1
+            for v_or_h, fence_address in fence_list:
+                fence_games.append(game_index)
+                fence_planes.append(H_FENCE_PLANE if v_or_h == 'h' else V_FENCE_PLANE)
+                fence_xs.append(fence_address[0])
+                fence_ys.append(fence_address[1])
+        planes[pawn_games, pawn_planes, pawn_ys, pawn_xs] = 1
+        planes[fence_games, fence_planes, fence_ys, fence_xs] = 1
+        planes[:, P1_FENCE_AMOUNT_PLANE:P2_FENCE_AMOUNT_PLANE + 1] = fence_amounts[:, :, None, None]
+        planes[:, SIDE_TO_MOVE_PLANE] = player_1_turns[:, None, None]
+        if self._with_distance:
+            distances = self._fill_distance_maps(planes)
+            planes[:, P1_DISTANCE_PLANE:P2_DISTANCE_PLANE + 1] = distances
+        return planes
+
+    def legal_masks(self, games):
+        """
+        Takes a list of QuoridorGame objects and returns a view of a preallocated (len(games), 243) boolean array,
+        telling for every game which moves (in QuoridorGame.move_index order) the player to move can make. The view
+        is overwritten by the next call.
+        Raises ValueError if a game is not of the 9x9 two-player game.
+        """
+        batch_size = len(games)
+        if batch_size > self._max_batch_size:
+            raise ValueError('the batch has %d positions, more than the %d the encoder was made for'
+                             % (batch_size, self._max_batch_size))
+        masks = self._legal_masks[0:batch_size]
+        masks[:] = False
+        for game_index, game in enumerate(games):
+            check_board_configuration(game)
+            move_indexes = [game.move_index(move) for move in game.legal_moves(game.get_which_turn())]
+            masks[game_index, move_indexes] = True
+        return masks
+
+    def _state_of(self, game):
+        """
+        A private method which takes a QuoridorGame or a tuple returned by QuoridorGame.get_state and returns the
+        state tuple. Raises ValueError if it is not of the 9x9 two-player game.
+        """
+        check_board_configuration(game)
+        if isinstance(game, QuoridorGame):
+            return game.get_state()
+        return game
+
+    def _fill_distance_maps(self, planes):
+        """
+        A private method which takes the (N, planes, 9, 9) feature array with the fence planes filled and returns a
+        view of the preallocated (N, 2, 9, 9) array, filled with the distance map of player 1 and of player 2 for
+        every board.
+        The distances are found for the whole batch at once: every cell takes one more than the smallest distance of
+        the open cells next to it until nothing changes. Every step writes into the preallocated scratch arrays.
+        """
+        batch_size = len(planes)
+        distances = self._distances[0:batch_size]
+        previous = self._previous[0:batch_size]
+        changed = self._changed[0:batch_size]
+        distances[:] = UNREACHABLE_DISTANCE
+        distances[:, 0, 8, :] = 0  # player 1 goes to y = 8
+        distances[:, 1, 0, :] = 0  # player 2 goes to y = 0
+        # the fences on the four sides are not in the planes, so only the moves between two cells are checked.
+        # a horizontal fence at (x, y) is between (x, y - 1) and (x, y), a vertical one between (x - 1, y) and (x, y).
+        # a move costs 1, and UNREACHABLE_DISTANCE more across a fence, so a move across a fence never lowers a distance
+        up_blocks = self._up_blocks[0:batch_size]
+        left_blocks = self._left_blocks[0:batch_size]
+        np.multiply(planes[:, H_FENCE_PLANE, 1:9, :], UNREACHABLE_DISTANCE, out=up_blocks[:, 0], casting='unsafe')
+        np.multiply(planes[:, V_FENCE_PLANE, :, 1:9], UNREACHABLE_DISTANCE, out=left_blocks[:, 0], casting='unsafe')
+        np.add(up_blocks, 1, out=up_blocks)
+        np.add(left_blocks, 1, out=left_blocks)
+        up_steps = self._up_steps[0:batch_size]
+        left_steps = self._left_steps[0:batch_size]
+        while True:
+            previous[:] = distances
+            np.add(previous[:, :, 0:8, :], up_blocks, out=up_steps)
+            np.minimum(distances[:, :, 1:9, :], up_steps, out=distances[:, :, 1:9, :])
+            np.add(previous[:, :, 1:9, :], up_blocks, out=up_steps)
+            np.minimum(distances[:, :, 0:8, :], up_steps, out=distances[:, :, 0:8, :])
+            np.add(previous[:, :, :, 0:8], left_blocks, out=left_steps)
+            np.minimum(distances[:, :, :, 1:9], left_steps, out=distances[:, :, :, 1:9])
+            np.add(previous[:, :, :, 1:9], left_blocks, out=left_steps)
+            np.minimum(distances[:, :, :, 0:8], left_steps, out=distances[:, :, :, 0:8])
+            np.not_equal(previous, distances, out=changed)
+            if not changed.any():
+                return distances
+
+
+def policy_to_moves(game, policy):
+    """
+    Takes a QuoridorGame and a policy vector of 243 values in QuoridorGame.move_index order, as returned by the net,
+    and returns a list of (move tuple, probability) tuples for the legal moves of the player to move, in the order of
+    QuoridorGame.legal_moves. The values of the illegal moves are dropped and the rest are scaled to add up to 1, or
+    made equal if they add up to 0.
+    Raises ValueError if the game is not of the 9x9 two-player game.
+    """
+    check_board_configuration(game)
+    legal_move_list = game.legal_moves(game.get_which_turn())
+    if not legal_move_list:
+        return []
+    policy = np.asarray(policy)
+    values = policy[[game.move_index(move) for move in legal_move_list]].astype(np.float64)
+    total = values.sum()
+    if total > 0:
+        values /= total
+    else:
+        values[:] = 1.0 / len(legal_move_list)
+    return list(zip(legal_move_list, values.tolist()))
+
+
+def best_legal_move(game, policy):
+    """
+    Takes a QuoridorGame and a policy vector of 243 values in QuoridorGame.move_index order and returns the legal
+    move with the highest value, or None if the player to move has no legal move.
+    Raises ValueError if the game is not of the 9x9 two-player game.
+    """
+    check_board_configuration(game)
+    legal_move_list = game.legal_moves(game.get_which_turn())
+    if not legal_move_list:
+        return None
+    policy = np.asarray(policy)
+    values = policy[[game.move_index(move) for move in legal_move_list]]
+    return legal_move_list[int(np.argmax(values))]
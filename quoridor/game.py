@@ -0,0 +1,1479 @@
+# Author: Jing Liu
+# Date: 8/12/2021
+# Description: A class named QuoridorGame for playing a board game called Quoridor. It's a program for a two-player
+#              version of the game. Each player will have 10 fences. The board is formed by 9x9 cells, and the pawn
+#              will move on the cells. The fence will be placed on the edges of the cells. The four sides of the
+#              board are treated as fences and no more fence should be placed on top of it. The cell coordinates are
+#              expressed in (x,y) where x is the column number and y is the row numberThe board positions start with
+#              (0,0) and end at (8,8). At the beginning of the game, player 1 places pawn 1 (P1) on the top center of
+#              the board and player 2 places pawn 2 (P2) on the bottom center of the board. The position of P1 and P2
+#              is (4,0) and (4,8) when the game begins. The four edges are labeled as fences. The row of the cells
+#              where the pawns are positioned at the start of the game are called base lines. A fence is 1 cell long
+#              in contrast to what you find the video and PDF saying. When each player tries to place a fence on the
+#              board, the position of the fence is defined by a letter and coordinates. For vertical fences, we use v
+#              and for horizontal fences, we use h. As an example, for the blue fence (vertical) in the picture, we
+#              use the coordinate of the top corner to define it and for the red fence (horizontal), we use coordinate
+#              of the left corner to define it.
+
+import heapq
+import random
+from collections import deque
+
+from .render import board_lines
+
+# Zobrist keys, one random 64-bit number for every pawn position, fence slot, amount of fences left and turn. They are
+# drawn from a fixed seed so that a position hashes to the same number in every process. A table is drawn once for
+# every board configuration, always in the same order, so the keys of the 9x9 two-player game never change. Only the
+# tables of the last few configurations are kept, so games of ever new configurations don't fill the memory; a table
+# dropped is drawn again, the same, when it is needed again.
+_ZOBRIST_TABLES = {}
+_ZOBRIST_TABLE_LIMIT = 16
+
+
+def _zobrist_table(size, player_amount, fence_amount):
+    """
+    Takes the board size, the amount of players and the amount of fences each player starts with, and returns a tuple
+    of four dicts of Zobrist keys: pawn keys keyed by (player id, position), fence keys keyed by (v or h, position),
+    fence amount keys keyed by (player id, amount) and turn keys keyed by player id.
+    """
+    table_key = (size, player_amount, fence_amount)
+    if table_key not in _ZOBRIST_TABLES:
+        zobrist_random = random.Random(20210812)
+        pawn_keys = {}
+        fence_keys = {}
+        fence_amount_keys = {}
+        turn_keys = {}
+        for player_id in range(1, player_amount + 1):
+            for co_y in range(0, size):
+                for co_x in range(0, size):
+                    pawn_keys[(player_id, (co_x, co_y))] = zobrist_random.getrandbits(64)
+            for amount in range(0, fence_amount + 1):
+                fence_amount_keys[(player_id, amount)] = zobrist_random.getrandbits(64)
+            turn_keys[player_id] = zobrist_random.getrandbits(64)
+        for v_or_h in ('v', 'h'):
+            for co_y in range(0, size + 1):
+                for co_x in range(0, size + 1):
+                    fence_keys[(v_or_h, (co_x, co_y))] = zobrist_random.getrandbits(64)
+        if len(_ZOBRIST_TABLES) >= _ZOBRIST_TABLE_LIMIT:
+            del _ZOBRIST_TABLES[next(iter(_ZOBRIST_TABLES))]
+        _ZOBRIST_TABLES[table_key] = (pawn_keys, fence_keys, fence_amount_keys, turn_keys)
+    return _ZOBRIST_TABLES[table_key]
+
+
+class Player:
+    """
+    Represents a Player to play the Quoridor Game.
+    It will communicate with the QuoridorGame class as a default private date member of QuoridorGame
+    init method.
+    """
+
+    __slots__ = ('_player_id', '_position', '_goal', '_is_winner', '_fence_amount')
+
+    def __init__(self, player_id, size=9, fence_amount=10):
+        """
+        Takes the player id, the board size and the amount of fences, and initializes the new player with the pawn
+        placed in the correct initial position: player 1 on the middle of the top row, player 2 on the middle of the
+        bottom row, player 3 on the middle of the left column and player 4 on the middle of the right column. Each
+        player's goal line is the side of the board across from its start.
+        It will have _is_winner data member represents whether this player has won or not.
+        It will have 10 initial fences for this player to use by default.
+        """
+        self._player_id = player_id
+        middle = size // 2
+        if player_id == 1:
+            self._position = (middle, 0)
+            self._goal = (1, size - 1)
+        elif player_id == 2:
+            self._position = (middle, size - 1)
+            self._goal = (1, 0)
+        elif player_id == 3:
+            self._position = (0, middle)
+            self._goal = (0, size - 1)
+        elif player_id == 4:
+            self._position = (size - 1, middle)
+            self._goal = (0, 0)
+        self._is_winner = False
+        self._fence_amount = fence_amount
+
+    def get_player_id(self):
+        """
+        Returns the player's id.
+        """
+        return self._player_id
+
+    def get_player_position(self):
+        """
+        Returns the player's position.
+        """
+        return self._position
+
+    def get_goal(self):
+        """
+        Returns the goal line of the player as a tuple of the axis (0 for a column, 1 for a row) and the line number.
+        """
+        return self._goal
+
+    def if_on_goal_line(self, pos_tuple):
+        """
+        Takes a position tuple and returns whether it is on the player's goal line.
+        """
+        return pos_tuple[self._goal[0]] == self._goal[1]
+
+    def get_is_winner(self):
+        """
+        Returns True is the player has won, returns False if not.
+        """
+        return self._is_winner
+
+    def get_fence_amount(self):
+        """
+        Returns the left amount of fences for the player to use.
+        """
+        return self._fence_amount
+
+    def set_player_position(self, pos_tuple):
+        """
+        Updates the player's position.
+        """
+        self._position = pos_tuple
+
+    def set_is_winner(self):
+        """
+        Updates the player to winner.
+        """
+        self._is_winner = True
+
+    def deduct_fence_amount(self):
+        """
+        Updates the fence amount.
+        """
+        self._fence_amount -= 1
+
+    def set_fence_amount(self, fence_amount):
+        """
+        Updates the fence amount to the given one.
+        """
+        self._fence_amount = fence_amount
+
+    def add_fence_amount(self):
+        """
+        Gives one fence back to the player.
+        """
+        self._fence_amount += 1
+
+    def clear_is_winner(self):
+        """
+        Updates the player back to not being the winner.
+        """
+        self._is_winner = False
+
+
+class FenceVertexGraph:
+    """
+    Represents the vertices of the fences on the board, joined into connected components by the fences placed on
+    them. A horizontal fence at (x, y) joins the vertices (x, y) and (x + 1, y), a vertical fence at (x, y) joins the
+    vertices (x, y) and (x, y + 1). It is kept up to date one fence at a time by QuoridorGame and answers the
+    fair-play rule by looking up components instead of walking the fences again.
+    Vertices on the right (x = size) and bottom (y = size) side are never walked from, so they are not kept in the
+    components: a fence reaching one of them only marks its component as touching the left or the right side.
+    Components are never path-compressed, so every added fence can be taken back in reverse order.
+    """
+
+    LEFT_SIDE = 1
+    RIGHT_SIDE = 2
+
+    def __init__(self, board_size=9):
+        """
+        Takes the board size and initializes every vertex as its own component. The vertices on the left side (x = 0)
+        start out marked as touching the left side.
+        """
+        self._board_size = board_size
+        vertex_amount = (board_size + 1) * (board_size + 1)
+        self._parent = list(range(0, vertex_amount))
+        self._size = [1] * vertex_amount
+        self._side = [0] * vertex_amount
+        self._history = []
+        for index in range(0, board_size):
+            self._side[self._vertex_index((0, index))] = self.LEFT_SIDE
+
+    def copy(self):
+        """
+        Returns a new FenceVertexGraph with the same components and history as this one.
+        """
+        graph_copy = FenceVertexGraph.__new__(FenceVertexGraph)
+        graph_copy._board_size = self._board_size
+        graph_copy._parent = list(self._parent)
+        graph_copy._size = list(self._size)
+        graph_copy._side = list(self._side)
+        graph_copy._history = list(self._history)
+        return graph_copy
+
+    def _vertex_index(self, vertex):
+        """
+        A private method which takes a vertex tuple and returns its index in the component lists.
+        """
+        return vertex[1] * (self._board_size + 1) + vertex[0]
+
+    def _find(self, index):
+        """
+        A private method which takes a vertex index and returns the index of the root of its component.
+        """
+        parent = self._parent
+        while parent[index] != index:
+            index = parent[index]
+        return index
+
+    def _side_of_walk_only_vertex(self, vertex):
+        """
+        A private method which takes a vertex on the right or bottom side and returns which side it marks a
+        component with when a fence reaches it.
+        """
+        if vertex[0] == self._board_size:
+            return self.RIGHT_SIDE
+        if vertex[0] == 0:
+            return self.LEFT_SIDE
+        return 0
+
+    def _fence_vertices(self, v_or_h, fence_address):
+        """
+        A private method which takes a letter (v or h) and a fence address and returns the two vertices it joins.
+        """
+        if v_or_h == 'h':
+            return fence_address, (fence_address[0] + 1, fence_address[1])
+        return fence_address, (fence_address[0], fence_address[1] + 1)
+
+    def _if_walked_from(self, vertex):
+        """
+        A private method which takes a vertex and returns whether it is walked from, i.e. it is not on the right or
+        bottom side.
+        """
+        return vertex[0] in range(0, self._board_size) and vertex[1] in range(0, self._board_size)
+
+    def add_fence(self, v_or_h, fence_address):
+        """
+        Takes a letter (v or h) and a fence address and joins the vertices of that fence.
+        """
+        vertex_a, vertex_b = self._fence_vertices(v_or_h, fence_address)
+        if not self._if_walked_from(vertex_a):
+            vertex_a, vertex_b = vertex_b, vertex_a
+        if not self._if_walked_from(vertex_a):
+            self._history.append(None)
+            return
+        root_a = self._find(self._vertex_index(vertex_a))
+        if not self._if_walked_from(vertex_b):
+            self._history.append((root_a, None, self._side[root_a]))
+            self._side[root_a] |= self._side_of_walk_only_vertex(vertex_b)
+            return
+        root_b = self._find(self._vertex_index(vertex_b))
+        if root_a == root_b:
+            self._history.append(None)
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._history.append((root_a, root_b, self._side[root_a]))
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+        self._side[root_a] |= self._side[root_b]
+
+    def remove_last_fence(self):
+        """
+        Takes back the fence added last, splitting the components it joined again.
+        """
+        last_change = self._history.pop()
+        if last_change is None:
+            return
+        root_a, root_b, side_a = last_change
+        self._side[root_a] = side_a
+        if root_b is not None:
+            self._parent[root_b] = root_b
+            self._size[root_a] -= self._size[root_b]
+
+    def side_with_fence(self, v_or_h, fence_address):
+        """
+        Takes a letter (v or h) and a fence address which is not placed yet and returns a tuple of the roots of the
+        components that fence would join and the sides the joined component would touch, without changing anything.
+        """
+        vertex_a, vertex_b = self._fence_vertices(v_or_h, fence_address)
+        if not self._if_walked_from(vertex_a):
+            vertex_a, vertex_b = vertex_b, vertex_a
+        if not self._if_walked_from(vertex_a):
+            return (), 0
+        root_a = self._find(self._vertex_index(vertex_a))
+        if not self._if_walked_from(vertex_b):
+            return (root_a,), self._side[root_a] | self._side_of_walk_only_vertex(vertex_b)
+        root_b = self._find(self._vertex_index(vertex_b))
+        return (root_a, root_b), self._side[root_a] | self._side[root_b]
+
+    def root_of(self, vertex):
+        """
+        Takes a vertex which is walked from and returns the index of the root of its component.
+        """
+        return self._find(self._vertex_index(vertex))
+
+    def side_of(self, vertex, new_fence_roots=(), new_fence_side=0):
+        """
+        Takes a vertex and returns the sides its component touches. If the roots and sides returned by
+        side_with_fence are given, the component is looked up as if that fence was placed.
+        """
+        root = self._find(self._vertex_index(vertex))
+        if root in new_fence_roots:
+            return new_fence_side
+        return self._side[root]
+
+
+class GoalDistanceMap:
+    """
+    Represents the distance map of one goal line: the least amount of one cell moves from every cell of the board to
+    that line, going around the fences and ignoring the pawns. It is kept up to date one fence at a time by
+    QuoridorGame with a dynamic BFS: a new fence only cuts the move between the two cells it separates, so only the
+    cells whose every shortest path went through that move are looked at again, and everything else keeps its
+    distance. Every change is recorded, so every added fence can be taken back in reverse order.
+    A fence is only noted when it is added, and the distances are repaired for the noted fences, in order, on the next
+    read, so the fences placed and taken back again without a read in between cost next to nothing.
+    """
+
+    # the tables which only depend on the board size and the goal line, shared by every map: keyed by (goal, board
+    # size), each one is a tuple of the goal cell indexes, the distances of the empty board and the neighbour slots
+    _EMPTY_BOARD_TABLES = {}
+
+    def __init__(self, goal, board_size=9):
+        """
+        Takes the goal line as a tuple of the axis (0 for a column, 1 for a row) and the line number, and the board
+        size, and initializes the distances of the empty board.
+        """
+        self._board_size = board_size
+        # the distance of a cell which can't reach the goal line, more than any path on the board
+        self._unreachable = board_size * board_size
+        if (goal, board_size) not in self._EMPTY_BOARD_TABLES:
+            self._EMPTY_BOARD_TABLES[(goal, board_size)] = self._empty_board_tables(goal, board_size)
+        self._goal_index_list, empty_distance, self._neighbours = self._EMPTY_BOARD_TABLES[(goal, board_size)]
+        self._distance = list(empty_distance)
+        self._blocked = bytearray(board_size * board_size * 4)  # 4 slots per cell, one for every direction
+        self._history = []
+        self._pending = []  # the fences added after the last repair, in order
+
+    def _empty_board_tables(self, goal, board_size):
+        """
+        A private method which takes the goal line and the board size and returns a tuple of the goal cell indexes,
+        the distances of every cell on the empty board and, for every cell, the tuple of its (slot, neighbour cell)
+        pairs.
+        """
+        cell_amount = board_size * board_size
+        goal_index_list = []
+        distance = []
+        for index in range(0, cell_amount):
+            cell = (index % board_size, index // board_size)
+            if cell[goal[0]] == goal[1]:
+                goal_index_list.append(index)
+            distance.append(abs(goal[1] - cell[goal[0]]))
+        neighbours = []
+        for index in range(0, cell_amount):
+            co_x = index % board_size
+            co_y = index // board_size
+            neighbour_list = []
+            # up, right, down, left
+            for direction, (next_x, next_y) in enumerate(((co_x, co_y - 1), (co_x + 1, co_y), (co_x, co_y + 1),
+                                                          (co_x - 1, co_y))):
+                if next_x in range(0, board_size) and next_y in range(0, board_size):
+                    neighbour_list.append((index * 4 + direction, next_y * board_size + next_x))
+            neighbours.append(tuple(neighbour_list))
+        return tuple(goal_index_list), tuple(distance), tuple(neighbours)
+
+    def _cut_slots(self, v_or_h, fence_address):
+        """
+        A private method which takes a letter (v or h) and a fence address and returns the two cells the fence
+        separates and the blocked slot of each of them, or None if the fence is on one of the four sides.
+        """
+        board_size = self._board_size
+        co_x = fence_address[0]
+        co_y = fence_address[1]
+        if v_or_h == 'h' and co_x in range(0, board_size) and co_y in range(1, board_size):
+            cell_a = (co_y - 1) * board_size + co_x
+            cell_b = co_y * board_size + co_x
+            return cell_a, cell_a * 4 + 2, cell_b, cell_b * 4 + 0
+        if v_or_h == 'v' and co_x in range(1, board_size) and co_y in range(0, board_size):
+            cell_a = co_y * board_size + co_x - 1
+            cell_b = co_y * board_size + co_x
+            return cell_a, cell_a * 4 + 1, cell_b, cell_b * 4 + 3
+        return None
+
+    def distance_of(self, position):
+        """
+        Takes a cell position and returns its distance to the goal line, or None if the line can't be reached.
+        """
+        if self._pending:
+            self._repair()
+        distance = self._distance[position[1] * self._board_size + position[0]]
+        if distance == self._unreachable:
+            return None
+        return distance
+
+    def path_from(self, position):
+        """
+        Takes a cell position and returns a list of the cells of a shortest path from it to the goal line, both ends
+        included, or None if the line can't be reached. Where there is a choice, the first open cell in the order up,
+        right, down, left is taken.
+        """
+        if self._pending:
+            self._repair()
+        board_size = self._board_size
+        index = position[1] * board_size + position[0]
+        distance = self._distance
+        if distance[index] == self._unreachable:
+            return None
+        path = [position]
+        while distance[index] > 0:
+            for slot, next_index in self._neighbours[index]:
+                if not self._blocked[slot] and distance[next_index] == distance[index] - 1:
+                    index = next_index
+                    break
+            path.append((index % board_size, index // board_size))
+        return path
+
+    def cut_fences_from(self, position):
+        """
+        Takes a cell position and returns a set of the fences, as (v or h, position tuple) tuples, each of which alone
+        would cut that cell off from the goal line, or None if the cell is already cut off.
+        The cut fences are the bridges of the graph of the cells and their open moves, with one more node joined to
+        every cell of the goal line, which lie on the way from the goal line to the cell. They are all found with one
+        depth-first search from the goal line, walked with a stack so any board size is fine.
+        """
+        if self._pending:
+            self._repair()
+        start_index = position[1] * self._board_size + position[0]
+        if self._distance[start_index] == self._unreachable:
+            return None
+        neighbours = self._neighbours
+        blocked = self._blocked
+        goal_node = len(self._distance)
+        order = [-1] * (goal_node + 1)  # when each node is first reached
+        low = [0] * (goal_node + 1)  # the earliest node reached from its subtree with at most one move back up
+        parent = [-1] * (goal_node + 1)
+        order[goal_node] = low[goal_node] = 0
+        counter = 1
+        goal_index_set = set(self._goal_index_list)
+        stack = [(goal_node, iter([(None, goal_index) for goal_index in self._goal_index_list]))]
+        while stack:
+            node, next_list = stack[-1]
+            for slot, next_index in next_list:
+                if slot is not None and blocked[slot]:
+                    continue
+                if order[next_index] == -1:
+                    order[next_index] = low[next_index] = counter
+                    counter += 1
+                    if node != goal_node and next_index in goal_index_set:
+                        low[next_index] = 0  # the move back to the goal node
+                    parent[next_index] = node
+                    stack.append((next_index, iter(neighbours[next_index])))
+                    break
+                if next_index != parent[node] and order[next_index] < low[node]:
+                    low[node] = order[next_index]
+            else:
+                stack.pop()
+                if stack and low[node] < low[stack[-1][0]]:
+                    low[stack[-1][0]] = low[node]
+        cut_set = set()
+        index = start_index
+        while parent[index] != goal_node:
+            parent_index = parent[index]
+            if low[index] > order[parent_index]:
+                cut_set.add(self._fence_between(parent_index, index))
+            index = parent_index
+        return cut_set
+
+    def fence_between_cells(self, position_a, position_b):
+        """
+        Takes two cell positions next to each other and returns the fence which would separate them, as a (v or h,
+        position tuple) tuple.
+        """
+        board_size = self._board_size
+        return self._fence_between(position_a[1] * board_size + position_a[0],
+                                   position_b[1] * board_size + position_b[0])
+
+    def _fence_between(self, index_a, index_b):
+        """
+        A private method which takes two cells next to each other and returns the fence which would separate them.
+        """
+        board_size = self._board_size
+        if index_a > index_b:
+            index_a, index_b = index_b, index_a
+        if index_b - index_a == board_size:
+            return 'h', (index_b % board_size, index_b // board_size)
+        return 'v', (index_b % board_size, index_b // board_size)
+
+    def add_fence(self, v_or_h, fence_address):
+        """
+        Takes a letter (v or h) and a fence address and notes the fence, which cuts the move between the two cells it
+        separates. The distances are repaired for it on the next read.
+        """
+        self._pending.append((v_or_h, fence_address))
+
+    def _repair(self):
+        """
+        A private method which updates the distances for the fences noted since the last repair, one at a time in the
+        order they were added.
+        """
+        for v_or_h, fence_address in self._pending:
+            self._apply_fence(v_or_h, fence_address)
+        self._pending = []
+
+    def _apply_fence(self, v_or_h, fence_address):
+        """
+        A private method which takes a letter (v or h) and a fence address, blocks the move the fence cuts and updates
+        the distances of the cells which lost their shortest paths.
+        """
+        cut = self._cut_slots(v_or_h, fence_address)
+        if cut is None or self._blocked[cut[1]]:
+            self._history.append(None)
+            return
+        cell_a, slot_a, cell_b, slot_b = cut
+        self._blocked[slot_a] = 1
+        self._blocked[slot_b] = 1
+        changed_list = []
+        distance = self._distance
+        if distance[cell_a] != distance[cell_b]:
+            far_cell = cell_a if distance[cell_a] > distance[cell_b] else cell_b
+            if not self._if_supported(far_cell, ()):
+                changed_list = self._recompute_from(far_cell)
+        self._history.append((slot_a, slot_b, changed_list))
+
+    def remove_last_fence(self):
+        """
+        Takes back the fence added last, restoring the move it cut and the distances it changed.
+        """
+        if self._pending:
+            self._pending.pop()
+            return
+        last_change = self._history.pop()
+        if last_change is None:
+            return
+        slot_a, slot_b, changed_list = last_change
+        self._blocked[slot_a] = 0
+        self._blocked[slot_b] = 0
+        distance = self._distance
+        for index, old_distance in reversed(changed_list):
+            distance[index] = old_distance
+
+    def _if_supported(self, index, lost_cells):
+        """
+        A private method which takes a cell index and a collection of cells which have lost their distance, and
+        returns whether the cell still has an open neighbour one move closer to the goal line.
+        """
+        distance = self._distance
+        wanted = distance[index] - 1
+        for slot, next_index in self._neighbours[index]:
+            if not self._blocked[slot] and distance[next_index] == wanted and next_index not in lost_cells:
+                return True
+        return False
+
+    def _recompute_from(self, start_index):
+        """
+        A private method which takes a cell which has lost every shortest path, finds every cell which has lost its
+        shortest paths through it, and finds their distances again from the cells around them which kept theirs.
+        Returns a list of (cell index, old distance) tuples of the cells changed.
+        """
+        distance = self._distance
+        neighbours = self._neighbours
+        blocked = self._blocked
+        # the cells are walked in the order of their distance, so every closer cell which lost its distance is known
+        # by the time a cell is checked for another shortest path
+        lost_cells = {start_index}
+        queue = deque([start_index])
+        while queue:
+            index = queue.popleft()
+            further = distance[index] + 1
+            for slot, next_index in neighbours[index]:
+                if (not blocked[slot] and distance[next_index] == further and next_index not in lost_cells and
+                        not self._if_supported(next_index, lost_cells)):
+                    lost_cells.add(next_index)
+                    queue.append(next_index)
+        changed_list = [(index, distance[index]) for index in lost_cells]
+        heap = []
+        for index in lost_cells:
+            best = self._unreachable
+            for slot, next_index in neighbours[index]:
+                if not blocked[slot] and next_index not in lost_cells and distance[next_index] + 1 < best:
+                    best = distance[next_index] + 1
+            distance[index] = best
+            if best != self._unreachable:
+                heap.append((best, index))
+        heapq.heapify(heap)
+        while heap:
+            curr_distance, index = heapq.heappop(heap)
+            if curr_distance != distance[index]:
+                continue
+            for slot, next_index in neighbours[index]:
+                if not blocked[slot] and next_index in lost_cells and curr_distance + 1 < distance[next_index]:
+                    distance[next_index] = curr_distance + 1
+                    heapq.heappush(heap, (curr_distance + 1, next_index))
+        return changed_list
+
+
+class QuoridorGame:
+    """
+    Represents a QuoridorGame for playing a board game called Quoridor.
+    In it's init method, it will communicate with the Player class in order to create two new Player 1 and Player 2,
+    or four players for the four-player game.
+    """
+
+    # the fence vertex components of the fences on the four sides, keyed by board size, copied by every new game
+    _SIDE_FENCE_GRAPHS = {}
+
+    def __init__(self, size=9, fences=None, players=2):
+        """
+        Takes the board size, the amount of fences each player starts with (10 for two players and 5 for four players
+        by default) and the amount of players (2 or 4), and initializes the board with the fences and pawns placed in
+        the correct positions. The players move in the order of their ids.
+        """
+        if players not in (2, 4):
+            raise ValueError('players must be 2 or 4, not %r' % (players,))
+        if size < 3:
+            raise ValueError('size must be at least 3, not %r' % (size,))
+        if fences is None:
+            fences = 10 if players == 2 else 5
+        if fences < 0:
+            raise ValueError('fences must be at least 0, not %r' % (fences,))
+        self._board_size = size
+        self._starting_fence_amount = fences
+        self._player_ids = tuple(range(1, players + 1))
+        self._players = [Player(player_id, size, fences) for player_id in self._player_ids]
+        self._which_turn = 1
+        self._zobrist_pawn_keys, self._zobrist_fence_keys, self._zobrist_fence_amount_keys, self._zobrist_turn_keys = \
+            _zobrist_table(size, players, fences)
+        self._game_board = {(0, 0): ['v_fence', 'h_fence']}
+        # initialize the fences on the four sides
+        for index in range(1, size):
+            self._game_board[(index, 0)] = [0, 'h_fence']  # horizontal line
+            self._game_board[(0, index)] = ['v_fence', 0]  # vertical line
+        for index in range(0, size):
+            self._game_board[(size, index)] = ['v_fence', 0]  # vertical line
+            self._game_board[(index, size)] = [0, 'h_fence']  # horizontal line
+        if size not in self._SIDE_FENCE_GRAPHS:
+            side_fence_graph = FenceVertexGraph(size)
+            for fence_address, fence_list in self._game_board.items():
+                if fence_list[0] == 'v_fence':
+                    side_fence_graph.add_fence('v', fence_address)
+                if fence_list[1] == 'h_fence':
+                    side_fence_graph.add_fence('h', fence_address)
+            self._SIDE_FENCE_GRAPHS[size] = side_fence_graph
+        self._fence_vertices = self._SIDE_FENCE_GRAPHS[size].copy()
+        self._distance_maps = {player.get_player_id(): GoalDistanceMap(player.get_goal(), size)
+                               for player in self._players}
+        self._move_stack = []
+        self._zobrist_hash = self._compute_zobrist_hash()
+
+    def get_state(self):
+        """
+        Returns the current position as a compact tuple of plain values which can be pickled cheaply and sent to
+        another process: the turn, a (position, fences left, is winner) tuple for each player and a tuple of the
+        fences placed on the board so far as (v or h, position tuple) tuples. The fences on the four sides are not
+        included.
+        """
+        player_states = tuple((player.get_player_position(), player.get_fence_amount(), player.get_is_winner())
+                              for player in self._players)
+        side_line = (0, self._board_size)
+        fence_list = []
+        for fence_address, fence_list_of_cell in self._game_board.items():
+            if fence_list_of_cell[0] == 'v_fence' and fence_address[0] not in side_line:
+                fence_list.append(('v', fence_address))
+            if fence_list_of_cell[1] == 'h_fence' and fence_address[1] not in side_line:
+                fence_list.append(('h', fence_address))
+        return self._which_turn, player_states, tuple(sorted(fence_list))
+
+    @classmethod
+    def from_state(cls, state, size=9, fences=None):
+        """
+        Takes a tuple returned by get_state, and the board size and starting amount of fences of the game it was
+        taken from if they are not the default ones, and returns a new QuoridorGame in that position. The amount of
+        players is the amount of player tuples in the state.
+        """
+        which_turn, player_states, fence_list = state
+        game = cls(size, fences, len(player_states))
+        for player, (position, fence_amount, is_winner) in zip(game._players, player_states):
+            player.set_player_position(position)
+            player.set_fence_amount(fence_amount)
+            if is_winner:
+                player.set_is_winner()
+        for v_or_h, fence_address in fence_list:
+            game._put_fence(v_or_h, fence_address)
+        game._which_turn = which_turn
+        game._zobrist_hash = game._compute_zobrist_hash()
+        return game
+
+    def get_board_size(self):
+        """
+        Returns the amount of cells on each side of the board.
+        """
+        return self._board_size
+
+    def get_starting_fence_amount(self):
+        """
+        Returns the amount of fences each player started the game with.
+        """
+        return self._starting_fence_amount
+
+    def get_player_amount(self):
+        """
+        Returns the amount of players.
+        """
+        return len(self._players)
+
+    def get_move_amount(self):
+        """
+        Returns the amount of different move indexes returned by move_index: three times the amount of cells.
+        """
+        return 3 * self._board_size * self._board_size
+
+    def get_zobrist_hash(self):
+        """
+        Returns the 64-bit Zobrist hash of the current position: every pawn, every fence on the board, the amount of
+        fences left for each player and whose turn it is. It is kept up to date by every move, so reading it is free.
+        """
+        return self._zobrist_hash
+
+    def get_zobrist_keys(self):
+        """
+        Returns the Zobrist keys the hash of this game is made of, as a tuple of four dicts: pawn keys keyed by (player
+        id, position), fence keys keyed by (v or h, position), fence amount keys keyed by (player id, amount) and turn
+        keys keyed by player id. The hash of a position is the XOR of the keys of its pawns, fences on the board,
+        fences left and turn. The dicts are shared by every game of the same configuration and must not be changed.
+        """
+        return (self._zobrist_pawn_keys, self._zobrist_fence_keys, self._zobrist_fence_amount_keys,
+                self._zobrist_turn_keys)
+
+    def _compute_zobrist_hash(self):
+        """
+        A private method which computes the Zobrist hash of the current position from scratch.
+        """
+        zobrist_hash = self._zobrist_turn_keys[self._which_turn]
+        for player in self._players:
+            zobrist_hash ^= self._zobrist_pawn_keys[(player.get_player_id(), player.get_player_position())]
+            zobrist_hash ^= self._zobrist_fence_amount_keys[(player.get_player_id(), player.get_fence_amount())]
+        for fence_address, fence_list in self._game_board.items():
+            if fence_list[0] == 'v_fence':
+                zobrist_hash ^= self._zobrist_fence_keys[('v', fence_address)]
+            if fence_list[1] == 'h_fence':
+                zobrist_hash ^= self._zobrist_fence_keys[('h', fence_address)]
+        return zobrist_hash
+
+    def move_index(self, move):
+        """
+        Takes a move tuple as returned by legal_moves and returns a small integer for it: 0 to 80 for the pawn moves,
+        81 to 161 for the horizontal fences and 162 to 242 for the vertical fences, each one ordered by row and then
+        by column. On other board sizes there are size * size indexes for each of the three kinds of moves.
+        """
+        v_or_h_or_p, address_tuple = move
+        board_size = self._board_size
+        return (('p', 'h', 'v').index(v_or_h_or_p) * board_size * board_size + address_tuple[1] * board_size +
+                address_tuple[0])
+
+    def index_move(self, move_index):
+        """
+        Takes an integer returned by move_index and returns the move tuple it represents.
+        """
+        board_size = self._board_size
+        cell_amount = board_size * board_size
+        v_or_h_or_p = ('p', 'h', 'v')[move_index // cell_amount]
+        return v_or_h_or_p, (move_index % board_size, move_index % cell_amount // board_size)
+
+    def _search_player(self, player_id):
+        """
+        A private method which takes player_id as a parameter and returns the related player object.
+        """
+        if player_id in self._player_ids:
+            return self._players[player_id - 1]
+        return self._players[-1]
+
+    def move_pawn(self, player_id, pawn_aiming_address):
+        """
+        Takes following two parameters in order: an integer that represents which player (1 to 4) is making the
+        move and a tuple with the coordinates of where the pawn is going to be moved to.
+        Returns False if the move is forbidden by the rule or blocked by the fence or if the game has been already won.
+        Returns True if the move was successful or if the move makes the player win.
+        """
+        if self._which_turn != player_id or self._if_winner_exist() is True:
+            return False
+        if not self._if_address_on_board(pawn_aiming_address):
+            return False
+        moving_type = self._moving_type_return(player_id, pawn_aiming_address)
+        if moving_type == "horizontally or vertically one cell type":
+            return self._implement_h_v_one_cell_moving_type(player_id, pawn_aiming_address)
+        if moving_type == "jump moving two cells type":
+            return self._implement_jump_moving_two_cells_moving_type(player_id, pawn_aiming_address)
+        if moving_type == "diagonally move one cell type":
+            return self._implement_diagonally_move_one_cell_moving_type(player_id, pawn_aiming_address)
+        return False
+
+    def legal_pawn_moves(self, player_id):
+        """
+        Takes an integer that represents which player (1 or 2) is asking and returns a list of every coordinate tuple
+        the pawn of that player can be moved to with move_pawn right now: the horizontal or vertical one cell moves,
+        the jumps over another pawn and the diagonal moves.
+        Returns an empty list if it's not this player's turn or if the game has been already won.
+        """
+        if self._which_turn != player_id or self._if_winner_exist() is True:
+            return []
+        legal_list = []
+        for pawn_aiming_address in self._h_v_possible_aiming_address(player_id):
+            if self._if_address_on_board(pawn_aiming_address):
+                if self._if_h_v_one_cell_move_allowed(player_id, pawn_aiming_address):
+                    legal_list.append(pawn_aiming_address)
+        for pawn_aiming_address in self._jump_moving_two_cells_aiming_address(player_id):
+            if self._if_address_on_board(pawn_aiming_address):
+                if self._if_jump_moving_two_cells_allowed(player_id, pawn_aiming_address):
+                    legal_list.append(pawn_aiming_address)
+        for pawn_aiming_address in self._diagonally_move_one_cell_aiming_address(player_id):
+            if self._if_address_on_board(pawn_aiming_address):
+                if self._if_diagonally_move_one_cell_allowed(player_id, pawn_aiming_address):
+                    legal_list.append(pawn_aiming_address)
+        return legal_list
+
+    def legal_fences(self, player_id):
+        """
+        Takes an integer that represents which player (1 or 2) is asking and returns a list of every fence the player
+        can place with place_fence right now, each one as a tuple of the letter (v or h) and the position tuple.
+        Fences which would break the fair play rule are not included.
+        Returns an empty list if it's not this player's turn, if the player has no fence left or if the game has been
+        already won.
+        """
+        if self._which_turn != player_id or self._if_winner_exist() is True:
+            return []
+        if self._search_player(player_id).get_fence_amount() <= 0:
+            return []
+        legal_mask = self._fence_masks(player_id, False)[0]
+        board_size = self._board_size
+        legal_list = []
+        for v_or_h, kind in (('v', 2), ('h', 1)):
+            for co_y in range(0, board_size):
+                for co_x in range(0, board_size):
+                    if legal_mask[(kind * board_size + co_y) * board_size + co_x]:
+                        legal_list.append((v_or_h, (co_x, co_y)))
+        return legal_list
+
+    def legal_fence_mask(self, player_id):
+        """
+        Takes an integer that represents which player is asking and returns a tuple of two lists of booleans in
+        move_index order (243 of them on the 9x9 board), where only the fence entries can be True:
+        the first tells which fences the player can place with place_fence right now (it is all False when it's not
+        this player's turn, the player has no fence left or the game has been already won), the second tells which
+        free fence slots would leave one of the pawns with no way to its goal line at all.
+        Every slot is answered from one analysis of the board instead of one check per slot: the fair-play rule is
+        looked up in the fence vertex components found once for the position, and the slots which would cut a pawn
+        off are the bridges found by one depth-first search per pawn. In the four-player game the fair-play rule is
+        that no pawn may be cut off, so the legal fences are the free slots which cut nobody off.
+        """
+        return self._fence_masks(player_id, True)
+
+    def _fence_masks(self, player_id, find_cut_off):
+        """
+        A private method which takes player_id and whether to look for the slots which would cut a pawn off, and
+        returns the two lists of legal_fence_mask. The second list is left all False if find_cut_off is False.
+        """
+        board_size = self._board_size
+        legal_mask = [False] * self.get_move_amount()
+        cut_off_mask = [False] * self.get_move_amount()
+        cut_fence_set = set()
+        all_cut_off = False
+        two_players = len(self._players) == 2
+        for curr_player in self._players if find_cut_off or not two_players else ():
+            curr_cut_set = self._distance_maps[curr_player.get_player_id()].cut_fences_from(
+                curr_player.get_player_position())
+            if curr_cut_set is None:
+                all_cut_off = True
+            else:
+                cut_fence_set |= curr_cut_set
+        can_place = (self._which_turn == player_id and self._if_winner_exist() is False and
+                     self._search_player(player_id).get_fence_amount() > 0)
+        already_closed = False
+        if can_place and two_players:
+            # the fair-play rule is checked for the opponent of the player, see _if_no_room_left_for_this_player
+            oppo_player = 2 if player_id == 1 else 1
+            oppo_pos = self._search_player(oppo_player).get_player_position()
+            if oppo_player == 1:
+                closed_side = FenceVertexGraph.RIGHT_SIDE
+                front_y_range = range(oppo_pos[1] + 1, board_size)
+            else:
+                closed_side = FenceVertexGraph.LEFT_SIDE
+                front_y_range = range(1, oppo_pos[1] + 1)
+            front_root_set = set()
+            for fence_address in self._all_the_fences_address_face_to_current_player(oppo_player):
+                front_root_set.add(self._fence_vertices.root_of(fence_address))
+                if self._fence_vertices.side_of(fence_address) & closed_side:
+                    already_closed = True
+        for v_or_h, kind in (('h', 1), ('v', 2)):
+            for co_y in range(0, board_size):
+                for co_x in range(0, board_size):
+                    fence_address = (co_x, co_y)
+                    if self._if_fence_exist(fence_address, v_or_h) is True:
+                        continue
+                    index = (kind * board_size + co_y) * board_size + co_x
+                    cut_off_mask[index] = all_cut_off or (v_or_h, fence_address) in cut_fence_set
+                    if not can_place or already_closed:
+                        continue
+                    if not two_players:
+                        legal_mask[index] = (v_or_h, fence_address) not in cut_fence_set
+                        continue
+                    new_fence_roots, new_fence_side = self._fence_vertices.side_with_fence(v_or_h, fence_address)
+                    if new_fence_side & closed_side:
+                        if v_or_h == 'h' and co_x == oppo_pos[0] and co_y in front_y_range:
+                            continue
+                        if any(root in front_root_set for root in new_fence_roots):
+                            continue
+                    legal_mask[index] = True
+        return legal_mask, cut_off_mask
+
+    def legal_moves(self, player_id):
+        """
+        Takes an integer that represents which player (1 to 4) is asking and returns a list of every legal move of
+        that player. A pawn move is the tuple ('p', position tuple) and a fence is the tuple (v or h, position tuple).
+        """
+        legal_list = [('p', pawn_aiming_address) for pawn_aiming_address in self.legal_pawn_moves(player_id)]
+        legal_list.extend(self.legal_fences(player_id))
+        return legal_list
+
+    def _if_address_on_board(self, address_tuple):
+        """
+        A private method which takes an address tuple and returns whether it is a cell on the board.
+        """
+        return address_tuple[0] in range(0, self._board_size) and address_tuple[1] in range(0, self._board_size)
+
+    def push_move(self, player_id, move):
+        """
+        Takes an integer that represents which player (1 or 2) is making the move and a move tuple as returned by
+        legal_moves: ('p', position tuple) for a pawn move or (v or h, position tuple) for a fence.
+        Makes the move with move_pawn or place_fence and returns what that call returns. If the move was made, the
+        information needed to take it back (previous position or fence cell, turn, winner flag and Zobrist hash) is
+        kept on the move stack for pop_move.
+        """
+        v_or_h_or_p, address_tuple = move
+        if v_or_h_or_p not in ('p', 'v', 'h'):
+            return False
+        curr_player = self._search_player(player_id)
+        prev_turn = self._which_turn
+        prev_is_winner = curr_player.get_is_winner()
+        prev_zobrist_hash = self._zobrist_hash
+        if v_or_h_or_p == 'p':
+            prev_info = curr_player.get_player_position()
+            result = self.move_pawn(player_id, address_tuple)
+        else:
+            prev_info = self._game_board.get(address_tuple)
+            if prev_info is not None:
+                prev_info = list(prev_info)
+            result = self.place_fence(player_id, v_or_h_or_p, address_tuple)
+        if result is True:
+            self._move_stack.append((player_id, move, prev_info, prev_turn, prev_is_winner, prev_zobrist_hash))
+        return result
+
+    def pop_move(self):
+        """
+        Takes back the last move made with push_move and restores the board exactly as it was before it.
+        Returns a tuple of the player id and the move tuple taken back, or False if there's no move to take back.
+        """
+        if not self._move_stack:
+            return False
+        player_id, move, prev_info, prev_turn, prev_is_winner, prev_zobrist_hash = self._move_stack.pop()
+        curr_player = self._search_player(player_id)
+        if move[0] == 'p':
+            curr_player.set_player_position(prev_info)
+        else:
+            if prev_info is None:
+                del self._game_board[move[1]]
+            else:
+                self._game_board[move[1]] = prev_info
+            self._fence_vertices.remove_last_fence()
+            for distance_map in self._distance_maps.values():
+                distance_map.remove_last_fence()
+            curr_player.add_fence_amount()
+        if prev_is_winner is False:
+            curr_player.clear_is_winner()
+        self._which_turn = prev_turn
+        self._zobrist_hash = prev_zobrist_hash
+        return player_id, move
+
+    def _h_v_possible_aiming_address(self, player_id):
+        """
+        A private method which takes player_id as a parameter and returns the possible position if the player decides
+        to move only vertically or horizontally.
+        """
+        curr_pos = self._search_player(player_id).get_player_position()
+        curr_pos_x = curr_pos[0]
+        curr_pos_y = curr_pos[1]
+        pos_u = (curr_pos_x, curr_pos_y - 1)
+        pos_r = (curr_pos_x + 1, curr_pos_y)
+        pos_d = (curr_pos_x, curr_pos_y + 1)
+        pos_l = (curr_pos_x - 1, curr_pos_y)
+        return pos_u, pos_r, pos_d, pos_l
+
+    def _jump_moving_two_cells_aiming_address(self, player_id):
+        """
+        A private method which takes player_id as a parameter and returns the possible position if the player decides
+        to move in the jumping over pawn way.
+        """
+        curr_pos = self._search_player(player_id).get_player_position()
+        curr_pos_x = curr_pos[0]
+        curr_pos_y = curr_pos[1]
+        pos_u = (curr_pos_x, curr_pos_y - 2)
+        pos_r = (curr_pos_x + 2, curr_pos_y)
+        pos_d = (curr_pos_x, curr_pos_y + 2)
+        pos_l = (curr_pos_x - 2, curr_pos_y)
+        return pos_u, pos_r, pos_d, pos_l
+
+    def _diagonally_move_one_cell_aiming_address(self, player_id):
+        """
+        A private method which takes player_id as a parameter and returns the possible position if the player decides
+        to move diagonally.
+        """
+        curr_pos = self._search_player(player_id).get_player_position()
+        curr_pos_x = curr_pos[0]
+        curr_pos_y = curr_pos[1]
+        pos_ur = (curr_pos_x + 1, curr_pos_y - 1)
+        pos_rd = (curr_pos_x + 1, curr_pos_y + 1)
+        pos_dl = (curr_pos_x - 1, curr_pos_y + 1)
+        pos_lu = (curr_pos_x - 1, curr_pos_y - 1)
+        return pos_ur, pos_rd, pos_dl, pos_lu
+
+    def _moving_type_return(self, player_id, pawn_aiming_address):
+        """
+        A private method which takes player_id and its aiming address tuple and returns what kind of moving type this
+        player behaves.
+        It contains three moving types: "horizontally or vertically one cell type", "jump moving two cells type", and
+        "diagonally move one cell type". If there is no moving type match, returns "no moving type match".
+        """
+        if pawn_aiming_address in self._h_v_possible_aiming_address(player_id):
+            return "horizontally or vertically one cell type"
+        if pawn_aiming_address in self._jump_moving_two_cells_aiming_address(player_id):
+            return "jump moving two cells type"
+        if pawn_aiming_address in self._diagonally_move_one_cell_aiming_address(player_id):
+            return "diagonally move one cell type"
+        return "no moving type match"
+
+    def _which_direction(self, player_id, pawn_aiming_address):
+        """
+        A private method which takes player_id and its aiming address tuple and returns what kind of moving direction
+        this player behaves. It contains eight kinds of moving directions: 'u', 'r', 'd', 'l', ('u', 'r'), ('r', 'd'),
+        ('d', 'l'), ('l', 'u')
+        """
+        curr_pos = self._search_player(player_id).get_player_position()
+        if pawn_aiming_address[1] < curr_pos[1] and pawn_aiming_address[0] == curr_pos[0]:
+            return 'u'
+        if pawn_aiming_address[0] > curr_pos[0] and pawn_aiming_address[1] == curr_pos[1]:
+            return 'r'
+        if pawn_aiming_address[1] > curr_pos[1] and pawn_aiming_address[0] == curr_pos[0]:
+            return 'd'
+        if pawn_aiming_address[0] < curr_pos[0] and pawn_aiming_address[1] == curr_pos[1]:
+            return 'l'
+        if pawn_aiming_address[0] > curr_pos[0] and pawn_aiming_address[1] < curr_pos[1]:
+            return 'u', 'r'
+        if pawn_aiming_address[0] > curr_pos[0] and pawn_aiming_address[1] > curr_pos[1]:
+            return 'r', 'd'
+        if pawn_aiming_address[0] < curr_pos[0] and pawn_aiming_address[1] > curr_pos[1]:
+            return 'd', 'l'
+        if pawn_aiming_address[0] < curr_pos[0] and pawn_aiming_address[1] < curr_pos[1]:
+            return 'l', 'u'
+
+    def _winner_trigger(self, player_id):
+        """
+        A private method which takes player_id returns whether this player satisfies the winner condition.
+        """
+        curr_player = self._search_player(player_id)
+        return curr_player.if_on_goal_line(curr_player.get_player_position())
+
+    def _implement_h_v_one_cell_moving_type(self, player_id, pawn_aiming_address):
+        """
+        A private method which takes player_id and its aiming address tuple and implement the returns the
+        "horizontally or vertically one cell type" move.
+        Returns False if the move is forbidden by the rule or blocked by the fence or if the game has been already won.
+        Returns True if the move was successful or if the move makes the player win.
+        """
+        if not self._if_h_v_one_cell_move_allowed(player_id, pawn_aiming_address):
+            return False
+        self._move_player_pawn(player_id, pawn_aiming_address)
+        return True
+
+    def _if_h_v_one_cell_move_allowed(self, player_id, pawn_aiming_address):
+        """
+        A private method which takes player_id and its aiming address tuple and returns whether the
+        "horizontally or vertically one cell type" move is allowed, without moving the pawn.
+        """
+        curr_pos = self._search_player(player_id).get_player_position()
+        direction = self._which_direction(player_id, pawn_aiming_address)
+        if self._if_pawn_on(pawn_aiming_address):
+            return False
+        if direction == 'u':
+            if self._if_fence_exist(curr_pos, 'h'):
+                return False
+        if direction == 'r':
+            if self._if_fence_exist(pawn_aiming_address, 'v'):
+                return False
+        if direction == 'd':
+            if self._if_fence_exist(pawn_aiming_address, 'h'):
+                return False
+        if direction == 'l':
+            if self._if_fence_exist(curr_pos, 'v'):
+                return False
+        return True
+
+    def _move_player_pawn(self, player_id, pawn_aiming_address):
+        """
+        A private method which takes player_id and an aiming address tuple the pawn is allowed to move to, moves the
+        pawn there, passes the turn and updates the winner.
+        """
+        curr_player = self._search_player(player_id)
+        self._zobrist_hash ^= self._zobrist_pawn_keys[(player_id, curr_player.get_player_position())]
+        self._zobrist_hash ^= self._zobrist_pawn_keys[(player_id, pawn_aiming_address)]
+        curr_player.set_player_position(pawn_aiming_address)
+        self._update_player_track()
+        if self._winner_trigger(player_id) is True:
+            curr_player.set_is_winner()
+
+    def _other_players(self, player_id):
+        """
+        A private method which takes player_id and returns a list of the player objects of every other player. In the
+        two-player game it is only the opposite player.
+        """
+        return [player for player in self._players if player.get_player_id() != player_id]
+
+    def _if_pawn_on(self, address_tuple):
+        """
+        A private method which takes a cell position and returns whether a pawn stands on it.
+        """
+        for player in self._players:
+            if player.get_player_position() == address_tuple:
+                return True
+        return False
+
+    def _one_cell_pos(self, direction, curr_pos):
+        """
+        A private method which takes a direction and a position and returns the coordinate tuple next to the said
+        position (in the given direction).
+        """
+        pos_x = curr_pos[0]
+        pos_y = curr_pos[1]
+        if direction == 'u':
+            return pos_x, pos_y - 1
+        if direction == ('u', 'r'):
+            return pos_x + 1, pos_y - 1
+        if direction == 'r':
+            return pos_x + 1, pos_y
+        if direction == ('r', 'd'):
+            return pos_x + 1, pos_y + 1
+        if direction == 'd':
+            return pos_x, pos_y + 1
+        if direction == ('d', 'l'):
+            return pos_x - 1, pos_y + 1
+        if direction == 'l':
+            return pos_x - 1, pos_y
+        if direction == ('l', 'u'):
+            return pos_x - 1, pos_y - 1
+
+    def _implement_jump_moving_two_cells_moving_type(self, player_id, aim_address):
+        """
+        A private method which takes player_id and its aiming address tuple and implement the returns the
+        "jump moving two cells type" move.
+        Returns False if the move is forbidden by the rule or blocked by the fence or if the game has been already won.
+        Returns True if the move was successful or if the move makes the player win.
+        """
+        if not self._if_jump_moving_two_cells_allowed(player_id, aim_address):
+            return False
+        self._move_player_pawn(player_id, aim_address)
+        return True
+
+    def _if_jump_moving_two_cells_allowed(self, player_id, aim_address):
+        """
+        A private method which takes player_id and its aiming address tuple and returns whether the
+        "jump moving two cells type" move is allowed, without moving the pawn.
+        """
+        curr_pos = self._search_player(player_id).get_player_position()
+        direction = self._which_direction(player_id, aim_address)
+        if direction == 'u':
+            if self._if_fence_exist(curr_pos, 'h') or self._if_fence_exist(self._one_cell_pos('u', curr_pos), 'h'):
+                return False
+        if direction == 'r':
+            if self._if_fence_exist(self._one_cell_pos('r', curr_pos), 'v') or self._if_fence_exist(aim_address, 'v'):
+                return False
+        if direction == 'd':
+            if self._if_fence_exist(self._one_cell_pos('d', curr_pos), 'h') or self._if_fence_exist(aim_address, 'h'):
+                return False
+        if direction == 'l':
+            if self._if_fence_exist(curr_pos, 'v') or self._if_fence_exist(self._one_cell_pos('l', curr_pos), 'v'):
+                return False
+        if self._if_pawn_on(aim_address):
+            return False
+        return self._if_pawn_on(self._one_cell_pos(direction, curr_pos))
+
+    def _implement_diagonally_move_one_cell_moving_type(self, player_id, pawn_aiming_address):
+        """
+        A private method which takes player_id and its aiming address tuple and implement the returns the
+        "diagonally move one cell type" move.
+        Returns False if the move is forbidden by the rule or blocked by the fence or if the game has been already won.
+        Returns True if the move was successful or if the move makes the player win.
+        """
+        if not self._if_diagonally_move_one_cell_allowed(player_id, pawn_aiming_address):
+            return False
+        self._move_player_pawn(player_id, pawn_aiming_address)
+        return True
+
+    def _if_diagonally_move_one_cell_allowed(self, player_id, pawn_aiming_address):
+        """
+        A private method which takes player_id and its aiming address tuple and returns whether the
+        "diagonally move one cell type" move is allowed, without moving the pawn.
+        """
+        curr_pos = self._search_player(player_id).get_player_position()
+        direction = self._which_direction(player_id, pawn_aiming_address)
+        if self._if_pawn_on(pawn_aiming_address):
+            return False
+        for oppo_player in self._other_players(player_id):
+            oppo_pos = oppo_player.get_player_position()
+            condition_1 = self._one_cell_pos(direction[0], curr_pos) == oppo_pos
+            condition_2 = self._one_cell_pos(direction[1], curr_pos) == oppo_pos
+            if (condition_1 or condition_2) is not True:
+                continue
+            if self._if_diagonal_blocked_behind(player_id, pawn_aiming_address, oppo_pos):
+                return True
+        return False
+
+    def _if_diagonal_blocked_behind(self, player_id, pawn_aiming_address, oppo_pos):
+        """
+        A private method which takes player_id, its diagonal aiming address tuple and the position of a pawn next to
+        it, and returns whether the fence that allows moving diagonally around that pawn is there.
+        """
+        oppo_direction = self._which_direction(player_id, oppo_pos)
+        if oppo_direction == 'u':
+            if not self._if_fence_exist(oppo_pos, 'h'):
+                return False
+        if oppo_direction == 'r':
+            if not self._if_fence_exist(pawn_aiming_address, 'v'):
+                return False
+        if oppo_direction == 'd':
+            if not self._if_fence_exist(pawn_aiming_address, 'h'):
+                return False
+        if oppo_direction == 'l':
+            if not self._if_fence_exist(oppo_pos, 'v'):
+                return False
+        return True
+
+    def _if_fence_exist(self, address_tuple, v_or_h):
+        """
+        A private method which takes a certain address and "vertical" or "horizontal" fence and returns whether there
+        is a "vertical" or "horizontal" fence exists in that place.
+        """
+        if address_tuple in self._game_board:
+            if v_or_h == 'v':
+                if self._game_board[address_tuple][0] == 'v_fence':
+                    return True
+            elif v_or_h == 'h':
+                if self._game_board[address_tuple][1] == 'h_fence':
+                    return True
+        return False
+
+    def _if_winner_exist(self):
+        """
+        A private method which returns whether there's a winner exist in current game.
+        """
+        for player in self._players:
+            if player.get_is_winner() is True:
+                return True
+        return False
+
+    def _update_player_track(self):
+        """
+        A private method which updates the track to the next player.
+        """
+        self._zobrist_hash ^= self._zobrist_turn_keys[self._which_turn]
+        if self._which_turn >= len(self._players):
+            self._which_turn = 1
+        else:
+            self._which_turn += 1
+        self._zobrist_hash ^= self._zobrist_turn_keys[self._which_turn]
+
+    def place_fence(self, player_id, v_or_h, fence_aiming_address):
+        """
+        Takes following parameters in order: an integer that represents which player (1 or 2) is making the move,
+        a letter indicating whether it is vertical (v) or horizontal (h) fence, a tuple of integers that represents
+        the position on which the fence is to be placed.
+        Returns False if player has no fence left, or if the fence is out of the boundaries of the board,
+        or if there is already a fence there and the new fence will overlap or intersect with the existing fence.
+        Returns False if the game has been already won.
+        Returns True if the fence can be placed.
+        Returns exactly the string "breaks the fair play rule" if it breaks the fair-play rule.
+        """
+        curr_player = self._search_player(player_id)
+        if self._which_turn != player_id:
+            return False
+        if curr_player.get_fence_amount() <= 0 or self._if_winner_exist() is True:
+            return False
+        if not self._if_address_on_board(fence_aiming_address):
+            return False
+        if self._if_fence_exist(fence_aiming_address, v_or_h) is True:
+            return False
+        if self._if_break_fair_play_rule(player_id, v_or_h, fence_aiming_address):
+            return 'breaks the fair play rule'
+        self._update_player_track()
+        self._zobrist_hash ^= self._zobrist_fence_amount_keys[(player_id, curr_player.get_fence_amount())]
+        curr_player.deduct_fence_amount()
+        self._zobrist_hash ^= self._zobrist_fence_amount_keys[(player_id, curr_player.get_fence_amount())]
+        self._put_fence(v_or_h, fence_aiming_address)
+        return True
+
+    def _put_fence(self, v_or_h, fence_aiming_address):
+        """
+        A private method which takes a letter (v or h) and a fence address and puts the fence on the board, in the
+        fence vertex components and in the Zobrist hash, without checking any rule.
+        """
+        if fence_aiming_address not in self._game_board:
+            if v_or_h == 'v':
+                self._game_board[fence_aiming_address] = ['v_fence', 0]
+            elif v_or_h == 'h':
+                self._game_board[fence_aiming_address] = [0, 'h_fence']
+        else:
+            if v_or_h == 'v':
+                self._game_board[fence_aiming_address][0] = 'v_fence'
+            elif v_or_h == 'h':
+                self._game_board[fence_aiming_address][1] = 'h_fence'
+        if v_or_h in ('v', 'h'):
+            self._fence_vertices.add_fence(v_or_h, fence_aiming_address)
+            for distance_map in self._distance_maps.values():
+                distance_map.add_fence(v_or_h, fence_aiming_address)
+            self._zobrist_hash ^= self._zobrist_fence_keys[(v_or_h, fence_aiming_address)]
+
+    def is_winner(self, player_id):
+        """
+        Takes a single integer representing the player number as a parameter and returns True if that player has won
+        and False if that player has not won.
+        """
+        if self._search_player(player_id).get_is_winner() is True:
+            return True
+        else:
+            return False
+
+    def get_which_turn(self):
+        """
+        Returns the integer of the player (1 to 4) whose turn it is.
+        """
+        return self._which_turn
+
+    def get_player_position(self, player_id):
+        """
+        Takes player_id and returns the position tuple of that player's pawn.
+        """
+        return self._search_player(player_id).get_player_position()
+
+    def get_fence_amount(self, player_id):
+        """
+        Takes player_id and returns the left amount of fences for that player to use.
+        """
+        return self._search_player(player_id).get_fence_amount()
+
+    def distance_to_goal(self, player_id):
+        """
+        Takes player_id and returns the least amount of one cell moves the pawn of that player needs to reach its goal
+        line, going around the fences and ignoring the other pawn. Returns None if the goal line can't be reached.
+        It is looked up in the distance map of the player, repaired for the fences placed since the last look up.
+        """
+        return self._distance_maps[player_id].distance_of(self._search_player(player_id).get_player_position())
+
+    def shortest_path(self, player_id):
+        """
+        Takes player_id and returns a list of the cells of a shortest path of the pawn of that player to its goal
+        line, from the cell of the pawn to a cell of the goal line, going around the fences and ignoring the other
+        pawn. Returns None if the goal line can't be reached.
+        """
+        return self._distance_maps[player_id].path_from(self._search_player(player_id).get_player_position())
+
+    def print_board(self):
+        """
+        Prints the board
+        """
+        print('\n'.join(board_lines(self.get_state(), self._board_size)))
+
+    def _if_break_fair_play_rule(self, player_id, v_or_h, fence_aiming_address):
+        """
+        Takes following parameters in order: an integer that represents which player (1 or 2) is making the move,
+        a letter indicating whether it is vertical (v) or horizontal (h) fence, a tuple of integers that represents
+        the position on which the fence is to be placed.
+        Returns if this action will result in 'breaks the fair play rule'.
+        The fence is not placed on the board for the check, it is only looked up in the fence vertex components.
+        """
+        if v_or_h not in ('v', 'h'):
+            return False
+        if len(self._players) != 2:
+            return self._if_cut_any_player_off(v_or_h, fence_aiming_address)
+        oppo_player = 2 if player_id == 1 else 1
+        return self._if_no_room_left_for_this_player(oppo_player, (v_or_h, fence_aiming_address))
+
+    def _if_cut_any_player_off(self, v_or_h, fence_aiming_address):
+        """
+        A private method which takes a letter (v or h) and a fence address and returns whether placing that fence
+        would leave a pawn with no way to its goal line, the fair-play rule of the four-player game.
+        A fence which doesn't cut a shortest path of a pawn can't cut that pawn off, so the bridges are only looked
+        for when it does.
+        """
+        fence = (v_or_h, fence_aiming_address)
+        for player in self._players:
+            distance_map = self._distance_maps[player.get_player_id()]
+            path = distance_map.path_from(player.get_player_position())
+            if path is None:
+                continue
+            for index in range(0, len(path) - 1):
+                if distance_map.fence_between_cells(path[index], path[index + 1]) == fence:
+                    if fence in distance_map.cut_fences_from(player.get_player_position()):
+                        return True
+                    break
+        return False
+
+    def _remain_invisible_fences_face_to_current_player(self, player_id):
+        """
+        A private method which takes player_id and returns a list which contains all the horizontal lines in front of
+        the current player.
+        """
+        remain_list = []
+        curr_pos = self._search_player(player_id).get_player_position()
+        pos_x = curr_pos[0]
+        pos_y = curr_pos[1]
+        if player_id == 1:
+            for remain_y in range(pos_y + 1, self._board_size):
+                remain_list.append((pos_x, remain_y))
+        if player_id == 2:
+            for remain_y in range(pos_y, 0, -1):
+                remain_list.append((pos_x, remain_y))
+        return remain_list
+
+    def _all_the_fences_address_face_to_current_player(self, player_id):
+        """
+        A private method which takes player_id and returns a list which contains all the fences address right in front
+        of the current player.
+        """
+        fences_address_list = []
+        for fence_address in self._remain_invisible_fences_face_to_current_player(player_id):
+            if self._if_fence_exist(fence_address, 'h') is True:
+                fences_address_list.append(fence_address)
+        return fences_address_list
+
+    def _if_no_room_left_for_this_player(self, player_id, new_fence=None):
+        """
+        A private method which takes player_id and returns if the access to the goal line of current player is
+        left open. It optionally takes a tuple of a letter (v or h) and a fence address, and then answers as if that
+        fence was placed.
+        The fences right in front of the player are looked up in the fence vertex components: the access is closed
+        when one of them is connected to the right side (player 1) or to the left side (player 2) of the board.
+        """
+        remain_fence = self._all_the_fences_address_face_to_current_player(player_id)
+        if new_fence is not None and new_fence[0] == 'h':
+            curr_pos = self._search_player(player_id).get_player_position()
+            if new_fence[1][0] == curr_pos[0] and new_fence[1] not in remain_fence:
+                if new_fence[1][1] > curr_pos[1] if player_id == 1 else new_fence[1][1] <= curr_pos[1]:
+                    remain_fence.append(new_fence[1])
+        if not remain_fence:
+            return False
+        new_fence_roots = ()
+        new_fence_side = 0
+        if new_fence is not None:
+            new_fence_roots, new_fence_side = self._fence_vertices.side_with_fence(new_fence[0], new_fence[1])
+        if player_id == 1:
+            closed_side = FenceVertexGraph.RIGHT_SIDE
+        else:
+            closed_side = FenceVertexGraph.LEFT_SIDE
+        for fence_address in remain_fence:
+            if self._fence_vertices.side_of(fence_address, new_fence_roots, new_fence_side) & closed_side:
+                return True
+        return False
@@ -0,0 +1,312 @@
+# Description: Opt-in counters and timers for the hot paths of QuoridorGame, to find which rule check eats the time on
+#              a pathological board without running a profiler over a whole worker pool. Nothing in QuoridorGame knows
+#              about it: Instrumentation.attach puts counting wrappers on one game object as instance attributes, and
+#              detach deletes them again, so a game which is not attached runs the plain class methods and pays
+#              nothing. It counts and times move_pawn, place_fence, _if_break_fair_play_rule and _if_fence_exist, and
+#              it counts the vertex walk of the fair-play rule: the root lookups of the fence vertex components (hops
+#              to the root of each lookup and vertices visited by each fair-play check).
+#              The data is kept per game and summed over games, with power-of-two histograms, and get_snapshot
+#              returns it as a dict of plain values which can be dumped to JSON. Snapshots taken in worker processes
+#              can be added up with merge_snapshots.
+#                  instrumentation = Instrumentation()
+#                  instrumentation.attach(game)
+#                  ... play ...
+#                  instrumentation.detach(game)
+#                  print(json.dumps(instrumentation.get_snapshot()))
+
+import time
+from collections import deque
+
+# the timed methods of QuoridorGame
+TIMED_METHODS = ('move_pawn', 'place_fence', '_if_break_fair_play_rule', '_if_fence_exist')
+VERTEX_WALK = 'vertex_walk'
+
+
+class Histogram:
+    """
+    Represents a histogram of non-negative integers in power-of-two buckets: bucket 0 holds 0, and bucket k holds the
+    values from 2 ** (k - 1) to 2 ** k - 1.
+    """
+
+    def __init__(self):
+        """
+        Initializes the empty histogram.
+        """
+        self._counts = {}
+
+    def add(self, value):
+        """
+        Takes a non-negative integer and counts it in its bucket.
+        """
+        bucket = int(value).bit_length()
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+
+    def merge(self, other):
+        """
+        Takes another Histogram and adds its counts to this one.
+        """
+        for bucket, count in other._counts.items():
+            self._counts[bucket] = self._counts.get(bucket, 0) + count
+
+    def to_list(self):
+        """
+        Returns the histogram as a list of [lowest value, highest value, count] lists, one for each bucket which is
+        not empty, in order.
+        """
+        return [[(1 << bucket) >> 1, (1 << bucket) - 1, self._counts[bucket]] for bucket in sorted(self._counts)]
+
+    @classmethod
+    def from_list(cls, bucket_list):
+        """
+        Takes a list returned by to_list and returns a Histogram with the same counts.
+        """
+        histogram = cls()
+        for _, highest, count in bucket_list:
+            histogram._counts[(highest + 1).bit_length() - 1] = count
+        return histogram
+
+
+class GameStats:
+    """
+    Represents the counters of one game, or of several games added up: for each timed method the amount of calls,
+    the total nanoseconds and a histogram of the nanoseconds of a call, and for the vertex walk the amount of root
+    lookups, the total hops, a histogram of the hops of a lookup and a histogram of the vertices visited by one
+    fair-play check. The times of a method include the methods it calls.
+    """
+
+    def __init__(self):
+        """
+        Initializes every counter to zero.
+        """
+        self.clear()
+
+    def clear(self):
+        """
+        Sets every counter back to zero.
+        """
+        self._calls = {method_name: 0 for method_name in TIMED_METHODS}
+        self._total_ns = {method_name: 0 for method_name in TIMED_METHODS}
+        self._latency = {method_name: Histogram() for method_name in TIMED_METHODS}
+        self._lookups = 0
+        self._hops = 0
+        self._hops_histogram = Histogram()
+        self._visited_histogram = Histogram()
+
+    def add_call(self, method_name, elapsed_ns=None):
+        """
+        Takes the name of a timed method and the nanoseconds of one call, or None if the call was not timed, and
+        counts that call.
+        """
+        self._calls[method_name] += 1
+        if elapsed_ns is not None:
+            self._total_ns[method_name] += elapsed_ns
+            self._latency[method_name].add(elapsed_ns)
+
+    def add_lookup(self, hops):
+        """
+        Takes the amount of hops a root lookup took and counts that lookup.
+        """
+        self._lookups += 1
+        self._hops += hops
+        self._hops_histogram.add(hops)
+
+    def get_visited(self):
+        """
+        Returns the amount of vertices visited by the root lookups so far, the hops plus the starting vertex of each.
+        """
+        return self._lookups + self._hops
+
+    def add_check_visited(self, visited):
+        """
+        Takes the amount of vertices visited by one fair-play check and counts it.
+        """
+        self._visited_histogram.add(visited)
+
+    def merge(self, other):
+        """
+        Takes another GameStats and adds its counters to this one.
+        """
+        for method_name in TIMED_METHODS:
+            self._calls[method_name] += other._calls[method_name]
+            self._total_ns[method_name] += other._total_ns[method_name]
+            self._latency[method_name].merge(other._latency[method_name])
+        self._lookups += other._lookups
+        self._hops += other._hops
+        self._hops_histogram.merge(other._hops_histogram)
+        self._visited_histogram.merge(other._visited_histogram)
+
+    def to_dict(self):
+        """
+        Returns the counters as a dict of plain values: one dict for each timed method and one for the vertex walk.
+        """
+        stats_dict = {}
+        for method_name in TIMED_METHODS:
+            calls = self._calls[method_name]
+            stats_dict[method_name] = {'calls': calls, 'total_ns': self._total_ns[method_name],
+                                       'mean_ns': self._total_ns[method_name] / calls if calls else 0.0,
+                                       'latency_ns': self._latency[method_name].to_list()}
+        stats_dict[VERTEX_WALK] = {'lookups': self._lookups, 'hops': self._hops,
+                                   'hops_per_lookup': self._hops_histogram.to_list(),
+                                   'visited_per_check': self._visited_histogram.to_list()}
+        return stats_dict
+
+    @classmethod
+    def from_dict(cls, stats_dict):
+        """
+        Takes a dict returned by to_dict and returns a GameStats with the same counters.
+        """
+        stats = cls()
+        for method_name in TIMED_METHODS:
+            method_dict = stats_dict[method_name]
+            stats._calls[method_name] = method_dict['calls']
+            stats._total_ns[method_name] = method_dict['total_ns']
+            stats._latency[method_name] = Histogram.from_list(method_dict['latency_ns'])
+        walk_dict = stats_dict[VERTEX_WALK]
+        stats._lookups = walk_dict['lookups']
+        stats._hops = walk_dict['hops']
+        stats._hops_histogram = Histogram.from_list(walk_dict['hops_per_lookup'])
+        stats._visited_histogram = Histogram.from_list(walk_dict['visited_per_check'])
+        return stats
+
+
+class Instrumentation:
+    """
+    Represents the instrumentation of any amount of games: the counters of every attached game, of the last detached
+    ones and of every game ever attached added up.
+    """
+
+    def __init__(self, timing=True, kept_games=100):
+        """
+        Takes whether to time the calls (the calls are only counted otherwise, which costs less) and how many
+        detached games keep their own counters in the snapshot. The counters of every detached game are always added
+        to the totals.
+        """
+        self._timing = timing
+        self._attached = {}
+        self._detached = deque(maxlen=kept_games)
+        self._detached_total = GameStats()
+        self._game_amount = 0
+
+    def attach(self, game, label=None):
+        """
+        Takes a QuoridorGame and an optional label for it (game-1, game-2, ... otherwise), starts counting its calls
+        and returns the label. A game can only be attached to one Instrumentation at a time.
+        """
+        if id(game) in self._attached:
+            return self._attached[id(game)][0]
+        self._game_amount += 1
+        if label is None:
+            label = 'game-%d' % self._game_amount
+        stats = GameStats()
+        for method_name in TIMED_METHODS:
+            game.__dict__[method_name] = self._make_wrapper(getattr(game, method_name), method_name, stats)
+        fence_vertices = game._fence_vertices
+        fence_vertices.__dict__['_find'] = self._make_find(fence_vertices, stats)
+        game.__dict__['_if_break_fair_play_rule'] = self._make_check_wrapper(game._if_break_fair_play_rule, stats)
+        self._attached[id(game)] = (label, game, stats)
+        return label
+
+    def detach(self, game):
+        """
+        Takes an attached QuoridorGame, stops counting its calls and returns its counters as a dict, which are also
+        kept in the snapshot. Returns None if the game is not attached.
+        """
+        if id(game) not in self._attached:
+            return None
+        label, _, stats = self._attached.pop(id(game))
+        for method_name in TIMED_METHODS:
+            game.__dict__.pop(method_name, None)
+        game._fence_vertices.__dict__.pop('_find', None)
+        self._detached_total.merge(stats)
+        self._detached.append((label, stats))
+        return stats.to_dict()
+
+    def _make_wrapper(self, method, method_name, stats):
+        """
+        A private method which takes a bound method, its name and the counters of its game, and returns a function
+        which calls the method and counts the call.
+        """
+        if not self._timing:
+            def counted(*args):
+                stats.add_call(method_name)
+                return method(*args)
+            return counted
+        perf_counter_ns = time.perf_counter_ns
+
+        def timed(*args):
+            start_ns = perf_counter_ns()
+            result = method(*args)
+            stats.add_call(method_name, perf_counter_ns() - start_ns)
+            return result
+        return timed
+
+    @staticmethod
+    def _make_check_wrapper(check, stats):
+        """
+        A private method which takes the (already wrapped) fair-play check of a game and the counters of the game,
+        and returns a function which calls the check and counts the vertices its root lookups visited.
+        """
+        def check_with_visited(*args):
+            visited_before = stats.get_visited()
+            result = check(*args)
+            stats.add_check_visited(stats.get_visited() - visited_before)
+            return result
+        return check_with_visited
+
+    @staticmethod
+    def _make_find(fence_vertices, stats):
+        """
+        A private method which takes the FenceVertexGraph of a game and the counters of the game, and returns a root
+        lookup which walks up to the root the same way FenceVertexGraph._find does while counting the hops.
+        """
+        parent = fence_vertices._parent
+
+        def find(index):
+            hops = 0
+            while parent[index] != index:
+                index = parent[index]
+                hops += 1
+            stats.add_lookup(hops)
+            return index
+        return find
+
+    def get_snapshot(self):
+        """
+        Returns a dict of plain values which can be dumped to JSON: the amount of games ever attached, the counters of
+        every game (the attached ones and the last detached ones) by label, and the counters of every game ever
+        attached added up.
+        """
+        total = GameStats()
+        total.merge(self._detached_total)
+        game_dict = {}
+        for label, stats in self._detached:
+            game_dict[label] = stats.to_dict()
+        for label, _, stats in self._attached.values():
+            total.merge(stats)
+            game_dict[label] = stats.to_dict()
+        return {'game_amount': self._game_amount, 'games': game_dict, 'total': total.to_dict()}
+
+    def reset(self):
+        """
+        Sets every counter back to zero and forgets the detached games. The attached games stay attached.
+        """
+        self._detached.clear()
+        self._detached_total.clear()
+        self._game_amount = len(self._attached)
+        for _, _, stats in self._attached.values():
+            stats.clear()
+
+
+def merge_snapshots(snapshot_list):
+    """
+    Takes a list of dicts returned by Instrumentation.get_snapshot, for example one from each worker process, and
+    returns one snapshot of every game they count: the totals are added up and the games are kept by label.
+    """
+    total = GameStats()
+    game_dict = {}
+    game_amount = 0
+    for snapshot in snapshot_list:
+        total.merge(GameStats.from_dict(snapshot['total']))
+        game_dict.update(snapshot['games'])
+        game_amount += snapshot['game_amount']
+    return {'game_amount': game_amount, 'games': game_dict, 'total': total.to_dict()}
@@ -0,0 +1,228 @@
+# Description: A Monte Carlo Tree Search (UCT) player for QuoridorGame, with root parallelization over a process pool.
+#              MCTSPlayer grows one search tree in the current process. ParallelMCTS sends the compact state returned
+#              by QuoridorGame.get_state to every worker of a concurrent.futures process pool, each worker grows its
+#              own tree from that position with its own random seed, and the visit and win counts of the root moves
+#              of all the trees are added up at the end. The workers share nothing while searching, so the amount of
+#              playouts per second grows with the amount of cores.
+
+import math
+import os
+import random
+import time
+
+from .game import QuoridorGame
+from .rollout import RandomPolicy, rollout, check_board_configuration
+
+EXPLORATION = 1.4
+
+
+class _Node:
+    """
+    Represents a node of the search tree: the position reached by making move, by player_id, from the parent node.
+    """
+
+    def __init__(self, parent, move, player_id, untried_moves):
+        """
+        Takes the parent node, the move leading here, the player who made it and the legal moves of the position.
+        """
+        self.parent = parent
+        self.move = move
+        self.player_id = player_id
+        self.untried_moves = untried_moves
+        self.children = []
+        self.visits = 0
+        self.wins = 0.0
+
+
+class MCTSPlayer:
+    """
+    Represents a single-process UCT player. Moves are made and taken back on the given game with push_move / pop_move
+    while walking the tree, and the playouts are played with the rollout fast path.
+    """
+
+    def __init__(self, iterations=1000, time_limit=None, max_playout_moves=200, fence_probability=0.1, seed=None):
+        """
+        Takes the amount of playouts to run, an optional wall-clock budget in seconds which stops the search earlier,
+        the amount of moves after which a playout is decided by the distances to the goal lines, how often a playout
+        move tries a random fence instead of a pawn move, and an optional seed for the random choices.
+        """
+        self._iterations = iterations
+        self._time_limit = time_limit
+        self._max_playout_moves = max_playout_moves
+        self._policy = RandomPolicy(fence_probability)
+        self._rng = random.Random(seed)
+
+    def search(self, game):
+        """
+        Takes a QuoridorGame and searches the position for the player whose turn it is. The game is left exactly as
+        it was given.
+        Returns a dict with the most visited move, the (visits, wins) of every root move keyed by move index, the
+        amount of playouts, the seconds used and the playouts per second.
+        Raises ValueError if the game is not of the 9x9 two-player game, which the playouts are played on.
+        """
+        check_board_configuration(game)
+        start_time = time.perf_counter()
+        root = self._grow_tree(game, start_time)
+        elapsed = time.perf_counter() - start_time
+        root_statistics = {game.move_index(child.move): (child.visits, child.wins) for child in root.children}
+        best_move = None
+        if root_statistics:
+            best_move = game.index_move(max(root_statistics, key=lambda move_index: root_statistics[move_index][0]))
+        return {'move': best_move, 'root_statistics': root_statistics, 'playouts': root.visits, 'seconds': elapsed,
+                'playouts_per_second': root.visits / elapsed if elapsed > 0 else 0.0}
+
+    def _grow_tree(self, game, start_time):
+        """
+        A private method which takes the game and the start time of the search and runs the playouts, returning the
+        root node of the tree.
+        """
+        root_player = game.get_which_turn()
+        root = _Node(None, None, 2 if root_player == 1 else 1, game.legal_moves(root_player))
+        for _ in range(0, self._iterations):
+            if self._time_limit is not None and time.perf_counter() - start_time >= self._time_limit:
+                break
+            node = root
+            pushed = 0
+            # selection
+            while not node.untried_moves and node.children:
+                node = self._select_child(node)
+                game.push_move(node.player_id, node.move)
+                pushed += 1
+            # expansion
+            if node.untried_moves and not self._if_game_over(game):
+                move = node.untried_moves.pop(self._rng.randrange(len(node.untried_moves)))
+                player_id = game.get_which_turn()
+                game.push_move(player_id, move)
+                pushed += 1
+                child = _Node(node, move, player_id, game.legal_moves(game.get_which_turn()))
+                node.children.append(child)
+                node = child
+            # simulation
+            winner = self._playout(game)
+            # backpropagation
+            while node is not None:
+                node.visits += 1
+                if winner == node.player_id:
+                    node.wins += 1.0
+                elif winner is None:
+                    node.wins += 0.5
+                node = node.parent
+            for _ in range(0, pushed):
+                game.pop_move()
+        return root
+
+    def _select_child(self, node):
+        """
+        A private method which takes a fully expanded node and returns the child with the highest UCT value.
+        """
+        log_visits = math.log(node.visits)
+        best_child = None
+        best_value = -1.0
+        for child in node.children:
+            value = child.wins / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best_child = child
+        return best_child
+
+    def _if_game_over(self, game):
+        """
+        A private method which takes the game and returns whether a player has won.
+        """
+        return game.is_winner(1) or game.is_winner(2)
+
+    def _playout(self, game):
+        """
+        A private method which takes the game and plays it to the end with the rollout fast path, without changing it.
+        Returns the winner, the player closer to its goal line when the move limit was reached first, or None if
+        neither side can be told apart.
+        """
+        return rollout(game, self._policy, self._rng, self._max_playout_moves, adjudicate=True)[0]
+
+
+def _search_in_worker(state, size, fences, iterations, time_limit, max_playout_moves, fence_probability, seed):
+    """
+    Runs in a worker process: takes a state returned by QuoridorGame.get_state, the board size and the starting amount
+    of fences of the game, and the MCTSPlayer settings, grows one tree from that position and returns its search dict.
+    """
+    game = QuoridorGame.from_state(state, size, fences)
+    player = MCTSPlayer(iterations, time_limit, max_playout_moves, fence_probability, seed)
+    return player.search(game)
+
+
+def _make_executor(workers):
+    """
+    Takes an amount of workers and returns a new process pool. concurrent.futures.process is imported here, since it
+    pulls in multiprocessing and logging, and importing this module should stay cheap.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+class ParallelMCTS:
+    """
+    Represents a root-parallel UCT player: every worker of a process pool grows its own tree from the same position
+    and the statistics of the root moves are merged.
+    """
+
+    def __init__(self, workers=None, iterations=1000, time_limit=None, max_playout_moves=200, fence_probability=0.1,
+                 seed=0):
+        """
+        Takes the amount of worker processes (the amount of cores by default), the MCTSPlayer settings used by each
+        worker, and a seed from which every worker gets its own seed.
+        """
+        self._workers = workers if workers is not None else os.cpu_count() or 1
+        self._iterations = iterations
+        self._time_limit = time_limit
+        self._max_playout_moves = max_playout_moves
+        self._fence_probability = fence_probability
+        self._seed = seed
+        self._executor = None
+
+    def __enter__(self):
+        """
+        Starts the process pool, so it is reused by every search until the with block ends.
+        """
+        self._executor = _make_executor(self._workers)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Shuts the process pool down.
+        """
+        self._executor.shutdown()
+        self._executor = None
+
+    def search(self, game):
+        """
+        Takes a QuoridorGame and searches the position for the player whose turn it is on every worker.
+        Returns the same dict as MCTSPlayer.search, with the root statistics and the playouts of all the workers
+        added up.
+        Raises ValueError if the game is not of the 9x9 two-player game, which the playouts are played on.
+        """
+        check_board_configuration(game)
+        start_time = time.perf_counter()
+        state = game.get_state()
+        size = game.get_board_size()
+        fences = game.get_starting_fence_amount()
+        executor = self._executor if self._executor is not None else _make_executor(self._workers)
+        try:
+            futures = [executor.submit(_search_in_worker, state, size, fences, self._iterations, self._time_limit,
+                                       self._max_playout_moves, self._fence_probability, self._seed * 1000 + worker)
+                       for worker in range(0, self._workers)]
+            results = [future.result() for future in futures]
+        finally:
+            if executor is not self._executor:
+                executor.shutdown()
+        elapsed = time.perf_counter() - start_time
+        root_statistics = {}
+        for result in results:
+            for move_index, (visits, wins) in result['root_statistics'].items():
+                merged_visits, merged_wins = root_statistics.get(move_index, (0, 0.0))
+                root_statistics[move_index] = (merged_visits + visits, merged_wins + wins)
+        playouts = sum(result['playouts'] for result in results)
+        best_move = None
+        if root_statistics:
+            best_move = game.index_move(max(root_statistics, key=lambda move_index: root_statistics[move_index][0]))
+        return {'move': best_move, 'root_statistics': root_statistics, 'playouts': playouts, 'seconds': elapsed,
+                'playouts_per_second': playouts / elapsed if elapsed > 0 else 0.0}
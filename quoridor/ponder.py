@@ -0,0 +1,180 @@
+# Description: Pondering for engine play on the opponent's time. After the engine has moved, a Ponderer keeps
+#              searching the likely replies of the opponent on a worker thread while the opponent thinks: the reply the
+#              last search expected (the transposition table move of the position) first, then the replies which gain
+#              the most on the race to the goal lines. The search of each reply is kept under the Zobrist hash of the
+#              position it leads to. When the real move has been made on the game, Ponderer.search answers at once
+#              from the finished search of that position, or lets the running one go on for the time of a normal move
+#              counted from when it started and takes the best move of its last finished depth, like a timed search.
+#              A running search stopped before it finished its first depth, or a reply which wasn't pondered, is
+#              searched as usual instead, with the transposition table the pondering has filled.
+#                  ponderer = Ponderer(time_limit=1.0)
+#                  result = ponderer.search(game)          # the engine's move
+#                  game.push_move(game.get_which_turn(), result['move'])
+#                  ponderer.start(game)                     # ponder while the opponent thinks
+#                  ... the opponent's move_pawn / place_fence ...
+#                  result = ponderer.search(game)           # instant when the reply was pondered
+#              The worker is a thread, not a process, so the pondered searches and their transposition table are
+#              right there for the reply without copying anything back; it shares the interpreter with the caller,
+#              which is meant to be waiting for the opponent meanwhile.
+
+import threading
+import time
+
+from .game import QuoridorGame
+from .search import SearchEngine, promising_moves
+from .transposition import TranspositionTable, NO_MOVE
+
+
+class Ponderer:
+    """
+    Represents a two-player search engine which ponders the opponent's replies on a worker thread, with counters of
+    the replies it answered from pondering (finished or still running) and of those it had to search.
+    """
+
+    def __init__(self, time_limit=1.0, max_depth=32, replies=4, ponder_time=None, table=None, books=()):
+        """
+        Takes the wall-clock budget per move in seconds, the deepest depth to search to, the most replies to ponder,
+        the longest time to ponder one reply (three times the time limit by default), and optionally a
+        TranspositionTable and opened quoridor.book.PositionTable files for the engine.
+        """
+        self._time_limit = time_limit
+        self._replies = replies
+        self._ponder_time = 3 * time_limit if ponder_time is None else ponder_time
+        self._table = table if table is not None else TranspositionTable()
+        self._engine = SearchEngine(time_limit, max_depth, self._table, books)
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stop_event = None
+        self._results = {}
+        self._current = None
+        self._counters = {'pondered': 0, 'hits': 0, 'running_hits': 0, 'misses': 0}
+
+    def start(self, game):
+        """
+        Takes a QuoridorGame in which it is the opponent's turn, right after the engine's move, and starts pondering
+        its replies on a worker thread. Any pondering still running is stopped first. The game itself is not touched:
+        the worker plays on a copy of the position.
+        """
+        self.stop()
+        if game.get_player_amount() != 2 or game.is_winner(1) or game.is_winner(2):
+            return
+        position = QuoridorGame.from_state(game.get_state(), game.get_board_size(), game.get_starting_fence_amount())
+        self._results = {}
+        self._current = None
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._ponder, args=(position, self._stop_event), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the pondering, if any, and waits for the worker thread to end. The pondered searches are dropped.
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._results = {}
+        self._current = None
+
+    def is_pondering(self):
+        """
+        Returns whether the worker thread is still searching replies.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def search(self, game):
+        """
+        Takes a QuoridorGame in which it is the engine's turn and returns the search dict of SearchEngine.search for
+        it, with a 'pondered' key telling whether it came from pondering and a 'wait_seconds' key with the seconds
+        this call took. A pondered search still running when the time of a normal move is up is stopped, and its
+        result is taken if it finished a depth; the position is searched as usual otherwise. Pondering is stopped
+        once the move is found.
+        """
+        start_time = time.perf_counter()
+        key = game.get_zobrist_hash()
+        result = None
+        with self._condition:
+            if key in self._results:
+                result = self._results[key]
+                self._counters['hits'] += 1
+            elif self._current is not None and self._current[0] == key:
+                # the running search is on this position: it gets the time of a normal move from when it started
+                wait_seconds = max(0.0, self._current[1] + self._time_limit - time.perf_counter())
+                if not self._condition.wait_for(lambda: key in self._results, wait_seconds):
+                    self._stop_event.set()
+                    self._condition.wait_for(lambda: self._current is None)
+                result = self._results.get(key)
+                if result is not None and result['depth'] == 0:
+                    # stopped before its first depth, so its move is just the first legal one
+                    result = None
+                if result is not None:
+                    self._counters['running_hits'] += 1
+        self.stop()
+        pondered = result is not None
+        if not pondered:
+            self._counters['misses'] += 1
+            result = self._engine.search(game)
+        result = dict(result)
+        result['pondered'] = pondered
+        result['wait_seconds'] = time.perf_counter() - start_time
+        return result
+
+    def get_stats(self):
+        """
+        Returns a dict of the counters: the replies pondered, the moves answered from a finished pondered search
+        (hits) or from one still running (running_hits), and the moves searched as usual (misses).
+        """
+        return dict(self._counters)
+
+    def close(self):
+        """
+        Stops the pondering.
+        """
+        self.stop()
+
+    def _ponder(self, game, stop_event):
+        """
+        A private method which runs on the worker thread: takes the copy of the position and the event which stops
+        the pondering, and searches the predicted replies one by one until they are done or the event is set.
+        """
+        oppo_id = game.get_which_turn()
+        try:
+            for reply in self._predict_replies(game):
+                if stop_event.is_set():
+                    return
+                game.push_move(oppo_id, reply)
+                if not game.is_winner(oppo_id):
+                    key = game.get_zobrist_hash()
+                    with self._condition:
+                        self._current = (key, time.perf_counter())
+                    result = self._engine.search(game, self._ponder_time, stop_event)
+                    with self._condition:
+                        self._results[key] = result
+                        self._current = None
+                        self._counters['pondered'] += 1
+                        self._condition.notify_all()
+                game.pop_move()
+        finally:
+            # wake a caller waiting for a search which will never come
+            with self._condition:
+                self._current = None
+                self._condition.notify_all()
+
+    def _predict_replies(self, game):
+        """
+        A private method which takes the position the opponent is to move in and returns the replies to ponder, most
+        likely first: the transposition table move, then the replies which gain the most on the race.
+        """
+        reply_list = []
+        entry = self._table.probe(game.get_zobrist_hash())
+        if entry is not None and entry[3] != NO_MOVE:
+            table_move = game.index_move(entry[3])
+            if table_move in game.legal_moves(game.get_which_turn()):
+                reply_list.append(table_move)
+        for reply in promising_moves(game, self._replies):
+            if len(reply_list) >= self._replies:
+                break
+            if reply not in reply_list:
+                reply_list.append(reply)
+        return reply_list
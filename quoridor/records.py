@@ -0,0 +1,349 @@
+# Description: A compact binary format for QuoridorGame positions and whole games, for large archives. A position is
+#              encoded into a fixed amount of bytes (25 bytes on the 9x9 two-player board): the turn and the winner,
+#              the pawn and fences left of every player, and one bit for every inner horizontal and vertical fence
+#              slot. A game is encoded as its list of moves, one move index (QuoridorGame.move_index) per move, in one
+#              byte when the board has at most 256 move indexes and in two bytes otherwise.
+#              Record files start with a small header naming the kind of records and the board configuration.
+#              PositionReader and GameRecordReader memory-map the file and decode a record only when it is asked
+#              for, so a file of tens of millions of records is opened instantly and read with constant memory.
+
+import itertools
+import mmap
+import struct
+
+from .game import QuoridorGame
+
+MAGIC = b'QRDR'
+POSITION_KIND = ord('P')
+GAME_KIND = ord('G')
+
+# magic, kind, board size, amount of players, fences each player starts with
+_HEADER = struct.Struct('<4sBBBB')
+_MOVE_AMOUNT = struct.Struct('<H')
+
+
+class RecordCodec:
+    """
+    Represents the binary encoding of the positions and moves of one board configuration.
+    """
+
+    def __init__(self, size=9, players=2, fences=None):
+        """
+        Takes the board size, the amount of players and the amount of fences each player starts with (the
+        QuoridorGame default if None). Raises ValueError if the configuration can't be played or doesn't fit in
+        the format: the coordinates and the fences left are stored in one byte each and a move index in two bytes
+        at most.
+        """
+        if fences is None:
+            fences = 10 if players == 2 else 5
+        if fences not in range(0, 256):
+            raise ValueError('fences must be from 0 to 255 to be recorded, not %r' % (fences,))
+        if 3 * size * size > 1 << 16:
+            raise ValueError('a %dx%d board has too many move indexes to be recorded' % (size, size))
+        self._size = size
+        self._players = players
+        self._fences = fences
+        self._slot_amount = size * (size - 1)  # inner fence slots of each kind
+        self._mask_bytes = (self._slot_amount + 7) // 8
+        self._position_width = 1 + 3 * players + 2 * self._mask_bytes
+        self._move_width = 1 if 3 * size * size <= 256 else 2
+        self._game = QuoridorGame(size, fences, players)  # only used for move_index / index_move
+
+    def get_configuration(self):
+        """
+        Returns the tuple of the board size, the amount of players and the amount of fences each player starts with.
+        """
+        return self._size, self._players, self._fences
+
+    def get_position_width(self):
+        """
+        Returns the amount of bytes of every encoded position.
+        """
+        return self._position_width
+
+    def get_move_width(self):
+        """
+        Returns the amount of bytes of every encoded move.
+        """
+        return self._move_width
+
+    def encode_state(self, state):
+        """
+        Takes a tuple returned by QuoridorGame.get_state and returns its fixed-width bytes.
+        """
+        which_turn, player_states, fence_list = state
+        winner = 0
+        body = bytearray()
+        for player_id, (position, fence_amount, is_winner) in enumerate(player_states, 1):
+            if is_winner:
+                winner = player_id
+            body.append(position[0])
+            body.append(position[1])
+            body.append(fence_amount)
+        size = self._size
+        h_mask = 0
+        v_mask = 0
+        for v_or_h, fence_address in fence_list:
+            if v_or_h == 'h':
+                h_mask |= 1 << ((fence_address[1] - 1) * size + fence_address[0])
+            else:
+                v_mask |= 1 << (fence_address[1] * (size - 1) + fence_address[0] - 1)
+        body.insert(0, winner << 4 | which_turn)
+        body += h_mask.to_bytes(self._mask_bytes, 'little')
+        body += v_mask.to_bytes(self._mask_bytes, 'little')
+        return bytes(body)
+
+    def decode_state(self, data, offset=0):
+        """
+        Takes bytes (or any buffer, such as a memory map) and the offset of an encoded position in them, and returns
+        the tuple in the form of QuoridorGame.get_state.
+        """
+        size = self._size
+        which_turn = data[offset] & 0x0F
+        winner = data[offset] >> 4
+        player_states = []
+        index = offset + 1
+        for player_id in range(1, self._players + 1):
+            player_states.append(((data[index], data[index + 1]), data[index + 2], winner == player_id))
+            index += 3
+        fence_list = []
+        h_mask = int.from_bytes(data[index:index + self._mask_bytes], 'little')
+        v_mask = int.from_bytes(data[index + self._mask_bytes:index + 2 * self._mask_bytes], 'little')
+        while h_mask:
+            low_bit = h_mask & -h_mask
+            slot = low_bit.bit_length() - 1
+            fence_list.append(('h', (slot % size, slot // size + 1)))
+            h_mask ^= low_bit
+        while v_mask:
+            low_bit = v_mask & -v_mask
+            slot = low_bit.bit_length() - 1
+            fence_list.append(('v', (slot % (size - 1) + 1, slot // (size - 1))))
+            v_mask ^= low_bit
+        return which_turn, tuple(player_states), tuple(sorted(fence_list))
+
+    def encode_moves(self, move_list):
+        """
+        Takes a list of move tuples as returned by QuoridorGame.legal_moves and returns their bytes.
+        """
+        move_index_list = [self._game.move_index(move) for move in move_list]
+        if self._move_width == 1:
+            return bytes(move_index_list)
+        return struct.pack('<%dH' % len(move_index_list), *move_index_list)
+
+    def decode_moves(self, data, offset=0, move_amount=None):
+        """
+        Takes bytes (or any buffer), the offset of the first encoded move and the amount of moves (all the rest of
+        the bytes by default), and returns the list of move tuples.
+        """
+        if move_amount is None:
+            move_amount = (len(data) - offset) // self._move_width
+        if self._move_width == 1:
+            move_index_list = data[offset:offset + move_amount]
+        else:
+            move_index_list = struct.unpack_from('<%dH' % move_amount, data, offset)
+        return [self._game.index_move(move_index) for move_index in move_index_list]
+
+
+class _RecordWriter:
+    """
+    Represents a record file opened for writing, with the header already written. It is the base of PositionWriter
+    and GameRecordWriter.
+    """
+
+    _KIND = None
+
+    def __init__(self, path, size=9, players=2, fences=None):
+        """
+        Takes the path of the file to create and the board configuration of the records.
+        """
+        self._codec = RecordCodec(size, players, fences)
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, self._KIND, *self._codec.get_configuration()))
+        self._record_amount = 0
+
+    def __enter__(self):
+        """
+        Returns the writer itself, so it can be used in a with block.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the file at the end of the with block.
+        """
+        self.close()
+
+    def get_record_amount(self):
+        """
+        Returns how many records were written so far.
+        """
+        return self._record_amount
+
+    def close(self):
+        """
+        Flushes and closes the file.
+        """
+        self._file.close()
+
+
+class PositionWriter(_RecordWriter):
+    """
+    Represents a file of fixed-width positions opened for writing.
+    """
+
+    _KIND = POSITION_KIND
+
+    def write_state(self, state):
+        """
+        Takes a tuple returned by QuoridorGame.get_state and appends it to the file.
+        """
+        self._file.write(self._codec.encode_state(state))
+        self._record_amount += 1
+
+
+class GameRecordWriter(_RecordWriter):
+    """
+    Represents a file of game records opened for writing. Every game is stored as the amount of its moves followed by
+    the moves.
+    """
+
+    _KIND = GAME_KIND
+
+    def write_game(self, move_list):
+        """
+        Takes the list of the move tuples of a game, in the order they were made from the starting position, and
+        appends it to the file.
+        """
+        self._file.write(_MOVE_AMOUNT.pack(len(move_list)))
+        self._file.write(self._codec.encode_moves(move_list))
+        self._record_amount += 1
+
+
+class _RecordReader:
+    """
+    Represents a record file opened for reading through a read-only memory map. It is the base of PositionReader and
+    GameRecordReader.
+    """
+
+    _KIND = None
+
+    def __init__(self, path):
+        """
+        Takes the path of a record file, maps it and checks its header. Raises ValueError if it is not a record file
+        of the expected kind.
+        """
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError('%s is empty, not a record file' % path)
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError('%s is too short to be a record file' % path)
+        magic, kind, size, players, fences = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or kind != self._KIND:
+            self.close()
+            raise ValueError('%s is not a %s record file' % (path, chr(self._KIND)))
+        self._codec = RecordCodec(size, players, fences)
+
+    def __enter__(self):
+        """
+        Returns the reader itself, so it can be used in a with block.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the file at the end of the with block.
+        """
+        self.close()
+
+    def get_codec(self):
+        """
+        Returns the RecordCodec of the board configuration named in the header.
+        """
+        return self._codec
+
+    def close(self):
+        """
+        Unmaps and closes the file.
+        """
+        self._map.close()
+        self._file.close()
+
+
+class PositionReader(_RecordReader):
+    """
+    Represents a memory-mapped file of fixed-width positions. Positions are decoded only when they are read, and any
+    position can be read directly by its number.
+    """
+
+    _KIND = POSITION_KIND
+
+    def __len__(self):
+        """
+        Returns the amount of positions in the file.
+        """
+        return (len(self._map) - _HEADER.size) // self._codec.get_position_width()
+
+    def __getitem__(self, position_number):
+        """
+        Takes the number of a position in the file and returns it as a tuple in the form of QuoridorGame.get_state.
+        """
+        if position_number < 0:
+            position_number += len(self)
+        if position_number not in range(0, len(self)):
+            raise IndexError('position number out of range')
+        return self._codec.decode_state(self._map, _HEADER.size + position_number * self._codec.get_position_width())
+
+    def __iter__(self):
+        """
+        Yields every position of the file in order, decoding one at a time.
+        """
+        width = self._codec.get_position_width()
+        for offset in range(_HEADER.size, _HEADER.size + len(self) * width, width):
+            yield self._codec.decode_state(self._map, offset)
+
+
+class GameRecordReader(_RecordReader):
+    """
+    Represents a memory-mapped file of game records, read one game at a time.
+    """
+
+    _KIND = GAME_KIND
+
+    def iter_games(self):
+        """
+        Yields the list of the move tuples of every game of the file in order, decoding one game at a time.
+        Raises ValueError on reaching a game cut off by the end of the file.
+        """
+        data = self._map
+        move_width = self._codec.get_move_width()
+        offset = _HEADER.size
+        for game_number in itertools.count():
+            if offset == len(data):
+                return
+            if offset + _MOVE_AMOUNT.size > len(data):
+                raise ValueError('the record file is cut off in the move amount of game %d' % game_number)
+            move_amount = _MOVE_AMOUNT.unpack_from(data, offset)[0]
+            offset += _MOVE_AMOUNT.size
+            if offset + move_amount * move_width > len(data):
+                raise ValueError('the record file is cut off in the moves of game %d' % game_number)
+            yield self._codec.decode_moves(data, offset, move_amount)
+            offset += move_amount * move_width
+
+    def iter_states(self):
+        """
+        Yields a (game number, move number, state) tuple for the starting position and after every move of every
+        game of the file, replaying each game on a QuoridorGame. The state is in the form of QuoridorGame.get_state.
+        A game stops being replayed at its first move which is refused by the rules.
+        """
+        size, players, fences = self._codec.get_configuration()
+        for game_number, move_list in enumerate(self.iter_games()):
+            game = QuoridorGame(size, fences, players)
+            yield game_number, 0, game.get_state()
+            for move_number, move in enumerate(move_list, 1):
+                if game.push_move(game.get_which_turn(), move) is not True:
+                    break
+                yield game_number, move_number, game.get_state()
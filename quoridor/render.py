@@ -0,0 +1,138 @@
+# Description: Text rendering of boards for consoles. board_lines draws one board from the compact state returned by
+#              get_state (of a QuoridorGame, a BitboardQuoridorGame or an ArenaGame) in the format of print_board, in
+#              one pass over the fences. BoardRenderer draws frames of any amount of boards side by side, for watching
+#              many live games at once, and writes each frame to its stream with a single write call. In diff mode it
+#              keeps the last frame and only sends the characters which changed since then, as runs placed with ANSI
+#              cursor moves, so a spectator console gets a few bytes per move instead of a whole redrawn screen and
+#              doesn't flicker:
+#                  renderer = BoardRenderer(diff=True, per_row=4)
+#                  while playing:
+#                      renderer.draw(game_list, label_list)
+
+import sys
+
+# unchanged characters between two changed ones which are sent again rather than moving the cursor past them
+_BRIDGE = 8
+
+
+def board_lines(state, size=9):
+    """
+    Takes a state returned by get_state and the board size, and returns the list of text lines of the board in the
+    format of print_board: the pawns as P1 to P4, the fences as == and |, and the four sides.
+    """
+    _, player_states, fence_list = state
+    h_fence_set = set()
+    v_fence_set = set()
+    for v_or_h, fence_address in fence_list:
+        if v_or_h == 'h':
+            h_fence_set.add(tuple(fence_address))
+        elif v_or_h == 'v':
+            v_fence_set.add(tuple(fence_address))
+    pawn_dict = {}
+    for player_id in range(len(player_states), 0, -1):
+        pawn_dict[tuple(player_states[player_id - 1][0])] = 'P%d' % player_id
+    lines = ['+==' * size + '+']
+    for co_y in range(0, size):
+        if co_y > 0:
+            lines.append(''.join('+==' if (co_x, co_y) in h_fence_set else '+  ' for co_x in range(0, size)) + '+')
+        lines.append(''.join(('|' if co_x == 0 or (co_x, co_y) in v_fence_set else ' ') +
+                             pawn_dict.get((co_x, co_y), '  ') for co_x in range(0, size)) + '|')
+    lines.append('+' + '==+' * size)
+    return lines
+
+
+class BoardRenderer:
+    """
+    Represents a renderer of frames of boards side by side, written whole or as the changes since the last frame.
+    """
+
+    def __init__(self, stream=None, diff=False, per_row=4, gap=3):
+        """
+        Takes the stream to write to (sys.stdout at the time of each frame by default), whether to send only the
+        changes since the last frame, the most boards in one row of the frame and the spaces between two boards.
+        """
+        self._stream = stream
+        self._diff = diff
+        self._per_row = max(1, per_row)
+        self._gap = gap
+        self._last_lines = None
+
+    def reset(self):
+        """
+        Forgets the last frame, so the next one is drawn whole on a cleared screen.
+        """
+        self._last_lines = None
+
+    def frame_lines(self, games, labels=None):
+        """
+        Takes a list of games (any object with get_state, and get_board_size unless it is a 9x9 board) and optionally a
+        list of labels written above them, and returns the lines of the frame, all of the same width.
+        """
+        board_list = []
+        for index, game in enumerate(games):
+            size = game.get_board_size() if hasattr(game, 'get_board_size') else 9
+            lines = board_lines(game.get_state(), size)
+            if labels is not None:
+                label = str(labels[index]) if index < len(labels) else ''
+                lines.insert(0, label[:len(lines[0])])
+            board_list.append(lines)
+        frame = []
+        gap = ' ' * self._gap
+        for row_start in range(0, len(board_list), self._per_row):
+            row_boards = board_list[row_start:row_start + self._per_row]
+            if frame:
+                frame.append('')
+            width_list = [max(len(line) for line in lines) for lines in row_boards]
+            for line_index in range(0, max(len(lines) for lines in row_boards)):
+                frame.append(gap.join((lines[line_index] if line_index < len(lines) else '').ljust(width)
+                                      for lines, width in zip(row_boards, width_list)))
+        frame_width = max((len(line) for line in frame), default=0)
+        return [line.ljust(frame_width) for line in frame]
+
+    def draw(self, games, labels=None):
+        """
+        Takes a list of games and optionally a list of labels, renders the frame and writes it with one write call:
+        the whole frame, or in diff mode the changes since the last frame (the whole frame on a cleared screen the
+        first time and whenever the size of the frame changes). Returns the text written, which is empty in diff mode
+        when nothing changed.
+        """
+        lines = self.frame_lines(games, labels)
+        if not self._diff:
+            text = '\n'.join(lines) + '\n'
+        elif (self._last_lines is None or len(self._last_lines) != len(lines) or
+              (lines and len(self._last_lines[0]) != len(lines[0]))):
+            text = '\x1b[H\x1b[2J' + '\n'.join(lines) + '\n'
+        else:
+            text = self._changes(self._last_lines, lines)
+        self._last_lines = lines
+        if text:
+            stream = self._stream if self._stream is not None else sys.stdout
+            stream.write(text)
+            if hasattr(stream, 'flush'):
+                stream.flush()
+        return text
+
+    @staticmethod
+    def _changes(last_lines, lines):
+        """
+        A private method which takes the lines of the last frame and of the new one, of the same size, and returns the
+        ANSI text which turns the first into the second on the screen: each run of changed characters placed with a
+        cursor move, and the cursor left under the frame. Returns an empty string if nothing changed.
+        """
+        part_list = []
+        for row, (last_line, line) in enumerate(zip(last_lines, lines), 1):
+            if last_line == line:
+                continue
+            changed_list = [column for column in range(0, len(line)) if last_line[column] != line[column]]
+            run_start = changed_list[0]
+            run_end = run_start
+            for column in changed_list[1:]:
+                if column - run_end > _BRIDGE:
+                    part_list.append('\x1b[%d;%dH%s' % (row, run_start + 1, line[run_start:run_end + 1]))
+                    run_start = column
+                run_end = column
+            part_list.append('\x1b[%d;%dH%s' % (row, run_start + 1, line[run_start:run_end + 1]))
+        if not part_list:
+            return ''
+        part_list.append('\x1b[%d;1H' % (len(lines) + 1))
+        return ''.join(part_list)
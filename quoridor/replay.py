@@ -0,0 +1,343 @@
+# Description: A streaming pipeline which replays game records against the rules of QuoridorGame, to audit large
+#              archives. A game record is a list of moves in the argument shapes of move_pawn and place_fence:
+#              (player id, position tuple) for a pawn move and (player id, v or h, position tuple) for a fence. Games
+#              are read lazily from JSON lines files or from the binary game record files of quoridor.records, and
+#              every stage is a generator, so any amount of games is replayed with constant memory. A new
+#              QuoridorGame copies the side fences and distance tables shared by every game of its board size, so
+#              starting a game costs a few dozen microseconds. The games can also be replayed in chunks on a process
+#              pool; the results still come out in the order of the games.
+#              Run it from the command line with:
+#                  python -m quoridor.replay GAMES_FILE [--workers N] [--chunk-size N] [--size N] [--fences N]
+#                                           [--players N] [--profile FILE]
+#              It prints one JSON line per game and a summary line at the end. The games of a record file are
+#              replayed on the board named in its header; --size, --fences and --players are for JSON lines files.
+#              With --profile, the calls of the rule checks are counted and timed with quoridor.instrumentation and
+#              the snapshot is written to FILE.
+
+import json
+import os
+import sys
+from collections import deque
+
+from .game import QuoridorGame
+from .instrumentation import Instrumentation, merge_snapshots
+from .records import MAGIC, GameRecordReader
+
+# the reasons a move is flagged
+MALFORMED = 'malformed move'
+NOT_YOUR_TURN = 'not the turn of this player'
+REFUSED = 'refused by the rules'
+BREAKS_FAIR_PLAY = 'breaks the fair play rule'
+AFTER_THE_END = 'move after the game was won'
+
+
+def _is_integer(value):
+    """
+    A private function which takes a value read from a game record and returns whether it is an integer: an int, but
+    not a bool, and not a float or a string which would have to be rounded or parsed.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class GameReplayer:
+    """
+    Represents a replayer of the games of one board configuration.
+    """
+
+    def __init__(self, size=9, fences=None, players=2, instrumentation=None):
+        """
+        Takes the board size, the amount of fences each player starts with and the amount of players of the games,
+        and optionally an Instrumentation every game is attached to while it is replayed, labelled by its id.
+        """
+        self._size = size
+        self._fences = fences
+        self._player_amount = players
+        self._instrumentation = instrumentation
+
+    def replay(self, game_id, move_list):
+        """
+        Takes an id for the game and its list of moves, replays the moves from the starting position and returns a
+        dict with the id, the amount of moves made, the winner (None if nobody has won), and the number of the first
+        illegal move with the reason it was flagged (both None if every move was legal). The replay stops at the first
+        illegal move.
+        """
+        return self.replay_game(game_id, move_list)[0]
+
+    def replay_game(self, game_id, move_list):
+        """
+        Takes an id for the game and its list of moves, replays them like replay and returns a tuple of the result
+        dict of replay and the QuoridorGame in the last position reached, before the first illegal move if any.
+        """
+        game = QuoridorGame(self._size, self._fences, self._player_amount)
+        if self._instrumentation is not None:
+            self._instrumentation.attach(game, str(game_id))
+        result = {'game': game_id, 'moves': 0, 'winner': None, 'illegal_move': None, 'reason': None}
+        for move_number, move in enumerate(move_list):
+            reason = self._make_move(game, move)
+            if reason is not None:
+                result['illegal_move'] = move_number
+                result['reason'] = reason
+                break
+            result['moves'] += 1
+        for player_id in range(1, self._player_amount + 1):
+            if game.is_winner(player_id):
+                result['winner'] = player_id
+        if self._instrumentation is not None:
+            self._instrumentation.detach(game)
+        return result, game
+
+    def _make_move(self, game, move):
+        """
+        A private method which takes the game and a move in the argument shape of move_pawn or place_fence, and makes
+        the move with move_pawn or place_fence. Returns None if the move was made, or the reason it was flagged.
+        """
+        try:
+            if len(move) == 2:
+                player_id, address = move
+                v_or_h_or_p = 'p'
+            else:
+                player_id, v_or_h_or_p, address = move
+            co_x, co_y = address
+        except (TypeError, ValueError):
+            return MALFORMED
+        if not (_is_integer(player_id) and _is_integer(co_x) and _is_integer(co_y)):
+            return MALFORMED
+        if player_id not in range(1, self._player_amount + 1) or v_or_h_or_p not in ('p', 'v', 'h'):
+            return MALFORMED
+        address = (co_x, co_y)
+        for winner_id in range(1, self._player_amount + 1):
+            if game.is_winner(winner_id):
+                return AFTER_THE_END
+        if game.get_which_turn() != player_id:
+            return NOT_YOUR_TURN
+        if v_or_h_or_p == 'p':
+            result = game.move_pawn(player_id, address)
+        else:
+            result = game.place_fence(player_id, v_or_h_or_p, address)
+        if result is True:
+            return None
+        if result == 'breaks the fair play rule':
+            return BREAKS_FAIR_PLAY
+        return REFUSED
+
+
+def read_json_games(lines):
+    """
+    Takes an iterable of JSON lines and yields a (game id, move list) tuple for each line which is not blank. A line
+    is either a list of moves or an object with a "moves" list and optionally an "id"; the line number is the id
+    otherwise. A line which is not valid JSON is yielded with None as its move list.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None
+            continue
+        if isinstance(record, dict):
+            yield record.get('id', line_number), record.get('moves')
+        else:
+            yield line_number, record
+
+
+def read_record_games(path):
+    """
+    Takes the path of a game record file of quoridor.records and returns a tuple of the board configuration named in
+    its header, as (size, players, fences), and a generator of a (game number, move list) tuple for each of its games,
+    with the moves in the argument shapes of move_pawn and place_fence. The player of every move is the player whose
+    turn it is, in the order of the player ids.
+    """
+    with GameRecordReader(path) as reader:
+        configuration = reader.get_codec().get_configuration()
+    return configuration, _iter_record_games(path, configuration[1])
+
+
+def _iter_record_games(path, player_amount):
+    """
+    A private generator which takes the path of a game record file and its amount of players and yields the games of
+    read_record_games.
+    """
+    with GameRecordReader(path) as reader:
+        for game_number, move_list in enumerate(reader.iter_games()):
+            shaped_list = []
+            for move_number, (v_or_h_or_p, address) in enumerate(move_list):
+                player_id = move_number % player_amount + 1
+                if v_or_h_or_p == 'p':
+                    shaped_list.append((player_id, address))
+                else:
+                    shaped_list.append((player_id, v_or_h_or_p, address))
+            yield game_number, shaped_list
+
+
+def replay_games(games, size=9, fences=None, players=2, instrumentation=None):
+    """
+    Takes an iterable of (game id, move list) tuples, the board configuration and optionally an Instrumentation to
+    attach the games to, and yields the result dict of GameReplayer.replay for each game, in order. A game whose move
+    list is not a list is flagged as malformed.
+    """
+    replayer = GameReplayer(size, fences, players, instrumentation)
+    for game_id, move_list in games:
+        if not isinstance(move_list, (list, tuple)):
+            yield {'game': game_id, 'moves': 0, 'winner': None, 'illegal_move': 0, 'reason': MALFORMED}
+            continue
+        yield replayer.replay(game_id, move_list)
+
+
+def _replay_chunk(chunk, size, fences, players, profile):
+    """
+    Runs in a worker process: takes a list of (game id, move list) tuples, the board configuration and whether to
+    instrument the games, and returns a tuple of the list of their result dicts and the instrumentation snapshot of
+    the chunk (None if not instrumented). The snapshot only has the totals, not the counters of every game.
+    """
+    instrumentation = Instrumentation(kept_games=0) if profile else None
+    result_list = list(replay_games(chunk, size, fences, players, instrumentation))
+    return result_list, None if instrumentation is None else instrumentation.get_snapshot()
+
+
+def _chunks(games, chunk_size):
+    """
+    A private generator which takes an iterable of games and yields lists of at most chunk_size of them.
+    """
+    chunk = []
+    for game in games:
+        chunk.append(game)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def replay_games_in_pool(games, size=9, fences=None, players=2, workers=None, chunk_size=256, snapshot_list=None):
+    """
+    Takes an iterable of (game id, move list) tuples, the board configuration, the amount of worker processes (the
+    amount of cores by default) and the amount of games sent to a worker at a time, and yields the same results as
+    replay_games in the same order. At most two chunks per worker are in flight at any time, so the games are still
+    read lazily and memory stays constant.
+    If a list is given as snapshot_list, the workers instrument their games and the instrumentation snapshot of every
+    chunk is appended to it; merge_snapshots adds them up.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    in_flight_limit = 2 * workers
+    # Imported here, since concurrent.futures.process pulls in multiprocessing and logging at import time.
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = deque()
+        for chunk in _chunks(games, chunk_size):
+            futures.append(executor.submit(_replay_chunk, chunk, size, fences, players, snapshot_list is not None))
+            if len(futures) >= in_flight_limit:
+                for result in _chunk_results(futures.popleft(), snapshot_list):
+                    yield result
+        while futures:
+            for result in _chunk_results(futures.popleft(), snapshot_list):
+                yield result
+
+
+def _chunk_results(future, snapshot_list):
+    """
+    A private function which takes the future of a _replay_chunk call and the snapshot list of replay_games_in_pool,
+    waits for the chunk, appends its snapshot to the list if there is one and returns its result dicts.
+    """
+    result_list, snapshot = future.result()
+    if snapshot is not None:
+        snapshot_list.append(snapshot)
+    return result_list
+
+
+def open_games(path):
+    """
+    Takes the path of a games file, or - for the standard input, and returns a tuple of the board configuration of
+    its games, as (size, players, fences), and a generator of its (game id, move list) tuples. Files starting with the
+    record file magic are read as game record files, whose header names the board configuration; anything else is read
+    as JSON lines, which don't name one, and the configuration is None.
+    """
+    if path != '-':
+        with open(path, 'rb') as games_file:
+            is_record_file = games_file.read(len(MAGIC)) == MAGIC
+        if is_record_file:
+            return read_record_games(path)
+    return None, _iter_json_file(path)
+
+
+def _iter_json_file(path):
+    """
+    A private generator which takes the path of a JSON lines file, or - for the standard input, and yields its games.
+    """
+    if path == '-':
+        for game in read_json_games(sys.stdin):
+            yield game
+        return
+    with open(path) as games_file:
+        for game in read_json_games(games_file):
+            yield game
+
+
+def read_games(path):
+    """
+    Takes the path of a games file, or - for the standard input, and yields its (game id, move list) tuples, as
+    open_games does but without the board configuration.
+    """
+    for game in open_games(path)[1]:
+        yield game
+
+
+def main(argv=None):
+    """
+    Parses the command line, replays every game of the file and prints one JSON line per game and a summary line.
+    Returns 0 if every game was legal and 1 otherwise.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description='Replay Quoridor game records and flag illegal moves.')
+    parser.add_argument('games_file', help='a JSON lines file, a game record file or - for the standard input')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='replay on a process pool with this many workers (0 replays in this process)')
+    parser.add_argument('--chunk-size', type=int, default=256, help='games sent to a worker at a time')
+    parser.add_argument('--size', type=int, default=None,
+                        help='board size of the games (9 by default, and read from the header of a record file)')
+    parser.add_argument('--fences', type=int, default=None,
+                        help='fences each player starts with (read from the header of a record file)')
+    parser.add_argument('--players', type=int, default=None, choices=(2, 4),
+                        help='amount of players (2 by default, and read from the header of a record file)')
+    parser.add_argument('--profile', help='count and time the rule checks and write the snapshot to this JSON file')
+    args = parser.parse_args(argv)
+    configuration, games = open_games(args.games_file)
+    if configuration is not None:
+        for name, value in zip(('size', 'players', 'fences'), configuration):
+            if getattr(args, name) is not None and getattr(args, name) != value:
+                parser.error('--%s %d does not match the %s %d in the header of the record file'
+                             % (name, getattr(args, name), name, value))
+        args.size, args.players, args.fences = configuration
+    if args.size is None:
+        args.size = 9
+    if args.players is None:
+        args.players = 2
+    instrumentation = None
+    snapshot_list = None
+    if args.profile is not None:
+        instrumentation = Instrumentation()
+        snapshot_list = []
+    if args.workers > 0:
+        results = replay_games_in_pool(games, args.size, args.fences, args.players, args.workers, args.chunk_size,
+                                       snapshot_list)
+    else:
+        results = replay_games(games, args.size, args.fences, args.players, instrumentation)
+    summary = {'games': 0, 'illegal_games': 0, 'moves': 0, 'wins': {}}
+    for result in results:
+        print(json.dumps(result))
+        summary['games'] += 1
+        summary['moves'] += result['moves']
+        if result['illegal_move'] is not None:
+            summary['illegal_games'] += 1
+        if result['winner'] is not None:
+            summary['wins'][result['winner']] = summary['wins'].get(result['winner'], 0) + 1
+    print(json.dumps({'summary': summary}))
+    if args.profile is not None:
+        with open(args.profile, 'w') as profile_file:
+            json.dump(merge_snapshots(snapshot_list + [instrumentation.get_snapshot()]), profile_file, indent=2)
+    return 0 if summary['illegal_games'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
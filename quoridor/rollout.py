@@ -0,0 +1,152 @@
+# Description: A fast path for random playouts (rollouts) of a Quoridor game, for MCTS and for training data
+#              generation. A rollout copies the position into a BitboardQuoridorGame once and then plays it to the end
+#              through the bitboard's unchecked make_*_bit methods: the policy only ever picks from the legal pawn
+#              moves of pawn_move_bits and from fences accepted by if_fence_bit_allowed, so the rules are the same as
+#              QuoridorGame's, but there is no turn or winner re-check, no coordinate tuple and no string dispatch per
+#              move. Every random choice comes from the random.Random given by the caller, so rollouts are
+#              reproducible from a seed.
+
+import random
+import time
+
+from .bitboard import BitboardQuoridorGame, address_to_bit
+
+# every fence slot a fence can be placed on, as bits
+_FENCE_SLOT_BITS = [address_to_bit((co_x, co_y)) for co_y in range(0, 9) for co_x in range(0, 9)]
+
+# for each player and each row, the cells of the rows closer to that player's goal line
+_FORWARD_CELLS = {1: {}, 2: {}}
+for _pos_y in range(0, 9):
+    _FORWARD_CELLS[1][_pos_y] = sum(address_to_bit((co_x, co_y)) for co_y in range(_pos_y + 1, 9)
+                                    for co_x in range(0, 9))
+    _FORWARD_CELLS[2][_pos_y] = sum(address_to_bit((co_x, co_y)) for co_y in range(0, _pos_y)
+                                    for co_x in range(0, 9))
+
+
+def _random_bit(mask, rng):
+    """
+    Takes a non-empty bitmask and a random.Random and returns one of its set bits, each with the same chance.
+    """
+    bit_list = []
+    while mask:
+        bit = mask & -mask
+        bit_list.append(bit)
+        mask ^= bit
+    return bit_list[rng.randrange(len(bit_list))]
+
+
+class RandomPolicy:
+    """
+    Represents the default rollout policy: now and then a random fence slot is tried, otherwise a random legal pawn
+    move is made, preferring the moves which get closer to the goal line.
+    A policy is any callable taking (board, player_id, rng) and returning ('p', cell bit), (v or h, fence bit) or None
+    if it has no move, where board is the BitboardQuoridorGame being played.
+    """
+
+    def __init__(self, fence_probability=0.1, forward_probability=0.6):
+        """
+        Takes the chance of trying a fence instead of a pawn move and the chance of picking among the forward pawn
+        moves only when there is one.
+        """
+        self._fence_probability = fence_probability
+        self._forward_probability = forward_probability
+
+    def __call__(self, board, player_id, rng):
+        """
+        Takes the board, the player to move and the random.Random, and returns the move to make.
+        """
+        if board.get_fence_amount(player_id) > 0 and rng.random() < self._fence_probability:
+            v_or_h = 'h' if rng.random() < 0.5 else 'v'
+            fence = _FENCE_SLOT_BITS[rng.randrange(81)]
+            if board.if_fence_bit_allowed(player_id, v_or_h, fence):
+                return v_or_h, fence
+        moves = board.pawn_move_bits(player_id)
+        if not moves:
+            return None
+        if rng.random() < self._forward_probability:
+            forward_moves = moves & _FORWARD_CELLS[player_id][board.get_player_position(player_id)[1]]
+            if forward_moves:
+                moves = forward_moves
+        return 'p', _random_bit(moves, rng)
+
+
+def check_board_configuration(position):
+    """
+    Takes a position (a QuoridorGame, a BitboardQuoridorGame or anything else with get_state) and raises ValueError
+    unless it is of the 9x9 two-player game, the only board rollouts are played on. A position without
+    get_board_size or get_player_amount is taken to be of the 9x9 two-player game.
+    """
+    size = position.get_board_size() if hasattr(position, 'get_board_size') else 9
+    players = position.get_player_amount() if hasattr(position, 'get_player_amount') else 2
+    if size != 9 or players != 2:
+        raise ValueError('rollouts are played on the 9x9 two-player board only, not on a %dx%d board with %d players'
+                         % (size, size, players))
+
+
+def rollout(state, policy=None, rng=None, max_moves=500, adjudicate=False):
+    """
+    Takes a position (a QuoridorGame, a BitboardQuoridorGame or anything else with get_state), a policy (a
+    RandomPolicy by default), a random.Random, the most moves to play and whether to adjudicate an unfinished game,
+    and plays the game from that position until a player wins, the player to move has no move, or the move limit is
+    reached. The given position is not changed.
+    Returns a tuple of the winner and the amount of moves played. When no player has won, the winner is None, or with
+    adjudicate the player closer to its goal line, as long as the distances differ.
+    Raises ValueError if the position is not of the 9x9 two-player game.
+    """
+    check_board_configuration(state)
+    board = BitboardQuoridorGame.from_state(state.get_state())
+    if policy is None:
+        policy = _DEFAULT_POLICY
+    if rng is None:
+        rng = random.Random()
+    moves_played = 0
+    while board.get_winner() is None and moves_played < max_moves:
+        player_id = board.get_which_turn()
+        move = policy(board, player_id, rng)
+        if move is None:
+            break
+        if move[0] == 'p':
+            board.make_pawn_move_bit(player_id, move[1])
+        else:
+            board.make_fence_bit(player_id, move[0], move[1])
+        moves_played += 1
+    if board.get_winner() is None and adjudicate:
+        return _closer_player(board), moves_played
+    return board.get_winner(), moves_played
+
+
+def _closer_player(board):
+    """
+    A private function which takes a BitboardQuoridorGame and returns the player closer to its goal line, or None if
+    both are as close. A player who can't reach its goal line is the further one.
+    """
+    distance_1 = board.distance_to_goal(1)
+    distance_2 = board.distance_to_goal(2)
+    if distance_1 is not None and (distance_2 is None or distance_1 < distance_2):
+        return 1
+    if distance_2 is not None and (distance_1 is None or distance_2 < distance_1):
+        return 2
+    return None
+
+
+def benchmark_rollouts(state, games=1000, policy=None, seed=0, max_moves=500):
+    """
+    Takes a position, the amount of rollouts to play from it, a policy, a seed and the most moves per rollout, and
+    plays them with one random.Random seeded with the seed.
+    Returns a dict with the amount of games, the seconds used, the games per second, the average game length in moves
+    and the amount of wins of each player (None for the games without a winner).
+    """
+    rng = random.Random(seed)
+    wins = {1: 0, 2: 0, None: 0}
+    total_moves = 0
+    start_time = time.perf_counter()
+    for _ in range(0, games):
+        winner, moves_played = rollout(state, policy, rng, max_moves)
+        wins[winner] += 1
+        total_moves += moves_played
+    elapsed = time.perf_counter() - start_time
+    return {'games': games, 'seconds': elapsed, 'games_per_second': games / elapsed if elapsed > 0 else 0.0,
+            'average_length': total_moves / games if games else 0.0, 'wins': wins}
+
+
+_DEFAULT_POLICY = RandomPolicy()
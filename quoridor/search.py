@@ -0,0 +1,284 @@
+# Description: A search engine which plays QuoridorGame. It runs a negamax search with alpha-beta pruning inside
+#              iterative deepening, so there is always a best move from the last finished depth when the wall-clock
+#              budget for the move runs out. Moves are made and taken back on the game itself with push_move /
+#              pop_move, positions are shared across move orders through a TranspositionTable, and moves are ordered
+#              by the transposition table move, then the killer moves of the ply, then the history heuristic.
+#              Positions are evaluated from the shortest-path distance of each pawn to its goal line, and
+#              promising_moves orders the moves of a position by the same race without a search.
+#              An engine can be given opening books and endgame tablebases (quoridor.book.PositionTable): a position
+#              found in one of them is answered from it at once, without searching.
+
+import time
+
+from .transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND, NO_MOVE
+
+WIN_SCORE = 100000
+# scores at least this far from 0 are wins found by the search, WIN_SCORE less the plies to the win: no search goes
+# 1000 plies deep and no evaluation gets this far
+WIN_THRESHOLD = WIN_SCORE - 1000
+DISTANCE_WEIGHT = 100
+FENCE_WEIGHT = 10
+# the distance an unreachable goal line counts as on the 9x9 board, more than any real distance; on larger boards it
+# is the amount of cells
+UNREACHABLE_DISTANCE = 81
+
+
+def _score_to_table(score, ply):
+    """
+    A private function which takes a score found at the given distance from the root and returns it as it is stored in
+    the transposition table: a win is counted in plies from the position itself rather than from the root, so it
+    stays right when the position is reached again at another distance from the root.
+    """
+    if score >= WIN_THRESHOLD:
+        return score + ply
+    if score <= -WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    """
+    A private function which takes a score read from the transposition table and the distance from the root of the
+    position, and returns the score counted from the root again, the reverse of _score_to_table.
+    """
+    if score >= WIN_THRESHOLD:
+        return score - ply
+    if score <= -WIN_THRESHOLD:
+        return score + ply
+    return score
+
+
+def promising_moves(game, width):
+    """
+    Takes a two-player QuoridorGame and an amount of moves, and returns up to that many legal moves of the player to
+    move, best first by how much each one gains on the race: the distance of the opponent to its goal minus the
+    distance of the player to its goal after the move. It orders moves without searching them, for callers which
+    follow a few replies of a position, like the opening book builder and the ponderer.
+    """
+    player_id = game.get_which_turn()
+    oppo_id = 2 if player_id == 1 else 1
+    scored_list = []
+    for move in game.legal_moves(player_id):
+        game.push_move(player_id, move)
+        if game.is_winner(player_id):
+            gain = WIN_SCORE
+        else:
+            gain = (game.distance_to_goal(oppo_id) or 0) - (game.distance_to_goal(player_id) or 0)
+        game.pop_move()
+        scored_list.append((gain, game.move_index(move), move))
+    scored_list.sort(key=lambda scored: (-scored[0], scored[1]))
+    return [scored[2] for scored in scored_list[:width]]
+
+
+class _SearchTimeout(Exception):
+    """
+    Raised inside the search when the wall-clock budget for the move is used up or the search is stopped.
+    """
+
+
+class SearchEngine:
+    """
+    Represents a negamax alpha-beta search engine with iterative deepening, killer moves, history heuristic, a
+    transposition table and a hard wall-clock budget per move.
+    """
+
+    def __init__(self, time_limit=1.0, max_depth=32, table=None, books=()):
+        """
+        Takes the wall-clock budget per move in seconds, the deepest depth to search to, optionally a
+        TranspositionTable to share with other engines and a sequence of opened quoridor.book.PositionTable files to
+        probe before searching. A table of the default size is created if none is given.
+        """
+        self._time_limit = time_limit
+        self._max_depth = max_depth
+        self._table = table if table is not None else TranspositionTable()
+        self._books = tuple(books)
+        self._game = None
+        self._deadline = 0.0
+        self._stop_event = None
+        self._nodes = 0
+        self._killers = []
+        self._history = {}
+        self._unreachable_distance = UNREACHABLE_DISTANCE
+
+    def search(self, game, time_limit=None, stop_event=None):
+        """
+        Takes a QuoridorGame and searches the position for the player whose turn it is, within the time limit.
+        Optionally takes a time limit for this search only and a threading.Event which stops the search early when it
+        is set from another thread, with the best move of the last finished depth like a timeout.
+        The game is left exactly as it was given.
+        Returns a dict with the best move found (a move tuple as returned by legal_moves, or None if there's no legal
+        move), its score for the player to move, the deepest finished depth, the amount of nodes searched, the
+        seconds used and the nodes per second. A position found in a book is answered from the book with 0 nodes,
+        the depth stored in the book and a 'book' key holding the kind of the book.
+        Raises ValueError if the game is not a two-player game, the only one the engine plays.
+        """
+        if game.get_player_amount() != 2:
+            raise ValueError('SearchEngine plays the two-player game only, not the %d-player game'
+                             % game.get_player_amount())
+        start_time = time.perf_counter()
+        for book in self._books:
+            entry = book.probe(game)
+            if entry is not None:
+                return {'move': entry['move'], 'score': entry['score'], 'depth': entry['depth'], 'nodes': 0,
+                        'seconds': time.perf_counter() - start_time, 'nodes_per_second': 0.0,
+                        'book': chr(book.get_kind())}
+        self._game = game
+        self._deadline = start_time + (self._time_limit if time_limit is None else time_limit)
+        self._stop_event = stop_event
+        self._nodes = 0
+        self._killers = [[None, None] for _ in range(0, self._max_depth + 1)]
+        self._history = {player_id: [0] * game.get_move_amount() for player_id in (1, 2)}
+        self._unreachable_distance = max(UNREACHABLE_DISTANCE, game.get_board_size() ** 2)
+        self._table.new_search()
+        player_id = game.get_which_turn()
+        root_moves = game.legal_moves(player_id)
+        best_move = root_moves[0] if root_moves else None
+        best_score = self._evaluate(player_id)
+        depth_reached = 0
+        if len(root_moves) > 1:
+            for depth in range(1, self._max_depth + 1):
+                try:
+                    score, move = self._search_root(root_moves, depth)
+                except _SearchTimeout:
+                    break
+                best_score, best_move, depth_reached = score, move, depth
+                # search the best move first at the next depth
+                root_moves.remove(move)
+                root_moves.insert(0, move)
+                # a win within the depth searched is the fastest one, since every shorter win would have been found
+                # by this depth; a longer one found through the transposition table may still have a shorter one
+                if abs(score) >= WIN_THRESHOLD and WIN_SCORE - abs(score) <= depth:
+                    break
+        elapsed = time.perf_counter() - start_time
+        return {'move': best_move, 'score': best_score, 'depth': depth_reached, 'nodes': self._nodes,
+                'seconds': elapsed, 'nodes_per_second': self._nodes / elapsed if elapsed > 0 else 0.0}
+
+    def _search_root(self, root_moves, depth):
+        """
+        A private method which takes the ordered legal moves at the root and a depth, searches every move to that
+        depth and returns the tuple of the best score and the best move.
+        """
+        game = self._game
+        player_id = game.get_which_turn()
+        alpha = -WIN_SCORE - 1
+        beta = WIN_SCORE + 1
+        best_move = root_moves[0]
+        for move in root_moves:
+            game.push_move(player_id, move)
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha, 1)
+            finally:
+                game.pop_move()
+            if score > alpha:
+                alpha = score
+                best_move = move
+        self._table.store(game.get_zobrist_hash(), depth, alpha, EXACT, game.move_index(best_move))
+        return alpha, best_move
+
+    def _negamax(self, depth, alpha, beta, ply):
+        """
+        A private method which takes the depth left, the alpha-beta window and the distance from the root, and returns
+        the score of the current position for the player to move.
+        """
+        self._nodes += 1
+        if time.perf_counter() >= self._deadline or (self._stop_event is not None and self._stop_event.is_set()):
+            raise _SearchTimeout()
+        game = self._game
+        player_id = game.get_which_turn()
+        if game.is_winner(1) or game.is_winner(2):
+            # the player who just moved has won
+            return -(WIN_SCORE - ply)
+        if depth <= 0 or ply >= self._max_depth:
+            return self._evaluate(player_id)
+        zobrist_hash = game.get_zobrist_hash()
+        table_move = NO_MOVE
+        entry = self._table.probe(zobrist_hash)
+        if entry is not None:
+            entry_depth, entry_value, entry_flag, table_move = entry
+            entry_value = _score_from_table(entry_value, ply)
+            if entry_depth >= depth:
+                if entry_flag == EXACT:
+                    return entry_value
+                if entry_flag == LOWER_BOUND and entry_value >= beta:
+                    return entry_value
+                if entry_flag == UPPER_BOUND and entry_value <= alpha:
+                    return entry_value
+        moves = game.legal_moves(player_id)
+        if not moves:
+            return self._evaluate(player_id)
+        moves = self._order_moves(moves, player_id, ply, table_move)
+        alpha_orig = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = moves[0]
+        for move in moves:
+            game.push_move(player_id, move)
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.pop_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self._update_cutoff_move(move, player_id, depth, ply)
+                break
+        if best_score <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._table.store(zobrist_hash, depth, _score_to_table(best_score, ply), flag, game.move_index(best_move))
+        return best_score
+
+    def _order_moves(self, moves, player_id, ply, table_move):
+        """
+        A private method which takes the legal moves of a position and returns them ordered: the transposition table
+        move first, then the killer moves of this ply, then the rest by their history score.
+        """
+        game = self._game
+        history = self._history[player_id]
+        killers = self._killers[ply]
+        scored_list = []
+        for move in moves:
+            move_index = game.move_index(move)
+            if move_index == table_move:
+                order = 1 << 40
+            elif move == killers[0]:
+                order = 1 << 39
+            elif move == killers[1]:
+                order = 1 << 38
+            else:
+                order = history[move_index]
+            scored_list.append((order, move_index, move))
+        scored_list.sort(reverse=True)
+        return [scored[2] for scored in scored_list]
+
+    def _update_cutoff_move(self, move, player_id, depth, ply):
+        """
+        A private method which takes a move that caused a beta cutoff and records it as a killer move of the ply and
+        in the history heuristic.
+        """
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self._history[player_id][self._game.move_index(move)] += depth * depth
+
+    def _evaluate(self, player_id):
+        """
+        A private method which takes the player to move and returns the score of the current position for that
+        player, from the shortest-path distances of both pawns to their goal lines and the fences left.
+        """
+        game = self._game
+        oppo_id = 2 if player_id == 1 else 1
+        my_distance = game.distance_to_goal(player_id)
+        oppo_distance = game.distance_to_goal(oppo_id)
+        if my_distance is None:
+            my_distance = self._unreachable_distance
+        if oppo_distance is None:
+            oppo_distance = self._unreachable_distance
+        return ((oppo_distance - my_distance) * DISTANCE_WEIGHT +
+                (game.get_fence_amount(player_id) - game.get_fence_amount(oppo_id)) * FENCE_WEIGHT)
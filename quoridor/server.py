@@ -0,0 +1,441 @@
+# Description: An asyncio server which hosts many QuoridorGame sessions in one process, over TCP or a Unix socket.
+#              The protocol is JSON lines: every request is one JSON object on one line, and every request gets one
+#              JSON object line back, in order, carrying the "id" of the request if it had one. A request names its
+#              operation with "op":
+#                  {"op": "new_game", "size": 9, "fences": 10, "players": 2}  -> {"ok": true, "game": GAME_ID}
+#                  {"op": "move_pawn", "game": GAME_ID, "player": 1, "to": [4, 1]}  -> {"ok": true, "result": true}
+#                  {"op": "place_fence", "game": GAME_ID, "player": 1, "fence": "h", "at": [4, 5]}
+#                                            -> {"ok": true, "result": true | false | "breaks the fair play rule"}
+#                  {"op": "state", "game": GAME_ID}  -> {"ok": true, "state": {...}}
+#                  {"op": "legal_moves", "game": GAME_ID, "player": 1}  -> {"ok": true, "moves": [["p", [4, 1]], ...]}
+#                  {"op": "engine_move", "game": GAME_ID, "time": 0.5, "play": true}  -> {"ok": true, "move": ...}
+#                  {"op": "close", "game": GAME_ID}  -> {"ok": true}
+#                  {"op": "stats"}  -> {"ok": true, "stats": {...}}
+#              A request which can't be served gets {"ok": false, "error": "..."}.
+#              Each session has a lock, so the requests of one game are served one at a time while other games go
+#              on. The legal move lists, which answer the fair-play rule for every fence slot, are found on a thread
+#              of the default executor, and engine replies run a SearchEngine on a process pool, so a slow request
+#              doesn't stall the event loop. A single move is checked on the event loop, where it costs less than the
+#              hop to a thread. Sessions which get no request for the idle timeout are evicted.
+#              Run it from the command line with:
+#                  python -m quoridor.server [--host HOST] [--port PORT | --unix PATH] [--idle-timeout SECONDS]
+#                                            [--max-sessions N] [--engine-workers N]
+
+import json
+import os
+import sys
+import time
+
+from .game import QuoridorGame
+from .search import SearchEngine
+
+# asyncio and secrets are imported in the functions which use them: asyncio takes longer to import than the whole
+# package, and every engine worker process imports this module to run _search_in_worker.
+
+# the longest request line, in bytes
+LINE_LIMIT = 64 * 1024
+# the board sizes a client may ask for, since every move of a game costs time growing with the square of its size
+MIN_BOARD_SIZE = 3
+MAX_BOARD_SIZE = 19
+# the most fences a client may ask for each player to start with, since a new game draws a hash key for every amount
+MAX_FENCES = 255
+
+
+class RequestError(Exception):
+    """
+    Raised while serving a request which can't be served, with the message sent back to the client.
+    """
+
+
+def _search_in_worker(state, size, fences, time_limit):
+    """
+    Runs in a worker process: takes a state returned by QuoridorGame.get_state, the board size, the starting amount of
+    fences and the time limit, searches the position with a SearchEngine and returns its search dict.
+    """
+    game = QuoridorGame.from_state(state, size, fences)
+    return SearchEngine(time_limit=time_limit).search(game)
+
+
+class _Session:
+    """
+    Represents one hosted game: the QuoridorGame, the settings it was created with, the lock serving its requests one
+    at a time and the time of its last request.
+    """
+
+    def __init__(self, game_id, size, fences, players):
+        """
+        Takes the id of the session and the board size, starting amount of fences and amount of players of the game.
+        """
+        import asyncio
+        self.game_id = game_id
+        self.size = size
+        self.fences = fences
+        self.game = QuoridorGame(size, fences, players)
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+class QuoridorServer:
+    """
+    Represents the server: the hosted sessions by id, the listening sockets, the idle eviction task and the process
+    pool of the engine, which is only started by the first engine request.
+    """
+
+    def __init__(self, idle_timeout=600.0, max_sessions=10000, engine_workers=None, engine_time=1.0,
+                 offload_legal_moves=True):
+        """
+        Takes the seconds a session may go without a request before it is evicted, the most sessions hosted at once,
+        the amount of engine worker processes (the amount of cores by default), the default and longest engine time
+        per move in seconds, and whether legal move lists are found on the default executor instead of the event
+        loop.
+        """
+        self._idle_timeout = idle_timeout
+        self._max_sessions = max_sessions
+        self._engine_workers = engine_workers or os.cpu_count() or 1
+        self._engine_time = engine_time
+        self._offload_legal_moves = offload_legal_moves
+        self._sessions = {}
+        self._servers = []
+        self._engine_executor = None
+        self._eviction_task = None
+        self._counters = {'connections': 0, 'requests': 0, 'errors': 0, 'sessions_created': 0, 'sessions_evicted': 0,
+                          'engine_moves': 0}
+        self._handlers = {
+            'new_game': self._new_game,
+            'move_pawn': self._move_pawn,
+            'place_fence': self._place_fence,
+            'state': self._state,
+            'legal_moves': self._legal_moves,
+            'engine_move': self._engine_move,
+            'close': self._close,
+            'stats': self._stats,
+        }
+
+    async def start_tcp(self, host='127.0.0.1', port=8765):
+        """
+        Takes a host and a port, starts listening on them and returns the asyncio server.
+        """
+        import asyncio
+        server = await asyncio.start_server(self._serve_connection, host, port, limit=LINE_LIMIT)
+        return self._add_server(server)
+
+    async def start_unix(self, path):
+        """
+        Takes the path of a Unix socket, starts listening on it and returns the asyncio server.
+        """
+        import asyncio
+        server = await asyncio.start_unix_server(self._serve_connection, path, limit=LINE_LIMIT)
+        return self._add_server(server)
+
+    def _add_server(self, server):
+        """
+        A private method which takes a started asyncio server, keeps it and starts the idle eviction task if it is not
+        running yet. Returns the server.
+        """
+        import asyncio
+        self._servers.append(server)
+        if self._eviction_task is None:
+            self._eviction_task = asyncio.get_running_loop().create_task(self._evict_idle_sessions())
+        return server
+
+    async def serve_forever(self):
+        """
+        Serves the started sockets until the task is cancelled, then closes them.
+        """
+        import asyncio
+        try:
+            await asyncio.gather(*[server.serve_forever() for server in self._servers])
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+        Stops listening, stops the idle eviction task, shuts the engine process pool down and drops every session.
+        """
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            self._eviction_task = None
+        if self._engine_executor is not None:
+            self._engine_executor.shutdown(wait=False, cancel_futures=True)
+            self._engine_executor = None
+        self._sessions.clear()
+
+    def get_session_amount(self):
+        """
+        Returns the amount of sessions hosted right now.
+        """
+        return len(self._sessions)
+
+    async def _evict_idle_sessions(self):
+        """
+        A private coroutine which evicts the sessions idle for longer than the idle timeout, checking a few times per
+        timeout, until it is cancelled. A session serving a request is never evicted.
+        """
+        import asyncio
+        while True:
+            await asyncio.sleep(max(0.05, self._idle_timeout / 4))
+            oldest_allowed = time.monotonic() - self._idle_timeout
+            for game_id, session in list(self._sessions.items()):
+                if session.last_used < oldest_allowed and not session.lock.locked():
+                    del self._sessions[game_id]
+                    self._counters['sessions_evicted'] += 1
+
+    async def _serve_connection(self, reader, writer):
+        """
+        A private coroutine which serves one client connection: it reads request lines until the client closes it
+        and writes one response line for each.
+        """
+        self._counters['connections'] += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b'{"ok": false, "error": "request line too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self.handle_line(line)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_line(self, line):
+        """
+        Takes one request line (bytes or str) and returns the response dict. It is what a connection does for each
+        line, and can be called directly to serve requests without a socket. A request which fails for any reason
+        gets an {"ok": false} response instead of an exception.
+        """
+        self._counters['requests'] += 1
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise RequestError('not a JSON object')
+            if not isinstance(request, dict):
+                raise RequestError('not a JSON object')
+            request_id = request.get('id')
+            handler = self._handlers.get(request.get('op'))
+            if handler is None:
+                raise RequestError('unknown op: %r' % (request.get('op'),))
+            response = await handler(request)
+            response['ok'] = True
+        except RequestError as error:
+            self._counters['errors'] += 1
+            response = {'ok': False, 'error': str(error)}
+        except Exception as error:
+            # a bug serving one request must not end the connection, and the other requests on it
+            self._counters['errors'] += 1
+            response = {'ok': False, 'error': 'internal error: %s' % type(error).__name__}
+        if request_id is not None:
+            response['id'] = request_id
+        return response
+
+    def _get_session(self, request):
+        """
+        A private method which takes a request and returns the session it names, marking it as used.
+        """
+        session = self._sessions.get(request.get('game'))
+        if session is None:
+            raise RequestError('no such game: %r' % (request.get('game'),))
+        session.last_used = time.monotonic()
+        return session
+
+    @staticmethod
+    def _get_int(request, key, default=None):
+        """
+        A private method which takes a request, a key and a default and returns the integer under that key.
+        """
+        value = request.get(key, default)
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise RequestError('%s must be an integer' % key)
+        return value
+
+    @staticmethod
+    def _get_address(request, key):
+        """
+        A private method which takes a request and a key and returns the [x, y] list under that key as a tuple.
+        """
+        value = request.get(key)
+        if (not isinstance(value, list) or len(value) != 2 or
+                not all(isinstance(co, int) and not isinstance(co, bool) for co in value)):
+            raise RequestError('%s must be a list of two integers' % key)
+        return value[0], value[1]
+
+    async def _new_game(self, request):
+        """
+        A private coroutine which starts a new session with the size, fences and players of the request.
+        """
+        import secrets
+        if len(self._sessions) >= self._max_sessions:
+            raise RequestError('server is full')
+        size = self._get_int(request, 'size', 9)
+        if not MIN_BOARD_SIZE <= size <= MAX_BOARD_SIZE:
+            raise RequestError('size must be from %d to %d' % (MIN_BOARD_SIZE, MAX_BOARD_SIZE))
+        fences = request.get('fences')
+        if fences is not None:
+            fences = self._get_int(request, 'fences')
+            if not 0 <= fences <= MAX_FENCES:
+                raise RequestError('fences must be from 0 to %d' % MAX_FENCES)
+        players = self._get_int(request, 'players', 2)
+        game_id = secrets.token_hex(8)
+        try:
+            self._sessions[game_id] = _Session(game_id, size, fences, players)
+        except ValueError as error:
+            raise RequestError(str(error))
+        self._counters['sessions_created'] += 1
+        return {'game': game_id}
+
+    async def _move_pawn(self, request):
+        """
+        A private coroutine which moves a pawn in the session of the request, with QuoridorGame.move_pawn.
+        """
+        session = self._get_session(request)
+        player_id = self._get_int(request, 'player')
+        address = self._get_address(request, 'to')
+        async with session.lock:
+            return {'result': session.game.move_pawn(player_id, address)}
+
+    async def _place_fence(self, request):
+        """
+        A private coroutine which places a fence in the session of the request with QuoridorGame.place_fence. The
+        fair-play check of one fence is a lookup in the fence vertex components, so it runs on the event loop.
+        """
+        session = self._get_session(request)
+        player_id = self._get_int(request, 'player')
+        v_or_h = request.get('fence')
+        if v_or_h not in ('v', 'h'):
+            raise RequestError('fence must be "v" or "h"')
+        address = self._get_address(request, 'at')
+        async with session.lock:
+            return {'result': session.game.place_fence(player_id, v_or_h, address)}
+
+    async def _state(self, request):
+        """
+        A private coroutine which returns the position of the session of the request.
+        """
+        session = self._get_session(request)
+        async with session.lock:
+            which_turn, player_states, fence_list = session.game.get_state()
+        return {'state': {
+            'size': session.size,
+            'turn': which_turn,
+            'players': [{'id': player_id, 'position': list(position), 'fences': fence_amount, 'winner': is_winner}
+                        for player_id, (position, fence_amount, is_winner) in enumerate(player_states, 1)],
+            'fences': [[v_or_h, list(fence_address)] for v_or_h, fence_address in fence_list],
+        }}
+
+    async def _legal_moves(self, request):
+        """
+        A private coroutine which returns the legal moves of a player in the session of the request. They are found
+        on a thread of the default executor unless legal moves are found on the event loop, since the fair-play rule
+        is answered for every fence slot.
+        """
+        import asyncio
+        session = self._get_session(request)
+        player_id = self._get_int(request, 'player')
+        async with session.lock:
+            if self._offload_legal_moves:
+                move_list = await asyncio.get_running_loop().run_in_executor(None, session.game.legal_moves,
+                                                                             player_id)
+            else:
+                move_list = session.game.legal_moves(player_id)
+        return {'moves': [[v_or_h_or_p, list(address)] for v_or_h_or_p, address in move_list]}
+
+    async def _engine_move(self, request):
+        """
+        A private coroutine which searches the position of the session of the request with a SearchEngine on the
+        engine process pool, and plays the move found if the request has "play": true. The session stays locked
+        during the search, so the position can't change under it.
+        """
+        import asyncio
+        session = self._get_session(request)
+        if session.game.get_player_amount() != 2:
+            raise RequestError('the engine only plays two-player games')
+        time_limit = request.get('time', self._engine_time)
+        if not isinstance(time_limit, (int, float)) or isinstance(time_limit, bool) or time_limit <= 0:
+            raise RequestError('time must be a positive number')
+        time_limit = min(time_limit, self._engine_time)
+        async with session.lock:
+            if self._engine_executor is None:
+                # Imported here, since concurrent.futures.process pulls in multiprocessing and logging.
+                from concurrent.futures import ProcessPoolExecutor
+                self._engine_executor = ProcessPoolExecutor(max_workers=self._engine_workers)
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._engine_executor, _search_in_worker, session.game.get_state(), session.size, session.fences,
+                time_limit)
+            self._counters['engine_moves'] += 1
+            move = result['move']
+            response = {'move': None if move is None else [move[0], list(move[1])], 'score': result['score'],
+                        'depth': result['depth'], 'nodes': result['nodes']}
+            if request.get('play') is True and move is not None:
+                response['result'] = session.game.push_move(session.game.get_which_turn(), move)
+            session.last_used = time.monotonic()
+            return response
+
+    async def _close(self, request):
+        """
+        A private coroutine which ends the session of the request.
+        """
+        session = self._get_session(request)
+        async with session.lock:
+            self._sessions.pop(session.game_id, None)
+        return {}
+
+    async def _stats(self, request):
+        """
+        A private coroutine which returns the counters of the server and the amount of hosted sessions.
+        """
+        stats = dict(self._counters)
+        stats['sessions'] = len(self._sessions)
+        return {'stats': stats}
+
+
+async def _run(args):
+    """
+    A private coroutine which starts a QuoridorServer with the command line arguments and serves until cancelled.
+    """
+    server = QuoridorServer(args.idle_timeout, args.max_sessions, args.engine_workers, args.engine_time)
+    if args.unix is not None:
+        await server.start_unix(args.unix)
+        print('serving on %s' % args.unix, file=sys.stderr)
+    else:
+        await server.start_tcp(args.host, args.port)
+        print('serving on %s:%d' % (args.host, args.port), file=sys.stderr)
+    await server.serve_forever()
+
+
+def main(argv=None):
+    """
+    Parses the command line and runs the server until it is interrupted.
+    """
+    import asyncio
+    import argparse
+    parser = argparse.ArgumentParser(description='Host Quoridor games over a JSON lines protocol.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port to listen on')
+    parser.add_argument('--unix', default=None, help='listen on this Unix socket path instead of TCP')
+    parser.add_argument('--idle-timeout', type=float, default=600.0, help='seconds before an idle game is evicted')
+    parser.add_argument('--max-sessions', type=int, default=10000, help='most games hosted at once')
+    parser.add_argument('--engine-workers', type=int, default=None, help='engine processes (the amount of cores)')
+    parser.add_argument('--engine-time', type=float, default=1.0, help='longest engine time per move in seconds')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,488 @@
+# Description: A self-play tournament runner which rates agents against each other over many two-player games, for
+#              rating engine changes overnight on one multi-core box. Every pair of agents plays the same amount of
+#              games with each agent as player 1 and as player 2, spread over a process pool. The agents only use the
+#              public QuoridorGame API. An agent is named by a spec string NAME[:KEY=VALUE,...], where NAME is one of
+#              the built-in agents or the dotted path of any factory taking the options as keyword arguments:
+#                  random                 a random legal move (fence_probability=0.2 of placing a fence)
+#                  greedy                 the move which gains the most on the race to the goal lines
+#                  search                 SearchEngine (time=0.1, depth=32)
+#                  mcts                   MCTSPlayer (iterations=200, time=None)
+#                  mypackage.agents.Mine  any factory returning an object with a select_move(game, rng) method
+#              An agent which can't play every board has a check_game(game) method raising ValueError for the boards it
+#              can't play (mcts plays the 9x9 board only), and the agents are checked against the board of the
+#              tournament before any game is played.
+#              Every game has a seed derived from the tournament seed and the game number, and the agents draw all of
+#              their randomness from the game's random.Random, so a game plays the same way whichever worker plays it
+#              and whenever (searches limited by time rather than depth excepted). The result of each game is
+#              appended to a JSON lines file as soon as it finishes, and a run can be resumed from that file. The
+#              summary has the Elo estimate, the win rate and the average game length of each agent and the moves per
+#              second of each worker.
+#              Run it from the command line with:
+#                  python -m quoridor.tournament AGENT AGENT [AGENT ...] [--games-per-pair N] [--workers N]
+#                                                [--seed N] [--output FILE] [--resume] [--max-moves N]
+#                                                [--size N] [--fences N]
+
+import importlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import deque
+
+from .game import QuoridorGame
+
+# a game which lasts this many moves is a draw
+MAX_MOVES = 400
+# the reasons a game ended
+WIN = 'win'
+ILLEGAL_MOVE = 'illegal move'
+NO_MOVE_LEFT = 'no move left'
+MOVE_LIMIT = 'move limit'
+
+
+class RandomAgent:
+    """
+    Represents an agent which plays a random legal move: a fence with the given probability, a pawn move otherwise.
+    """
+
+    def __init__(self, fence_probability=0.2):
+        """
+        Takes the probability of placing a fence when the player can.
+        """
+        self._fence_probability = fence_probability
+
+    def select_move(self, game, rng):
+        """
+        Takes the game and the random.Random of the game, and returns the move of the player to move.
+        """
+        legal_list = game.legal_moves(game.get_which_turn())
+        if not legal_list:
+            return None
+        pawn_list = [move for move in legal_list if move[0] == 'p']
+        if pawn_list and (len(pawn_list) == len(legal_list) or rng.random() >= self._fence_probability):
+            return rng.choice(pawn_list)
+        return rng.choice([move for move in legal_list if move[0] != 'p'])
+
+
+class GreedyAgent:
+    """
+    Represents an agent which plays the move gaining the most on the race to the goal lines after one ply: the
+    distance of the opponent to its goal line minus its own. Ties are broken at random.
+    """
+
+    def select_move(self, game, rng):
+        """
+        Takes the game and the random.Random of the game, and returns the move of the player to move.
+        """
+        player_id = game.get_which_turn()
+        oppo_id = 2 if player_id == 1 else 1
+        best_list = []
+        best_gain = None
+        for move in game.legal_moves(player_id):
+            game.push_move(player_id, move)
+            if game.is_winner(player_id):
+                gain = math.inf
+            else:
+                gain = (game.distance_to_goal(oppo_id) or 0) - (game.distance_to_goal(player_id) or 0)
+            game.pop_move()
+            if best_gain is None or gain > best_gain:
+                best_gain = gain
+                best_list = [move]
+            elif gain == best_gain:
+                best_list.append(move)
+        return rng.choice(best_list) if best_list else None
+
+
+class SearchAgent:
+    """
+    Represents an agent which plays the best move of a SearchEngine.
+    """
+
+    def __init__(self, time=0.1, depth=32):
+        """
+        Takes the search time per move in seconds and the deepest depth to search to.
+        """
+        from .search import SearchEngine
+        from .transposition import TranspositionTable
+        # a small table, one is made for every game
+        self._engine = SearchEngine(time_limit=time, max_depth=depth, table=TranspositionTable(1024 * 1024))
+
+    def select_move(self, game, rng):
+        """
+        Takes the game and the random.Random of the game, and returns the move of the player to move.
+        """
+        return self._engine.search(game)['move']
+
+
+class MCTSAgent:
+    """
+    Represents an agent which plays the best move of an MCTSPlayer.
+    """
+
+    def __init__(self, iterations=200, time=None):
+        """
+        Takes the amount of playouts per move and optionally a time limit per move in seconds.
+        """
+        self._iterations = iterations
+        self._time_limit = time
+
+    def select_move(self, game, rng):
+        """
+        Takes the game and the random.Random of the game, and returns the move of the player to move.
+        """
+        from .mcts import MCTSPlayer
+        player = MCTSPlayer(self._iterations, self._time_limit, seed=rng.getrandbits(32))
+        return player.search(game)['move']
+
+    def check_game(self, game):
+        """
+        Takes a game and raises ValueError if its board is not one the playouts can be played on.
+        """
+        from .rollout import check_board_configuration
+        check_board_configuration(game)
+
+
+AGENTS = {'random': RandomAgent, 'greedy': GreedyAgent, 'search': SearchAgent, 'mcts': MCTSAgent}
+
+
+def _parse_value(text):
+    """
+    A private function which takes the text of an option value and returns it as an int, a float, None or a string.
+    """
+    if text == 'None':
+        return None
+    for value_type in (int, float):
+        try:
+            return value_type(text)
+        except ValueError:
+            pass
+    return text
+
+
+def make_agent(spec):
+    """
+    Takes an agent spec string NAME[:KEY=VALUE,...] and returns a new agent.
+    Raises ValueError if the spec can't be made into an agent.
+    """
+    name, _, option_text = spec.partition(':')
+    option_dict = {}
+    for option in option_text.split(',') if option_text else ():
+        key, equals, value = option.partition('=')
+        if not equals:
+            raise ValueError('option %r of agent %r is not KEY=VALUE' % (option, spec))
+        option_dict[key.strip()] = _parse_value(value.strip())
+    if name in AGENTS:
+        factory = AGENTS[name]
+    elif '.' in name:
+        module_name, _, factory_name = name.rpartition('.')
+        try:
+            factory = getattr(importlib.import_module(module_name), factory_name)
+        except (ImportError, AttributeError) as error:
+            raise ValueError('agent %r can\'t be imported: %s' % (spec, error))
+    else:
+        raise ValueError('unknown agent %r, the built-in agents are %s' % (spec, ', '.join(sorted(AGENTS))))
+    try:
+        return factory(**option_dict)
+    except TypeError as error:
+        raise ValueError('agent %r can\'t be made: %s' % (spec, error))
+
+
+def _check_agent(spec, agent, game):
+    """
+    A private function which takes an agent spec, the agent made from it and a game, and raises ValueError if the agent
+    can't play that game. An agent without a check_game method plays every game.
+    """
+    if hasattr(agent, 'check_game'):
+        try:
+            agent.check_game(game)
+        except ValueError as error:
+            raise ValueError('agent %r can\'t play this board: %s' % (spec, error))
+
+
+def check_agents(specs, size=9, fences=None):
+    """
+    Takes agent specs and the board configuration, and checks that the board can be set up and that an agent made
+    from every spec can play on it.
+    Raises ValueError otherwise.
+    """
+    game = QuoridorGame(size, fences)
+    for spec in specs:
+        _check_agent(spec, make_agent(spec), game)
+
+
+def game_seed(seed, game_number):
+    """
+    Takes the tournament seed and a game number and returns the seed of that game.
+    """
+    return random.Random('%d:%d' % (seed, game_number)).getrandbits(64)
+
+
+def schedule(agent_amount, games_per_pair):
+    """
+    Takes the amount of agents and the amount of games each pair plays, and returns the list of (game number, agent
+    index of player 1, agent index of player 2) tuples of the tournament. Every pair plays half of its games with
+    each agent as player 1, and the games of all pairs are interleaved so a partial run is balanced.
+    """
+    game_list = []
+    for round_number in range(0, games_per_pair):
+        for first in range(0, agent_amount):
+            for second in range(first + 1, agent_amount):
+                pair = (first, second) if round_number % 2 == 0 else (second, first)
+                game_list.append((len(game_list),) + pair)
+    return game_list
+
+
+def play_game(game_number, seed, specs, size=9, fences=None, max_moves=MAX_MOVES):
+    """
+    Takes the game number, the seed of the game, the agent specs of player 1 and player 2, the board configuration
+    and the most moves before the game is a draw, plays the game and returns its result dict: the number, the seed,
+    the specs, the winner (1, 2 or None for a draw), the reason it ended, the amount of moves, the seconds, the moves
+    per second, the seconds each player took to select its moves and the id of the process which played it.
+    An agent which returns an illegal move, or no move, loses the game.
+    Raises ValueError if an agent can't play on the board.
+    """
+    rng = random.Random(seed)
+    agents = {1: make_agent(specs[0]), 2: make_agent(specs[1])}
+    game = QuoridorGame(size, fences)
+    for player_id in (1, 2):
+        _check_agent(specs[player_id - 1], agents[player_id], game)
+    think_seconds = {1: 0.0, 2: 0.0}
+    winner = None
+    reason = MOVE_LIMIT
+    move_amount = 0
+    start_time = time.perf_counter()
+    while move_amount < max_moves:
+        player_id = game.get_which_turn()
+        select_start = time.perf_counter()
+        move = agents[player_id].select_move(game, rng)
+        think_seconds[player_id] += time.perf_counter() - select_start
+        if move is None:
+            winner = 2 if player_id == 1 else 1
+            reason = NO_MOVE_LEFT
+            break
+        if game.push_move(player_id, tuple(move)) is not True:
+            winner = 2 if player_id == 1 else 1
+            reason = ILLEGAL_MOVE
+            break
+        move_amount += 1
+        if game.is_winner(player_id):
+            winner = player_id
+            reason = WIN
+            break
+    elapsed = time.perf_counter() - start_time
+    return {'game': game_number, 'seed': seed, 'player_1': specs[0], 'player_2': specs[1], 'winner': winner,
+            'reason': reason, 'moves': move_amount, 'seconds': elapsed,
+            'moves_per_second': move_amount / elapsed if elapsed > 0 else 0.0,
+            'think_seconds': [think_seconds[1], think_seconds[2]], 'worker': os.getpid()}
+
+
+def _play_in_worker(arguments):
+    """
+    Runs in a worker process: takes the argument tuple of play_game and returns its result dict.
+    """
+    return play_game(*arguments)
+
+
+def run_tournament(specs, games_per_pair=2, seed=0, workers=None, size=9, fences=None, max_moves=MAX_MOVES,
+                   skip_games=()):
+    """
+    Takes the agent specs, the amount of games each pair plays, the tournament seed, the amount of worker processes
+    (the amount of cores by default, 0 to play in this process), the board configuration, the most moves of a game
+    and the numbers of the games already played, and yields the result dict of every other game as soon as it
+    finishes, so not in the order of the game numbers. At most two games per worker are waiting in the pool.
+    Raises ValueError before any game is played if an agent can't play on the board.
+    """
+    check_agents(specs, size, fences)
+    task_list = [(game_number, game_seed(seed, game_number), (specs[first], specs[second]), size, fences, max_moves)
+                 for game_number, first, second in schedule(len(specs), games_per_pair)
+                 if game_number not in skip_games]
+    if workers == 0:
+        for task in task_list:
+            yield play_game(*task)
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # Imported here, since concurrent.futures.process pulls in multiprocessing and logging at import time.
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    tasks = deque(task_list)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        while tasks or pending:
+            while tasks and len(pending) < 2 * workers:
+                pending.add(executor.submit(_play_in_worker, tasks.popleft()))
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda done_future: done_future.result()['game']):
+                yield future.result()
+
+
+def elo_ratings(result_list, specs, iterations=1000):
+    """
+    Takes a list of result dicts and the agent specs, and returns a dict of the Elo estimate of each spec, averaging
+    0. The ratings are the maximum likelihood estimate of the Bradley-Terry model, with a draw counted as half a win
+    for each agent and one drawn game added between every two agents which met so that an agent which never won (or
+    never lost) still gets a finite rating. It doesn't depend on the order of the games.
+    """
+    index_dict = {spec: index for index, spec in enumerate(specs)}
+    agent_amount = len(specs)
+    score = [0.0] * agent_amount
+    games = [[0.0] * agent_amount for _ in range(0, agent_amount)]
+    for result in result_list:
+        first = index_dict[result['player_1']]
+        second = index_dict[result['player_2']]
+        if first == second:
+            continue
+        games[first][second] += 1
+        games[second][first] += 1
+        if result['winner'] == 1:
+            score[first] += 1
+        elif result['winner'] == 2:
+            score[second] += 1
+        else:
+            score[first] += 0.5
+            score[second] += 0.5
+    for first in range(0, agent_amount):
+        for second in range(0, agent_amount):
+            if first != second and games[first][second]:
+                games[first][second] += 1
+                score[first] += 0.5
+    strength = [1.0] * agent_amount
+    for _ in range(0, iterations):
+        new_strength = []
+        for first in range(0, agent_amount):
+            total = sum(games[first][second] / (strength[first] + strength[second])
+                        for second in range(0, agent_amount) if second != first and games[first][second])
+            new_strength.append(score[first] / total if total else strength[first])
+        # keep the geometric mean at 1, the ratings average 0
+        mean_log = sum(math.log(value) for value in new_strength) / agent_amount
+        new_strength = [value / math.exp(mean_log) for value in new_strength]
+        converged = max(abs(new - old) for new, old in zip(new_strength, strength)) < 1e-12
+        strength = new_strength
+        if converged:
+            break
+    return {spec: 400 * math.log10(strength[index]) for spec, index in index_dict.items()}
+
+
+def summarize(result_list, specs):
+    """
+    Takes a list of result dicts and the agent specs, and returns the summary dict of the tournament: the amount of
+    games, of draws and of each reason a game ended, the average game length, for each agent its games, wins, draws,
+    losses, win rate (draws counted as half), Elo estimate, average game length and mean seconds per move, and for
+    each worker process its games, moves, seconds and moves per second.
+    """
+    agent_dict = {spec: {'games': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'moves': 0, 'think_seconds': 0.0,
+                         'own_moves': 0} for spec in specs}
+    worker_dict = {}
+    reason_dict = {}
+    move_total = 0
+    for result in result_list:
+        move_total += result['moves']
+        reason_dict[result['reason']] = reason_dict.get(result['reason'], 0) + 1
+        for player_id, spec in ((1, result['player_1']), (2, result['player_2'])):
+            agent = agent_dict[spec]
+            agent['games'] += 1
+            agent['moves'] += result['moves']
+            agent['think_seconds'] += result['think_seconds'][player_id - 1]
+            # player 1 made the odd moves
+            agent['own_moves'] += (result['moves'] + (1 if player_id == 1 else 0)) // 2
+            if result['winner'] is None:
+                agent['draws'] += 1
+            elif result['winner'] == player_id:
+                agent['wins'] += 1
+            else:
+                agent['losses'] += 1
+        worker = worker_dict.setdefault(str(result['worker']), {'games': 0, 'moves': 0, 'seconds': 0.0})
+        worker['games'] += 1
+        worker['moves'] += result['moves']
+        worker['seconds'] += result['seconds']
+    elo_dict = elo_ratings(result_list, specs)
+    for spec, agent in agent_dict.items():
+        games = agent['games']
+        agent['win_rate'] = (agent['wins'] + 0.5 * agent['draws']) / games if games else 0.0
+        agent['elo'] = round(elo_dict[spec], 1)
+        agent['average_moves'] = agent.pop('moves') / games if games else 0.0
+        own_moves = agent.pop('own_moves')
+        agent['seconds_per_move'] = agent.pop('think_seconds') / own_moves if own_moves else 0.0
+    for worker in worker_dict.values():
+        worker['moves_per_second'] = worker['moves'] / worker['seconds'] if worker['seconds'] > 0 else 0.0
+    return {'games': len(result_list), 'draws': sum(agent['draws'] for agent in agent_dict.values()) // 2,
+            'reasons': reason_dict, 'average_moves': move_total / len(result_list) if result_list else 0.0,
+            'agents': agent_dict, 'workers': worker_dict}
+
+
+def read_results(path):
+    """
+    Takes the path of a results file and returns the list of its result dicts, skipping a last line which was cut
+    off by an interrupted run.
+    """
+    result_list = []
+    with open(path) as results_file:
+        for line in results_file:
+            try:
+                result_list.append(json.loads(line))
+            except ValueError:
+                continue
+    return result_list
+
+
+def main(argv=None):
+    """
+    Parses the command line, runs the tournament while appending every result to the output file, and prints the
+    summary as JSON.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description='Play a self-play tournament between Quoridor agents.')
+    parser.add_argument('agents', nargs='+', help='agent specs NAME[:KEY=VALUE,...], at least two different ones')
+    parser.add_argument('--games-per-pair', type=int, default=10, help='games each pair of agents plays')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (the amount of cores by default, 0 plays in this process)')
+    parser.add_argument('--seed', type=int, default=0, help='tournament seed, every game seed is derived from it')
+    parser.add_argument('--output', default='tournament_results.jsonl', help='JSON lines file the results go to')
+    parser.add_argument('--resume', action='store_true',
+                        help='keep the results already in the output file and only play the missing games')
+    parser.add_argument('--size', type=int, default=9, help='board size')
+    parser.add_argument('--fences', type=int, default=None, help='fences each player starts with')
+    parser.add_argument('--max-moves', type=int, default=MAX_MOVES, help='moves after which a game is a draw')
+    args = parser.parse_args(argv)
+    if len(set(args.agents)) != len(args.agents) or len(args.agents) < 2:
+        parser.error('give at least two different agent specs')
+    game_list = schedule(len(args.agents), args.games_per_pair)
+    result_list = []
+    if args.resume and os.path.exists(args.output):
+        # only the results of this very tournament are kept: same game number, agents and seed
+        expected_dict = {game_number: (args.agents[first], args.agents[second], game_seed(args.seed, game_number))
+                         for game_number, first, second in game_list}
+        result_dict = {}
+        for result in read_results(args.output):
+            if expected_dict.get(result.get('game')) == (result['player_1'], result['player_2'], result['seed']):
+                result_dict[result['game']] = result
+        result_list = [result_dict[game_number] for game_number in sorted(result_dict)]
+    game_amount = len(game_list)
+    try:
+        # checked before the output file is opened, which would lose the results of a run to resume
+        check_agents(args.agents, args.size, args.fences)
+    except ValueError as error:
+        parser.error(str(error))
+    results = run_tournament(args.agents, args.games_per_pair, args.seed, args.workers, args.size, args.fences,
+                             args.max_moves, {result['game'] for result in result_list})
+    cut_off = False
+    if args.resume and os.path.exists(args.output) and os.path.getsize(args.output) > 0:
+        with open(args.output, 'rb') as results_file:
+            results_file.seek(-1, os.SEEK_END)
+            cut_off = results_file.read(1) != b'\n'
+    with open(args.output, 'a' if args.resume else 'w') as output_file:
+        if cut_off:
+            # a line cut off by an interrupted run is left on its own
+            output_file.write('\n')
+        for result in results:
+            output_file.write(json.dumps(result) + '\n')
+            output_file.flush()
+            result_list.append(result)
+            print('%d/%d games' % (len(result_list), game_amount), file=sys.stderr)
+    print(json.dumps(summarize(result_list, args.agents), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
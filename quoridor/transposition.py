@@ -0,0 +1,116 @@
+# Description: A transposition table for search and analysis tools playing QuoridorGame. Positions are stored under the
+#              Zobrist hash returned by QuoridorGame.get_zobrist_hash, so the value found for one move order is
+#              shared with every other move order reaching the same position. The table is given a fixed memory
+#              budget and preallocates all of its entries in flat arrays at creation, so it never grows. Each bucket
+#              holds two entries: a depth-preferred one, which keeps the deepest result of the current search, and an
+#              always-replace one, which takes every result the first entry turns down.
+
+from array import array
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+NO_MOVE = 0xFFFF
+
+# bytes taken by one entry: key, depth, value, flag, move index and search generation
+_ENTRY_BYTES = 8 + 2 + 4 + 1 + 2 + 1
+
+
+class TranspositionTable:
+    """
+    Represents a transposition table with a fixed memory budget and a two-tier (depth-preferred and always-replace)
+    replacement policy.
+    """
+
+    def __init__(self, memory_bytes=16 * 1024 * 1024):
+        """
+        Takes the memory budget in bytes and preallocates as many buckets of two entries as fit in it. The number of
+        buckets is a power of two so a bucket is found by masking the hash.
+        """
+        bucket_amount = 1
+        while bucket_amount * 4 * _ENTRY_BYTES <= memory_bytes:
+            bucket_amount *= 2
+        self._bucket_mask = bucket_amount - 1
+        entry_amount = bucket_amount * 2
+        self._keys = array('Q', bytes(8 * entry_amount))
+        self._depths = array('h', [-1]) * entry_amount
+        self._values = array('i', bytes(4 * entry_amount))
+        self._flags = array('b', bytes(entry_amount))
+        self._moves = array('H', [NO_MOVE]) * entry_amount
+        self._generations = array('B', bytes(entry_amount))
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+
+    def get_entry_amount(self):
+        """
+        Returns how many entries the table can hold.
+        """
+        return len(self._keys)
+
+    def get_memory_bytes(self):
+        """
+        Returns how many bytes the entries of the table take.
+        """
+        return len(self._keys) * _ENTRY_BYTES
+
+    def new_search(self):
+        """
+        Marks the start of a new search. Depth-preferred entries left from earlier searches can then be replaced by
+        shallower results of the new one.
+        """
+        self._generation = (self._generation + 1) % 256
+
+    def clear(self):
+        """
+        Empties every entry of the table.
+        """
+        entry_amount = len(self._keys)
+        self._depths = array('h', [-1]) * entry_amount
+        self._moves = array('H', [NO_MOVE]) * entry_amount
+
+    def probe(self, zobrist_hash):
+        """
+        Takes a Zobrist hash and returns the tuple (depth, value, flag, move index) stored for it, or None if the
+        position is not in the table. The move index is NO_MOVE when no best move was stored.
+        """
+        slot = (zobrist_hash & self._bucket_mask) * 2
+        for entry in (slot, slot + 1):
+            if self._keys[entry] == zobrist_hash and self._depths[entry] >= 0:
+                self._hits += 1
+                return self._depths[entry], self._values[entry], self._flags[entry], self._moves[entry]
+        self._misses += 1
+        return None
+
+    def store(self, zobrist_hash, depth, value, flag, move_index=NO_MOVE):
+        """
+        Takes a Zobrist hash, the depth the position was searched to, its value, whether the value is EXACT, a
+        LOWER_BOUND or an UPPER_BOUND, and optionally the index of the best move, and stores them.
+        The depth-preferred entry of the bucket is replaced if it holds the same position, if it is from an earlier
+        search or if the new depth is at least as deep, otherwise the always-replace entry is used.
+        """
+        slot = (zobrist_hash & self._bucket_mask) * 2
+        if (self._keys[slot] == zobrist_hash or self._generations[slot] != self._generation or
+                depth >= self._depths[slot]):
+            entry = slot
+        else:
+            entry = slot + 1
+        if move_index == NO_MOVE and self._keys[entry] == zobrist_hash and self._depths[entry] >= 0:
+            # keep the best move found by an earlier visit of the same position
+            move_index = self._moves[entry]
+        self._keys[entry] = zobrist_hash
+        self._depths[entry] = depth
+        self._values[entry] = value
+        self._flags[entry] = flag
+        self._moves[entry] = move_index
+        self._generations[entry] = self._generation
+        self._stores += 1
+
+    def get_statistics(self):
+        """
+        Returns a dict with the amount of hits, misses and stores so far and how many entries are in use.
+        """
+        used = len(self._depths) - self._depths.count(-1)
+        return {'hits': self._hits, 'misses': self._misses, 'stores': self._stores, 'used_entries': used,
+                'entry_amount': len(self._keys)}
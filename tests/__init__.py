@@ -0,0 +1,2 @@
+# Description: The tests of the quoridor package. Run them with python -m pytest or python -m unittest from the root
+#              of the repository.
@@ -0,0 +1,120 @@
+# Description: Helpers shared by the tests: seeded random games played with the public QuoridorGame API, and the
+#              reference answers the fast paths are compared against. The references use the plain rules only: the
+#              legal moves are found by probing move_pawn and place_fence on copies of the position, and the
+#              distances to the goal lines by a breadth-first search over the fences of get_state.
+
+import random
+from collections import deque
+
+from quoridor import QuoridorGame
+
+
+def copy_game(game):
+    """
+    Takes a QuoridorGame and returns a new one in the same position, built from get_state.
+    """
+    return QuoridorGame.from_state(game.get_state(), game.get_board_size(), game.get_starting_fence_amount())
+
+
+def random_positions(seed, games=20, max_plies=60, fence_probability=0.5, size=9, fences=None, players=2):
+    """
+    Takes a seed, the amount of games, the most plies of each game, the probability of placing a fence when the player
+    can and the board configuration, plays that many random games with legal_moves and push_move, and yields the game
+    in every position reached, the starting one included. The same game object is yielded again after every move, so
+    a test which changes it must take its changes back before asking for the next position.
+    """
+    rng = random.Random(seed)
+    for _ in range(0, games):
+        game = QuoridorGame(size, fences, players)
+        yield game
+        for _ in range(0, rng.randrange(1, max_plies + 1)):
+            player_id = game.get_which_turn()
+            move_list = game.legal_moves(player_id)
+            if not move_list:
+                break
+            fence_list = [move for move in move_list if move[0] != 'p']
+            if fence_list and rng.random() < fence_probability:
+                move = rng.choice(fence_list)
+            else:
+                move = rng.choice([move for move in move_list if move[0] == 'p'])
+            assert game.push_move(player_id, move) is True
+            yield game
+            if any(game.is_winner(curr_id) for curr_id in range(1, players + 1)):
+                break
+
+
+def probe_pawn_moves(game, player_id):
+    """
+    Takes a QuoridorGame and a player id and returns the sorted list of the cells within two cells of the pawn which
+    move_pawn accepts, each one tried on a copy of the position.
+    """
+    pos_x, pos_y = game.get_player_position(player_id)
+    legal_list = []
+    for delta_y in range(-2, 3):
+        for delta_x in range(-2, 3):
+            aim_address = (pos_x + delta_x, pos_y + delta_y)
+            if copy_game(game).move_pawn(player_id, aim_address) is True:
+                legal_list.append(aim_address)
+    return sorted(legal_list)
+
+
+def probe_fences(game, player_id):
+    """
+    Takes a QuoridorGame and a player id and returns the sorted list of the (v or h, position) fences which
+    place_fence accepts, each one tried on a copy of the position.
+    """
+    size = game.get_board_size()
+    legal_list = []
+    for v_or_h in ('v', 'h'):
+        for co_y in range(0, size):
+            for co_x in range(0, size):
+                if copy_game(game).place_fence(player_id, v_or_h, (co_x, co_y)) is True:
+                    legal_list.append((v_or_h, (co_x, co_y)))
+    return sorted(legal_list)
+
+
+def goal_line_reached(player_id, position, size):
+    """
+    Takes a player id, a cell and the board size and returns whether the cell is on the goal line of that player.
+    """
+    if player_id == 1:
+        return position[1] == size - 1
+    if player_id == 2:
+        return position[1] == 0
+    if player_id == 3:
+        return position[0] == size - 1
+    return position[0] == 0
+
+
+def bfs_distance(state, player_id, size=9):
+    """
+    Takes a state returned by get_state, a player id and the board size, and returns the least amount of one cell
+    moves from the pawn of that player to its goal line, ignoring the other pawns, or None if it can't be reached.
+    A horizontal fence at (x, y) is between the cells (x, y - 1) and (x, y), a vertical one at (x, y) is between the
+    cells (x - 1, y) and (x, y).
+    """
+    _, player_states, fence_list = state
+    h_fence_set = {tuple(address) for v_or_h, address in fence_list if v_or_h == 'h'}
+    v_fence_set = {tuple(address) for v_or_h, address in fence_list if v_or_h == 'v'}
+    start = tuple(player_states[player_id - 1][0])
+    distance = {start: 0}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if goal_line_reached(player_id, cell, size):
+            return distance[cell]
+        co_x, co_y = cell
+        next_list = []
+        if co_y > 0 and cell not in h_fence_set:
+            next_list.append((co_x, co_y - 1))
+        if co_y < size - 1 and (co_x, co_y + 1) not in h_fence_set:
+            next_list.append((co_x, co_y + 1))
+        if co_x > 0 and cell not in v_fence_set:
+            next_list.append((co_x - 1, co_y))
+        if co_x < size - 1 and (co_x + 1, co_y) not in v_fence_set:
+            next_list.append((co_x + 1, co_y))
+        for next_cell in next_list:
+            if next_cell not in distance:
+                distance[next_cell] = distance[cell] + 1
+                queue.append(next_cell)
+    return None
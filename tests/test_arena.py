@@ -0,0 +1,93 @@
+# Description: Tests of GameArena against BitboardQuoridorGame: many games played at once in one arena must give the
+#              same results and positions as games of their own, and handles of released games must fail.
+
+import random
+import unittest
+
+from quoridor.arena import GameArena
+from quoridor.bitboard import BitboardQuoridorGame
+
+
+class ArenaTest(unittest.TestCase):
+    """
+    Plays seeded random games side by side in an arena and on separate BitboardQuoridorGame objects.
+    """
+
+    def test_same_results_and_positions(self):
+        """
+        Tries random pawn moves and fences, most of them illegal, on interleaved games of a small arena which has to
+        grow, releasing finished games so their slots are reused, and compares every result and position.
+        """
+        rng = random.Random(8)
+        arena = GameArena(2)
+        pairs = []
+        released = []
+        for _ in range(0, 3000):
+            if len(pairs) < 6:
+                bitboard = BitboardQuoridorGame()
+                pairs.append((arena.new_game(), bitboard))
+            arena_game, bitboard = rng.choice(pairs)
+            player_id = bitboard.get_which_turn()
+            if rng.random() < 0.4:
+                v_or_h = rng.choice('vh')
+                address = (rng.randrange(-1, 10), rng.randrange(-1, 10))
+                result = bitboard.place_fence(player_id, v_or_h, address)
+                self.assertEqual(arena_game.place_fence(player_id, v_or_h, address), result)
+            else:
+                pos_x, pos_y = bitboard.get_player_position(player_id)
+                address = (pos_x + rng.randrange(-2, 3), pos_y + rng.randrange(-2, 3))
+                result = bitboard.move_pawn(player_id, address)
+                self.assertEqual(arena_game.move_pawn(player_id, address), result)
+            self.assertEqual(arena_game.get_state(), bitboard.get_state())
+            self.assertEqual(arena_game.pawn_move_bits(player_id), bitboard.pawn_move_bits(player_id))
+            for curr_id in (1, 2):
+                self.assertEqual(arena_game.get_player_position(curr_id), bitboard.get_player_position(curr_id))
+                self.assertEqual(arena_game.get_fence_amount(curr_id), bitboard.get_fence_amount(curr_id))
+                self.assertEqual(arena_game.is_winner(curr_id), bitboard.is_winner(curr_id))
+            if arena_game.get_winner() is not None or rng.random() < 0.01:
+                arena.release(arena_game)
+                pairs.remove((arena_game, bitboard))
+                released.append(arena_game)
+        self.assertEqual(arena.get_game_amount(), len(pairs))
+        self.assertGreater(len(released), 10)
+        for arena_game in released:
+            with self.assertRaises(ValueError):
+                arena_game.get_state()
+            with self.assertRaises(ValueError):
+                arena_game.move_pawn(1, (4, 1))
+            with self.assertRaises(ValueError):
+                arena.release(arena_game)
+
+    def test_pack_and_load(self):
+        """
+        Checks that loading the packed tuple of a position into another game gives the same position.
+        """
+        rng = random.Random(9)
+        game = BitboardQuoridorGame()
+        other = BitboardQuoridorGame()
+        for _ in range(0, 200):
+            player_id = game.get_which_turn()
+            if rng.random() < 0.3:
+                game.place_fence(player_id, rng.choice('vh'), (rng.randrange(0, 9), rng.randrange(0, 9)))
+            else:
+                pos_x, pos_y = game.get_player_position(player_id)
+                game.move_pawn(player_id, (pos_x + rng.randrange(-1, 2), pos_y + rng.randrange(-1, 2)))
+            other.load(*game.pack())
+            self.assertEqual(other.get_state(), game.get_state())
+            self.assertEqual(other.pack(), game.pack())
+
+    def test_refused_states(self):
+        """
+        Checks that positions which don't fit in a record are refused.
+        """
+        arena = GameArena()
+        with self.assertRaises(ValueError):
+            arena.from_state((1, (((4, 0), 32, False), ((4, 8), 10, False)), ()))
+        with self.assertRaises(ValueError):
+            arena.from_state((1, (((4, 0), 5, False), ((4, 8), 5, False), ((0, 4), 5, False),
+                                  ((8, 4), 5, False)), ()))
+        self.assertEqual(arena.get_game_amount(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# Description: Tests of the bitboard backend against QuoridorGame: the same moves, legal or not, must give the same
+#              results and leave both boards in the same position. The rollouts played on it are tested here too.
+
+import random
+import unittest
+
+from quoridor import QuoridorGame
+from quoridor.bitboard import BitboardQuoridorGame, address_to_bit, bit_to_address
+from quoridor.rollout import rollout
+
+
+class BitboardTest(unittest.TestCase):
+    """
+    Compares BitboardQuoridorGame with QuoridorGame on seeded random games.
+    """
+
+    def test_same_results_and_positions(self):
+        """
+        Tries random pawn moves and fences, most of them illegal, on both boards and compares every result.
+        """
+        rng = random.Random(1)
+        for _ in range(0, 40):
+            game = QuoridorGame()
+            bitboard = BitboardQuoridorGame()
+            for _ in range(0, 150):
+                player_id = game.get_which_turn()
+                if rng.random() < 0.4:
+                    v_or_h = rng.choice('vh')
+                    address = (rng.randrange(-1, 10), rng.randrange(-1, 10))
+                    result = game.place_fence(player_id, v_or_h, address)
+                    self.assertEqual(bitboard.place_fence(player_id, v_or_h, address), result)
+                else:
+                    pos_x, pos_y = game.get_player_position(player_id)
+                    address = (pos_x + rng.randrange(-2, 3), pos_y + rng.randrange(-2, 3))
+                    result = game.move_pawn(player_id, address)
+                    self.assertEqual(bitboard.move_pawn(player_id, address), result)
+                self.assertEqual(bitboard.get_state(), game.get_state())
+                if game.is_winner(1) or game.is_winner(2):
+                    break
+
+    def test_pawn_move_bits(self):
+        """
+        Compares pawn_move_bits with legal_pawn_moves, if_fence_bit_allowed with legal_fences and the distances to
+        the goal lines.
+        """
+        rng = random.Random(2)
+        for _ in range(0, 30):
+            game = QuoridorGame()
+            for _ in range(0, 60):
+                player_id = game.get_which_turn()
+                move_list = game.legal_moves(player_id)
+                if not move_list:
+                    break
+                bitboard = BitboardQuoridorGame.from_state(game.get_state())
+                cells = bitboard.pawn_move_bits(player_id)
+                cell_list = []
+                while cells:
+                    cell = cells & -cells
+                    cell_list.append(bit_to_address(cell))
+                    cells ^= cell
+                self.assertEqual(sorted(cell_list), sorted(game.legal_pawn_moves(player_id)))
+                fence_list = [(v_or_h, (co_x, co_y)) for v_or_h in ('v', 'h') for co_y in range(0, 9)
+                              for co_x in range(0, 9)
+                              if bitboard.if_fence_bit_allowed(player_id, v_or_h, address_to_bit((co_x, co_y)))]
+                if game.get_fence_amount(player_id) > 0:
+                    self.assertEqual(sorted(fence_list), sorted(game.legal_fences(player_id)))
+                for curr_id in (1, 2):
+                    self.assertEqual(bitboard.distance_to_goal(curr_id), game.distance_to_goal(curr_id))
+                game.push_move(player_id, rng.choice(move_list))
+                if game.is_winner(1) or game.is_winner(2):
+                    break
+
+    def test_rollout_adjudication(self):
+        """
+        Checks that a rollout stopped by the move limit is won by the player closer to its goal line only when it is
+        adjudicated.
+        """
+        game = QuoridorGame.from_state((1, (((4, 5), 10, False), ((4, 6), 10, False)), ()))
+        self.assertEqual(rollout(game, max_moves=0), (None, 0))
+        self.assertEqual(rollout(game, max_moves=0, adjudicate=True), (1, 0))
+        self.assertEqual(rollout(QuoridorGame(), max_moves=0, adjudicate=True), (None, 0))
+        winner, moves_played = rollout(game, rng=random.Random(3), max_moves=4, adjudicate=True)
+        self.assertIn(winner, (1, 2))
+        self.assertLessEqual(moves_played, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
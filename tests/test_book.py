@@ -0,0 +1,116 @@
+# Description: Tests of the opening book and tablebase files: entries written are found again by hash and by position,
+#              and the pawn races solved by the tablebase agree with SearchEngine.
+
+import os
+import random
+import tempfile
+import unittest
+
+from quoridor import QuoridorGame
+from quoridor.book import (OPENING_KIND, TABLEBASE_KIND, TABLEBASE_FENCES, write_table, PositionTable,
+                           solve_pawn_race, build_tablebase)
+from quoridor.search import SearchEngine
+from tests.helpers import random_positions
+
+
+def full_fence_layout(seed):
+    """
+    Takes a seed and returns the fences of a position reached by placing random legal fences from the starting
+    position until both players have placed all of theirs.
+    """
+    rng = random.Random(seed)
+    game = QuoridorGame()
+    while len(game.get_state()[2]) < TABLEBASE_FENCES:
+        fence_list = [move for move in game.legal_moves(game.get_which_turn()) if move[0] != 'p']
+        game.push_move(game.get_which_turn(), rng.choice(fence_list))
+    return game.get_state()[2]
+
+
+class BookTest(unittest.TestCase):
+    """
+    Writes tables to a temporary directory and reads them back.
+    """
+
+    def setUp(self):
+        """
+        Makes the temporary directory of the table files.
+        """
+        self._directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        Removes the temporary directory.
+        """
+        self._directory.cleanup()
+
+    def test_round_trip(self):
+        """
+        Writes a legal move of each of a few random positions and finds every entry again by hash and by position,
+        while positions left out are not found.
+        """
+        rng = random.Random(4)
+        path = os.path.join(self._directory.name, 'opening.bin')
+        entries = {}
+        moves = {}
+        missing_list = []
+        for position in random_positions(4, 6, 40, 0.3):
+            legal_list = position.legal_moves(position.get_which_turn())
+            if not legal_list:
+                continue
+            key = position.get_zobrist_hash()
+            if rng.random() < 0.2:
+                missing_list.append(QuoridorGame.from_state(position.get_state()))
+                continue
+            move = rng.choice(legal_list)
+            entries[key] = (position.move_index(move), rng.randrange(0, 40), rng.randrange(-10 ** 6, 10 ** 6))
+            moves[key] = (QuoridorGame.from_state(position.get_state()), move)
+        write_table(path, OPENING_KIND, entries)
+        with PositionTable(path) as table:
+            self.assertEqual(len(table), len(entries))
+            self.assertEqual(table.get_kind(), OPENING_KIND)
+            self.assertEqual(table.get_configuration(), (9, 2, 10))
+            for key, (move_index, depth, score) in entries.items():
+                self.assertEqual(table.lookup(key), (move_index, depth, score))
+                game, move = moves[key]
+                self.assertEqual(table.probe(game), {'move': move, 'score': score, 'depth': depth})
+            for game in missing_list:
+                if game.get_zobrist_hash() not in entries:
+                    self.assertIsNone(table.probe(game))
+            self.assertIsNone(table.probe(QuoridorGame(7)))
+
+    def test_tablebase_agrees_with_search(self):
+        """
+        Solves a layout of 20 fences and checks that the wins and losses within 7 plies are scored the same by a
+        search of depth 8, and that layouts of other amounts of fences, which no pawn race is played on, are left out.
+        """
+        rng = random.Random(5)
+        layout = full_fence_layout(3)
+        path = os.path.join(self._directory.name, 'tablebase.bin')
+        entry_amount = build_tablebase(path, [layout, (), layout[:-1], layout[::-1]])
+        self.assertEqual(entry_amount, len(solve_pawn_race(layout)))
+        with self.assertRaises(ValueError):
+            solve_pawn_race(layout[:-1])
+        engine = SearchEngine(time_limit=60.0, max_depth=8)
+        cells = [(co_x, co_y) for co_y in range(0, 9) for co_x in range(0, 9)]
+        checked_amount = 0
+        with PositionTable(path) as table:
+            self.assertEqual(table.get_kind(), TABLEBASE_KIND)
+            self.assertIsNone(table.probe(QuoridorGame.from_state((1, (((4, 0), 0, False), ((4, 8), 0, False)),
+                                                                   ()))))
+            while checked_amount < 30:
+                pos_1, pos_2 = rng.sample(cells, 2)
+                which_turn = rng.choice((1, 2))
+                if pos_1[1] == 8 or pos_2[1] == 0:
+                    continue
+                game = QuoridorGame.from_state((which_turn, ((pos_1, 0, False), (pos_2, 0, False)), layout))
+                entry = table.probe(game)
+                # a search with one legal move doesn't search, so its score is not exact
+                if (entry is None or entry['score'] == 0 or entry['depth'] > 7 or
+                        len(game.legal_moves(which_turn)) < 2):
+                    continue
+                self.assertEqual(engine.search(game)['score'], entry['score'], (pos_1, pos_2, which_turn))
+                checked_amount += 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# Description: Tests of PositionCache against games without a cache: every rule answer of an attached game, including
+#              the ones answered from the mirror image of the position, must be the one the plain rules give.
+
+import random
+import unittest
+
+from quoridor import QuoridorGame
+from quoridor.cache import PositionCache, CACHED_METHODS
+from tests.helpers import random_positions
+
+
+def mirror_state(state, size):
+    """
+    Takes a tuple returned by QuoridorGame.get_state and the board size and returns the state of the left-right mirror
+    image of the position.
+    """
+    which_turn, player_states, fence_list = state
+    mirror_players = tuple(((size - 1 - position[0], position[1]), fence_amount, is_winner)
+                           for position, fence_amount, is_winner in player_states)
+    mirror_fences = tuple((v_or_h, (size - address[0] if v_or_h == 'v' else size - 1 - address[0], address[1]))
+                          for v_or_h, address in fence_list)
+    return which_turn, mirror_players, mirror_fences
+
+
+class PositionCacheTest(unittest.TestCase):
+    """
+    Plays seeded random games on attached games and on plain twins and compares every answer.
+    """
+
+    def assert_same_answers(self, cached, plain):
+        """
+        Takes an attached game and a plain game in the same position and compares their legal moves for every
+        player, asked twice so the second answers come from the cache.
+        """
+        for _ in range(0, 2):
+            for player_id in range(1, plain.get_player_amount() + 1):
+                self.assertEqual(cached.legal_pawn_moves(player_id), plain.legal_pawn_moves(player_id))
+                self.assertEqual(cached.legal_fence_mask(player_id), plain.legal_fence_mask(player_id))
+                self.assertEqual(cached.legal_fences(player_id), plain.legal_fences(player_id))
+
+    def test_same_answers(self):
+        """
+        Tries random pawn moves and fences, most of them illegal, on a small shared cache which has to evict, and
+        compares every result, every position and the legal moves of the position and of its mirror image.
+        """
+        for size, fences, players, seed in ((9, None, 2, 11), (5, 2, 2, 12), (7, 3, 4, 13)):
+            rng = random.Random(seed)
+            cache = PositionCache(capacity=50)
+            for _ in range(0, 3):
+                cached = QuoridorGame(size, fences, players)
+                plain = QuoridorGame(size, fences, players)
+                cache.attach(cached)
+                for _ in range(0, 150):
+                    if any(plain.is_winner(player_id) for player_id in range(1, players + 1)):
+                        break
+                    self.assert_same_answers(cached, plain)
+                    if players == 2:
+                        state = mirror_state(plain.get_state(), size)
+                        mirror_cached = QuoridorGame.from_state(state, size, fences)
+                        cache.attach(mirror_cached)
+                        self.assert_same_answers(mirror_cached, QuoridorGame.from_state(state, size, fences))
+                        cache.detach(mirror_cached)
+                        # the cut-off slots stored for the mirror image are now read back for the position
+                        self.assert_same_answers(cached, plain)
+                    player_id = plain.get_which_turn()
+                    if rng.random() < 0.3:
+                        player_id = rng.randrange(1, players + 1)
+                    if rng.random() < 0.3:
+                        v_or_h = rng.choice('vh')
+                        address = (rng.randrange(-1, size + 1), rng.randrange(-1, size + 1))
+                        result = plain.place_fence(player_id, v_or_h, address)
+                        self.assertEqual(cached.place_fence(player_id, v_or_h, address), result)
+                    else:
+                        pos_x, pos_y = plain.get_player_position(player_id)
+                        address = (pos_x + rng.randrange(-2, 3), pos_y + rng.randrange(-2, 3))
+                        result = plain.move_pawn(player_id, address)
+                        self.assertEqual(cached.move_pawn(player_id, address), result)
+                    self.assertEqual(cached.get_state(), plain.get_state())
+                cache.detach(cached)
+                for method_name in CACHED_METHODS:
+                    self.assertNotIn(method_name, cached.__dict__)
+            stats = cache.get_stats()
+            self.assertGreater(stats['hits'], 0)
+            self.assertGreater(stats['evictions'], 0)
+            self.assertEqual(stats['entries'], 50)
+            if players == 2:
+                self.assertGreater(stats['mirrored_hits'], 0)
+
+    def test_mirrored_hits(self):
+        """
+        Asks for the legal moves of fence-heavy positions which have slots that would cut a pawn off, then of their
+        mirror images, then of the positions again: the second and third askings must read the entries stored for the
+        other image, mirrored, and agree with the plain rules.
+        """
+        cache = PositionCache()
+        cut_off_amount = 0
+        for size, fences in ((9, None), (5, 3)):
+            for position in random_positions(15, 8, 60, 0.9, size, fences):
+                player_id = position.get_which_turn()
+                if not any(position.legal_fence_mask(player_id)[1]):
+                    continue
+                cut_off_amount += 1
+                state = position.get_state()
+                for curr_state in (state, mirror_state(state, size), state):
+                    cached = QuoridorGame.from_state(curr_state, size, fences)
+                    cache.attach(cached)
+                    plain = QuoridorGame.from_state(curr_state, size, fences)
+                    self.assertEqual(cached.legal_pawn_moves(player_id), plain.legal_pawn_moves(player_id))
+                    self.assertEqual(cached.legal_fence_mask(player_id), plain.legal_fence_mask(player_id))
+                    cache.detach(cached)
+        self.assertGreater(cut_off_amount, 10)
+        self.assertGreater(cache.get_stats()['mirrored_hits'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
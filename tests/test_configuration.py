@@ -0,0 +1,135 @@
+# Description: Tests of the other board configurations: smaller and larger boards, other amounts of fences and the
+#              four-player game, checked against the same references as the default game.
+
+import unittest
+
+from quoridor import QuoridorGame
+from quoridor.features import FeatureEncoder, policy_to_moves
+from quoridor.mcts import MCTSPlayer
+from quoridor.rollout import rollout
+from quoridor.search import SearchEngine
+from tests.helpers import random_positions, probe_pawn_moves, probe_fences, bfs_distance, copy_game
+
+CONFIGURATIONS = ((5, 3, 2), (7, None, 2), (11, 4, 2), (9, None, 4), (7, 3, 4))
+
+
+class ConfigurationTest(unittest.TestCase):
+    """
+    Checks the rules of each board configuration on seeded random positions.
+    """
+
+    def test_starting_position(self):
+        """
+        Checks the size, the players, the fences and the pawns of a new game.
+        """
+        game = QuoridorGame(7, None, 4)
+        self.assertEqual((game.get_board_size(), game.get_player_amount(), game.get_starting_fence_amount()),
+                         (7, 4, 5))
+        self.assertEqual([game.get_player_position(player_id) for player_id in (1, 2, 3, 4)],
+                         [(3, 0), (3, 6), (0, 3), (6, 3)])
+        self.assertEqual(QuoridorGame(5).get_starting_fence_amount(), 10)
+
+    def test_invalid_configuration(self):
+        """
+        Checks that configurations which can't be played raise ValueError.
+        """
+        for size, fences, players in ((9, None, 3), (9, None, 1), (2, None, 2), (9, -1, 2), (5, -3, 4)):
+            with self.assertRaises(ValueError):
+                QuoridorGame(size, fences, players)
+
+    def test_legal_moves(self):
+        """
+        Compares the legal moves with probing move_pawn and place_fence, and the distances with a breadth-first
+        search.
+        """
+        for seed, (size, fences, players) in enumerate(CONFIGURATIONS):
+            for index, game in enumerate(random_positions(seed, 4, 40, 0.5, size, fences, players)):
+                player_id = game.get_which_turn()
+                self.assertEqual(sorted(game.legal_pawn_moves(player_id)), probe_pawn_moves(game, player_id))
+                if index % 8 == 0:
+                    self.assertEqual(sorted(game.legal_fences(player_id)), probe_fences(game, player_id))
+                state = game.get_state()
+                for curr_id in range(1, players + 1):
+                    self.assertEqual(game.distance_to_goal(curr_id), bfs_distance(state, curr_id, size))
+
+    def test_long_distances(self):
+        """
+        Checks the distances along a winding path on large boards, longer than any path on the 9x9 board.
+        """
+        for size in (15, 34):
+            fence_list = tuple(('h', (co_x, co_y)) for co_y in range(1, size) for co_x in range(0, size)
+                               if co_x != (size - 1 if co_y % 2 else 0))
+            state = (1, (((0, 0), 0, False), ((0, size - 1), 0, False)), fence_list)
+            game = QuoridorGame.from_state(state, size, 0)
+            for player_id in (1, 2):
+                self.assertEqual(game.distance_to_goal(player_id), bfs_distance(state, player_id, size))
+                self.assertEqual(len(game.shortest_path(player_id)), game.distance_to_goal(player_id) + 1)
+            self.assertTrue(any(game.legal_fence_mask(1)[1]))
+
+    def test_four_players_never_cut_off(self):
+        """
+        Checks that no legal fence of the four-player game leaves a pawn with no way to its goal line.
+        """
+        for index, game in enumerate(random_positions(20, 6, 60, 0.8, 9, None, 4)):
+            if index % 3:
+                continue
+            state = game.get_state()
+            for v_or_h, fence_address in game.legal_fences(game.get_which_turn()):
+                fenced_state = (state[0], state[1], state[2] + ((v_or_h, fence_address),))
+                for player_id in (1, 2, 3, 4):
+                    self.assertIsNotNone(bfs_distance(fenced_state, player_id))
+
+    def test_push_pop_and_hash(self):
+        """
+        Checks that popping every move restores the starting position and that the hash matches a fresh one.
+        """
+        for seed, (size, fences, players) in enumerate(CONFIGURATIONS):
+            last_game = None
+            for game in random_positions(seed + 10, 3, 60, 0.5, size, fences, players):
+                self.assertEqual(game.get_zobrist_hash(), copy_game(game).get_zobrist_hash())
+                if last_game is not None and game is not last_game:
+                    self._check_pop_all(last_game)
+                last_game = game
+            self._check_pop_all(last_game)
+
+    def test_engines_reject_unsupported_boards(self):
+        """
+        Checks that the rollouts, MCTS and the feature encoder refuse every board but the 9x9 two-player one and the
+        search engine every game but a two-player one, instead of playing by the wrong rules.
+        """
+        for game in (QuoridorGame(7), QuoridorGame(9, None, 4)):
+            with self.assertRaises(ValueError):
+                rollout(game)
+            with self.assertRaises(ValueError):
+                MCTSPlayer(iterations=10).search(game)
+        with self.assertRaises(ValueError):
+            SearchEngine(time_limit=0.1).search(QuoridorGame(9, None, 4))
+        encoder = FeatureEncoder(1, with_distance=True)
+        for game in (QuoridorGame(5), QuoridorGame(11), QuoridorGame(9, None, 4)):
+            with self.assertRaises(ValueError):
+                encoder.encode([game])
+            with self.assertRaises(ValueError):
+                encoder.legal_masks([game])
+            with self.assertRaises(ValueError):
+                policy_to_moves(game, [1.0] * 243)
+        for game in (QuoridorGame(11), QuoridorGame(9, None, 4)):
+            with self.assertRaises(ValueError):
+                encoder.encode([game.get_state()])
+        game = QuoridorGame(7, 3)
+        result = SearchEngine(time_limit=10.0, max_depth=2).search(game)
+        self.assertIn(result['move'], game.legal_moves(1))
+        self.assertEqual(game.get_state(), QuoridorGame(7, 3).get_state())
+
+    def _check_pop_all(self, game):
+        """
+        A private method which takes a game, pops all its moves and compares it with a new game.
+        """
+        while game.pop_move():
+            pass
+        new_game = QuoridorGame(game.get_board_size(), game.get_starting_fence_amount(), game.get_player_amount())
+        self.assertEqual(game.get_state(), new_game.get_state())
+        self.assertEqual(game.get_zobrist_hash(), new_game.get_zobrist_hash())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# Description: Tests of the incremental distance-to-goal maps against a breadth-first search over the fences, as
+#              fences are placed and taken back.
+
+import unittest
+
+from tests.helpers import random_positions, bfs_distance
+
+
+class DistanceTest(unittest.TestCase):
+    """
+    Compares distance_to_goal and shortest_path with a breadth-first search on seeded random positions.
+    """
+
+    def test_distance_to_goal(self):
+        """
+        Compares the distances after every move of games with many fences, and after a fence is taken back.
+        """
+        for game in random_positions(9, games=60, max_plies=60, fence_probability=0.7):
+            state = game.get_state()
+            for player_id in (1, 2):
+                distance = bfs_distance(state, player_id)
+                self.assertEqual(game.distance_to_goal(player_id), distance)
+                path = game.shortest_path(player_id)
+                if distance is None:
+                    self.assertIsNone(path)
+                    continue
+                self.assertEqual(len(path), distance + 1)
+                self.assertEqual(path[0], game.get_player_position(player_id))
+                for cell, next_cell in zip(path, path[1:]):
+                    self.assertEqual(abs(cell[0] - next_cell[0]) + abs(cell[1] - next_cell[1]), 1)
+
+    def test_after_pop_move(self):
+        """
+        Takes back every fence of the last position of each game one by one and compares the distances each time.
+        """
+        last_game = None
+        for game in random_positions(10, games=30, max_plies=50, fence_probability=0.8):
+            if last_game is not None and game is not last_game:
+                self._pop_all(last_game)
+            last_game = game
+        self._pop_all(last_game)
+
+    def _pop_all(self, game):
+        """
+        A private method which takes a game, pops all its moves and compares the distances after each one.
+        """
+        while game.pop_move():
+            state = game.get_state()
+            for player_id in (1, 2):
+                self.assertEqual(game.distance_to_goal(player_id), bfs_distance(state, player_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# Description: Tests of the fair-play rule, which is answered from the fence vertex components kept by the game,
+#              against the flood fill of the original rules: the fence is put on the board, the fence vertices
+#              connected to the horizontal fences right in front of the opponent's pawn are collected one at a time,
+#              and the rule is broken when they reach the right side of the board (player 1) or the left side
+#              (player 2). As in the original rules, the vertices on the right and bottom sides are reached but never
+#              grown from.
+
+import unittest
+
+from tests.helpers import random_positions, copy_game
+
+
+def baseline_breaks_fair_play(state, player_id, v_or_h, fence_address, size=9):
+    """
+    Takes a state returned by get_state, the player placing the fence, the letter (v or h) and the position of a free
+    fence slot, and returns whether the original flood fill finds that the fence breaks the fair-play rule.
+    """
+    _, player_states, fence_list = state
+    h_fence_set = {tuple(address) for letter, address in fence_list if letter == 'h'}
+    v_fence_set = {tuple(address) for letter, address in fence_list if letter == 'v'}
+    for index in range(0, size):
+        h_fence_set.update(((index, 0), (index, size)))
+        v_fence_set.update(((0, index), (size, index)))
+    (h_fence_set if v_or_h == 'h' else v_fence_set).add(fence_address)
+    oppo_id = 2 if player_id == 1 else 1
+    pos_x, pos_y = player_states[oppo_id - 1][0]
+    front_range = range(pos_y + 1, size) if oppo_id == 1 else range(pos_y, 0, -1)
+    left_vertex = [(pos_x, co_y) for co_y in front_range if (pos_x, co_y) in h_fence_set]
+    used_vertex = set(left_vertex)
+    while left_vertex:
+        co_x, co_y = left_vertex.pop()
+        if co_x not in range(0, size) or co_y not in range(0, size):
+            continue
+        next_list = []
+        if (co_x, co_y) in h_fence_set:
+            next_list.append((co_x + 1, co_y))
+        if (co_x, co_y) in v_fence_set:
+            next_list.append((co_x, co_y + 1))
+        if (co_x - 1, co_y) in h_fence_set:
+            next_list.append((co_x - 1, co_y))
+        if (co_x, co_y - 1) in v_fence_set:
+            next_list.append((co_x, co_y - 1))
+        for vertex in next_list:
+            if vertex not in used_vertex:
+                used_vertex.add(vertex)
+                left_vertex.append(vertex)
+    closed_x = size if oppo_id == 1 else 0
+    return any(vertex[0] == closed_x for vertex in used_vertex)
+
+
+class FairPlayTest(unittest.TestCase):
+    """
+    Compares what place_fence answers for every free fence slot with the original flood fill.
+    """
+
+    def test_fair_play_rule(self):
+        """
+        Tries every free fence slot of seeded random positions crowded with fences on a copy of the position.
+        """
+        broken = 0
+        for index, game in enumerate(random_positions(6, games=12, max_plies=40, fence_probability=0.8)):
+            player_id = game.get_which_turn()
+            if index % 2 or game.get_fence_amount(player_id) == 0 or game.is_winner(1) or game.is_winner(2):
+                continue
+            state = game.get_state()
+            fence_set = set(state[2])
+            for v_or_h in ('v', 'h'):
+                for co_y in range(0, 9):
+                    for co_x in range(0, 9):
+                        fence_address = (co_x, co_y)
+                        # the fences on the sides are already there
+                        if (v_or_h, fence_address) in fence_set or fence_address[v_or_h == 'h'] == 0:
+                            continue
+                        expected = baseline_breaks_fair_play(state, player_id, v_or_h, fence_address)
+                        result = copy_game(game).place_fence(player_id, v_or_h, fence_address)
+                        self.assertEqual(result == 'breaks the fair play rule', expected,
+                                         (state, v_or_h, fence_address))
+                        self.assertEqual(result is True, not expected)
+                        broken += expected
+        self.assertGreater(broken, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
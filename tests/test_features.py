@@ -0,0 +1,40 @@
+# Description: Tests of the feature encoder against the positions it encodes: the pawns, the fences, the fences left,
+#              the side to move and the distance maps, compared with QuoridorGame.
+
+import unittest
+
+from quoridor.features import FeatureEncoder, UNREACHABLE_DISTANCE
+from tests.helpers import random_positions, copy_game
+
+
+class FeatureEncoderTest(unittest.TestCase):
+    """
+    Encodes batches of seeded random positions and checks every plane.
+    """
+
+    def test_planes(self):
+        """
+        Encodes the same positions as games and as state tuples, twice with one encoder, and compares the planes with
+        the positions.
+        """
+        game_list = [copy_game(position) for position in random_positions(4, 12, 80, 0.4)]
+        encoder = FeatureEncoder(len(game_list), with_distance=True)
+        encoder.encode(game_list[::-1])
+        planes = encoder.encode(game_list).copy()
+        self.assertTrue((encoder.encode([game.get_state() for game in game_list]) == planes).all())
+        for index, game in enumerate(game_list):
+            which_turn, player_states, fence_list = game.get_state()
+            for player_id, (position, fence_amount, is_winner) in enumerate(player_states, 1):
+                pos_x, pos_y = position
+                self.assertEqual(planes[index, player_id - 1].sum(), 1)
+                self.assertEqual(planes[index, player_id - 1, pos_y, pos_x], 1)
+                self.assertTrue((planes[index, 3 + player_id] == fence_amount).all())
+                distance = game.distance_to_goal(player_id)
+                self.assertEqual(planes[index, 6 + player_id, pos_y, pos_x],
+                                 UNREACHABLE_DISTANCE if distance is None else distance)
+            self.assertEqual(planes[index, 2].sum() + planes[index, 3].sum(), len(fence_list))
+            self.assertTrue((planes[index, 6] == (which_turn == 1)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# Description: Tests of legal_fence_mask, which answers every fence slot in one pass, against legal_fences and against
+#              a breadth-first search run with each free slot fenced.
+
+import unittest
+
+from tests.helpers import random_positions, bfs_distance
+
+
+class FenceMaskTest(unittest.TestCase):
+    """
+    Compares both lists of legal_fence_mask with the slot by slot answers on seeded random positions.
+    """
+
+    def test_legal_fence_mask(self):
+        """
+        Checks the legal list against legal_fences for both players, and the cut-off list against a breadth-first
+        search of both pawns with the slot fenced.
+        """
+        cut_off = 0
+        for index, game in enumerate(random_positions(11, games=12, max_plies=50, fence_probability=0.8)):
+            if index % 2:
+                continue
+            player_id = game.get_which_turn()
+            for curr_id in (player_id, 3 - player_id):
+                legal_mask, _ = game.legal_fence_mask(curr_id)
+                legal_list = [game.index_move(move_index) for move_index, legal in enumerate(legal_mask) if legal]
+                self.assertEqual(sorted(legal_list), sorted(game.legal_fences(curr_id)))
+            state = game.get_state()
+            fence_set = set(state[2])
+            _, cut_off_mask = game.legal_fence_mask(player_id)
+            for move_index, is_cut_off in enumerate(cut_off_mask):
+                v_or_h, fence_address = game.index_move(move_index)
+                if v_or_h == 'p' or (v_or_h, fence_address) in fence_set or fence_address[v_or_h == 'h'] == 0:
+                    self.assertIs(is_cut_off, False)
+                    continue
+                fenced_state = (state[0], state[1], state[2] + ((v_or_h, fence_address),))
+                expected = any(bfs_distance(fenced_state, curr_id) is None for curr_id in (1, 2))
+                self.assertEqual(is_cut_off, expected, (state, v_or_h, fence_address))
+                cut_off += expected
+        self.assertGreater(cut_off, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
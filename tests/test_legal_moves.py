@@ -0,0 +1,50 @@
+# Description: Tests of legal_pawn_moves, legal_fences and legal_moves against the rules themselves: every move they
+#              list must be accepted by move_pawn or place_fence, and every move those accept must be listed.
+
+import unittest
+
+from quoridor import QuoridorGame
+from tests.helpers import random_positions, probe_pawn_moves, probe_fences
+
+
+class LegalMovesTest(unittest.TestCase):
+    """
+    Compares the legal move lists with probing move_pawn and place_fence on copies of seeded random positions.
+    """
+
+    def test_legal_pawn_moves(self):
+        """
+        Compares legal_pawn_moves with the cells move_pawn accepts, for the player to move and the one waiting.
+        """
+        for game in random_positions(3, games=15, max_plies=60):
+            player_id = game.get_which_turn()
+            self.assertEqual(sorted(game.legal_pawn_moves(player_id)), probe_pawn_moves(game, player_id))
+            self.assertEqual(game.legal_pawn_moves(3 - player_id), [])
+
+    def test_legal_fences(self):
+        """
+        Compares legal_fences with the fences place_fence accepts.
+        """
+        for index, game in enumerate(random_positions(4, games=12, max_plies=40, fence_probability=0.7)):
+            if index % 3 == 0:
+                player_id = game.get_which_turn()
+                self.assertEqual(sorted(game.legal_fences(player_id)), probe_fences(game, player_id))
+
+    def test_legal_moves(self):
+        """
+        Checks that legal_moves is the pawn moves followed by the fences, and empty once the game has been won.
+        """
+        game = QuoridorGame()
+        self.assertEqual(len(game.legal_moves(1)), 3 + 2 * 72)
+        self.assertEqual(game.legal_moves(2), [])
+        for game in random_positions(5, games=10, max_plies=200, fence_probability=0.2):
+            player_id = game.get_which_turn()
+            move_list = game.legal_moves(player_id)
+            expected_list = [('p', address) for address in game.legal_pawn_moves(player_id)]
+            self.assertEqual(move_list, expected_list + game.legal_fences(player_id))
+            if game.is_winner(1) or game.is_winner(2):
+                self.assertEqual(move_list, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# Description: Tests of Ponderer: a reply pondered to the end is answered from pondering, a reply still being pondered
+#              is stopped at the time of a normal move, and a reply never pondered, or stopped before its first depth,
+#              is searched as usual.
+
+import time
+import unittest
+
+from quoridor import QuoridorGame
+from quoridor.ponder import Ponderer
+
+
+class StallingEngine:
+    """
+    Represents a search engine whose pondered searches make no progress until they are stopped, wrapped around a real
+    engine for the searches of the engine's own moves.
+    """
+
+    def __init__(self, engine):
+        """
+        Takes the real SearchEngine.
+        """
+        self._engine = engine
+
+    def search(self, game, time_limit=None, stop_event=None):
+        """
+        Takes the arguments of SearchEngine.search. Waits for the stop event, if any, and returns a search which
+        finished no depth; searches with the real engine otherwise.
+        """
+        if stop_event is None:
+            return self._engine.search(game, time_limit)
+        stop_event.wait()
+        return {'move': game.legal_moves(game.get_which_turn())[0], 'score': 0, 'depth': 0, 'nodes': 0,
+                'seconds': 0.0, 'nodes_per_second': 0.0}
+
+
+def opening_position():
+    """
+    Returns a game after two pawn moves of each player, with player 1 to move.
+    """
+    game = QuoridorGame()
+    for player_id, address in ((1, (4, 1)), (2, (4, 7)), (1, (4, 2)), (2, (4, 6))):
+        game.move_pawn(player_id, address)
+    return game
+
+
+class PonderTest(unittest.TestCase):
+    """
+    Ponders the replies to a move of the engine and makes the opponent's move before or after the pondering ends.
+    """
+
+    def wait_for_pondering(self, ponderer):
+        """
+        Takes a ponderer which was just started and waits until it is searching its first reply.
+        """
+        deadline = time.perf_counter() + 10.0
+        while ponderer._current is None:
+            self.assertLess(time.perf_counter(), deadline)
+            time.sleep(0.001)
+
+    def test_finished_and_unpondered_replies(self):
+        """
+        Lets the pondering end, then checks that a pondered reply is answered from it and one which wasn't is
+        searched.
+        """
+        for pondered in (True, False):
+            ponderer = Ponderer(time_limit=0.5, max_depth=2, replies=3)
+            game = opening_position()
+            game.push_move(1, ponderer.search(game)['move'])
+            reply_list = ponderer._predict_replies(game)
+            ponderer.start(game)
+            while ponderer.is_pondering():
+                time.sleep(0.01)
+            if pondered:
+                reply = reply_list[0]
+            else:
+                reply = next(move for move in game.legal_moves(2) if move not in reply_list)
+            game.push_move(2, reply)
+            result = ponderer.search(game)
+            self.assertEqual(result['pondered'], pondered)
+            self.assertIn(result['move'], game.legal_moves(1))
+            self.assertEqual(ponderer.get_stats()['pondered'], len(reply_list))
+            self.assertEqual(ponderer.get_stats()['hits'], 1 if pondered else 0)
+            self.assertEqual(ponderer.get_stats()['misses'], 1 if pondered else 2)
+            self.assertFalse(ponderer.is_pondering())
+
+    def test_running_reply(self):
+        """
+        Makes the reply being pondered while its search runs: the search is stopped at the time of a normal move and
+        its last finished depth is taken.
+        """
+        ponderer = Ponderer(time_limit=0.2, ponder_time=60.0)
+        game = opening_position()
+        game.push_move(1, ('p', (4, 3)))
+        reply_list = ponderer._predict_replies(game)
+        ponderer.start(game)
+        self.wait_for_pondering(ponderer)
+        game.push_move(2, reply_list[0])
+        result = ponderer.search(game)
+        self.assertTrue(result['pondered'])
+        self.assertGreater(result['depth'], 0)
+        self.assertLess(result['wait_seconds'], 5.0)
+        self.assertEqual(ponderer.get_stats()['running_hits'], 1)
+        self.assertFalse(ponderer.is_pondering())
+
+    def test_running_reply_without_depth(self):
+        """
+        Makes the reply being pondered while its search hasn't finished a depth: the position is searched as usual.
+        """
+        ponderer = Ponderer(time_limit=0.2, ponder_time=60.0)
+        ponderer._engine = StallingEngine(ponderer._engine)
+        game = opening_position()
+        game.push_move(1, ('p', (4, 3)))
+        reply_list = ponderer._predict_replies(game)
+        ponderer.start(game)
+        self.wait_for_pondering(ponderer)
+        game.push_move(2, reply_list[0])
+        result = ponderer.search(game)
+        self.assertFalse(result['pondered'])
+        self.assertGreater(result['depth'], 0)
+        self.assertEqual(ponderer.get_stats()['running_hits'], 0)
+        self.assertEqual(ponderer.get_stats()['misses'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# Description: Tests of push_move and pop_move: taking moves back must restore the position exactly, its Zobrist
+#              hash and the answers of the rule checks included.
+
+import random
+import unittest
+
+from quoridor import QuoridorGame
+from tests.helpers import random_positions, copy_game
+
+
+def snapshot(game):
+    """
+    Takes a QuoridorGame and returns a tuple of everything the tests compare: the state, the Zobrist hash, the
+    distances to the goal lines and the legal moves of the player to move.
+    """
+    player_id = game.get_which_turn()
+    return (game.get_state(), game.get_zobrist_hash(), game.distance_to_goal(1), game.distance_to_goal(2),
+            game.legal_moves(player_id))
+
+
+class PushPopTest(unittest.TestCase):
+    """
+    Pushes random sequences of legal moves on seeded random positions and pops them back.
+    """
+
+    def test_round_trips(self):
+        """
+        Pushes up to six random legal moves, checks the hash after each one, then pops them all back.
+        """
+        rng = random.Random(7)
+        for game in random_positions(8, games=25, max_plies=80):
+            before = snapshot(game)
+            pushed = 0
+            for _ in range(0, rng.randrange(1, 7)):
+                player_id = game.get_which_turn()
+                move_list = game.legal_moves(player_id)
+                if not move_list:
+                    break
+                self.assertIs(game.push_move(player_id, rng.choice(move_list)), True)
+                pushed += 1
+                self.assertEqual(game.get_zobrist_hash(), copy_game(game).get_zobrist_hash())
+            for _ in range(0, pushed):
+                self.assertNotEqual(game.pop_move(), False)
+            self.assertEqual(snapshot(game), before)
+
+    def test_refused_moves_are_not_pushed(self):
+        """
+        Checks that a move refused by the rules leaves nothing to pop, and that pop_move returns the move taken back.
+        """
+        game = QuoridorGame()
+        self.assertIs(game.pop_move(), False)
+        self.assertIs(game.push_move(2, ('p', (4, 7))), False)
+        self.assertIs(game.push_move(1, ('p', (4, 2))), False)
+        self.assertIs(game.pop_move(), False)
+        self.assertIs(game.push_move(1, ('h', (4, 1))), True)
+        self.assertIs(game.push_move(2, ('h', (4, 1))), False)
+        self.assertEqual(game.pop_move(), (1, ('h', (4, 1))))
+        self.assertEqual(snapshot(game), snapshot(QuoridorGame()))
+
+    def test_winning_move(self):
+        """
+        Checks that taking back a winning move takes the win back too.
+        """
+        game = QuoridorGame.from_state((1, (((4, 7), 10, False), ((0, 0), 10, False)), ()))
+        before = snapshot(game)
+        self.assertIs(game.push_move(1, ('p', (4, 8))), True)
+        self.assertIs(game.is_winner(1), True)
+        self.assertEqual(game.legal_moves(2), [])
+        game.pop_move()
+        self.assertIs(game.is_winner(1), False)
+        self.assertEqual(snapshot(game), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# Description: Tests of the binary record format: positions and games written to record files are read back the same,
+#              and files cut short or configurations which don't fit the format are refused.
+
+import os
+import random
+import tempfile
+import unittest
+
+from quoridor import QuoridorGame
+from quoridor.records import RecordCodec, PositionWriter, PositionReader, GameRecordWriter, GameRecordReader
+from tests.helpers import random_positions
+
+
+class RecordTest(unittest.TestCase):
+    """
+    Writes seeded random games to record files in a temporary directory and reads them back.
+    """
+
+    def setUp(self):
+        """
+        Makes the temporary directory of the record files.
+        """
+        self._directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        Removes the temporary directory.
+        """
+        self._directory.cleanup()
+
+    def test_positions(self):
+        """
+        Writes positions of the 9x9 and of the 7x7 four-player game and reads them back in order and by number.
+        """
+        for size, fences, players in ((9, None, 2), (7, 3, 4)):
+            path = os.path.join(self._directory.name, 'positions_%d.bin' % size)
+            state_list = [game.get_state() for game in random_positions(size, 4, 40, 0.5, size, fences, players)]
+            with PositionWriter(path, size, players, fences) as writer:
+                for state in state_list:
+                    writer.write_state(state)
+            with PositionReader(path) as reader:
+                self.assertEqual(list(reader), state_list)
+                self.assertEqual(reader[-1], state_list[-1])
+
+    def test_games(self):
+        """
+        Writes random games and reads their moves back.
+        """
+        rng = random.Random(6)
+        path = os.path.join(self._directory.name, 'games.bin')
+        move_lists = []
+        with GameRecordWriter(path) as writer:
+            for _ in range(0, 5):
+                game = QuoridorGame()
+                move_list = []
+                for _ in range(0, rng.randrange(0, 60)):
+                    legal_list = game.legal_moves(game.get_which_turn())
+                    if not legal_list or game.is_winner(1) or game.is_winner(2):
+                        break
+                    move = rng.choice(legal_list)
+                    game.push_move(game.get_which_turn(), move)
+                    move_list.append(move)
+                move_lists.append(move_list)
+                writer.write_game(move_list)
+        with GameRecordReader(path) as reader:
+            self.assertEqual(list(reader.iter_games()), move_lists)
+
+    def test_cut_off_file(self):
+        """
+        Checks that a game record file cut short anywhere in its last game is refused instead of read as a shorter
+        game.
+        """
+        path = os.path.join(self._directory.name, 'games.bin')
+        with GameRecordWriter(path) as writer:
+            writer.write_game([('p', (4, 1)), ('p', (4, 7)), ('p', (4, 2))])
+            writer.write_game([('p', (4, 1)), ('p', (4, 7))] * 5)
+        with open(path, 'rb') as record_file:
+            data = record_file.read()
+        for cut in (1, 3, 10, 11):
+            with open(path, 'wb') as record_file:
+                record_file.write(data[:-cut])
+            with GameRecordReader(path) as reader:
+                with self.assertRaises(ValueError):
+                    list(reader.iter_games())
+
+    def test_configurations(self):
+        """
+        Checks that codecs are refused for configurations which don't fit in the format.
+        """
+        for size, players, fences in ((9, 2, 256), (9, 2, 1000), (9, 2, -1), (148, 2, 10), (2, 2, 10), (9, 3, 10)):
+            with self.assertRaises(ValueError):
+                RecordCodec(size, players, fences)
+        self.assertEqual(RecordCodec(147, 2, 255).get_move_width(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
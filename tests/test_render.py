@@ -0,0 +1,123 @@
+# Description: Tests of BoardRenderer in diff mode: the text written for every frame, played on a simple terminal
+#              screen holding the previous frame, must leave exactly the new frame on it.
+
+import io
+import random
+import re
+import unittest
+
+from quoridor import QuoridorGame
+from quoridor.render import BoardRenderer
+
+_CONTROL = re.compile(r'\x1b\[(?:(\d+);(\d+))?H|\x1b\[2J|\n|[^\x1b\n]+')
+
+
+class Screen:
+    """
+    Represents a terminal screen which understands the text BoardRenderer writes: the cursor moves, clearing the
+    screen, new lines and printable characters.
+    """
+
+    def __init__(self):
+        """
+        Makes an empty screen with the cursor in the top left corner.
+        """
+        self._cells = {}
+        self._row = 1
+        self._column = 1
+
+    def write(self, text):
+        """
+        Takes a text and plays it on the screen.
+        """
+        position = 0
+        while position < len(text):
+            match = _CONTROL.match(text, position)
+            if match is None:
+                raise ValueError('unknown control sequence at %r' % text[position:position + 10])
+            token = match.group(0)
+            if token == '\x1b[2J':
+                self._cells = {}
+            elif token == '\n':
+                self._row += 1
+                self._column = 1
+            elif token.startswith('\x1b['):
+                self._row = int(match.group(1) or 1)
+                self._column = int(match.group(2) or 1)
+            else:
+                for character in token:
+                    self._cells[(self._row, self._column)] = character
+                    self._column += 1
+            position = match.end()
+
+    def get_lines(self, row_amount, width):
+        """
+        Takes the amount of rows and the width to read and returns the lines on the screen, blanks filled with spaces.
+        """
+        return [''.join(self._cells.get((row, column), ' ') for column in range(1, width + 1))
+                for row in range(1, row_amount + 1)]
+
+    def get_cursor(self):
+        """
+        Returns the tuple of the row and the column of the cursor.
+        """
+        return self._row, self._column
+
+
+class BoardRendererTest(unittest.TestCase):
+    """
+    Draws frames of seeded random games in diff mode and plays the written text on a Screen.
+    """
+
+    def test_changes_reproduce_frames(self):
+        """
+        Plays several games a move at a time, with labels of changing lengths, and checks after every frame that the
+        screen holds the new frame and the cursor is left under it, and that a frame with no change writes nothing.
+        """
+        rng = random.Random(10)
+        stream = io.StringIO()
+        screen = Screen()
+        renderer = BoardRenderer(stream, diff=True, per_row=3)
+        game_list = [QuoridorGame() for _ in range(0, 5)] + [QuoridorGame(5, 2)]
+        label_list = ['game %d' % index for index in range(0, len(game_list))]
+        small_amount = 0
+        for frame_number in range(0, 200):
+            index = rng.randrange(0, len(game_list))
+            game = game_list[index]
+            move_list = game.legal_moves(game.get_which_turn())
+            if game.is_winner(1) or game.is_winner(2) or not move_list:
+                game_list[index] = game = QuoridorGame(game.get_board_size(), game.get_starting_fence_amount())
+                move_list = game.legal_moves(1)
+            game.push_move(game.get_which_turn(), rng.choice(move_list))
+            label_list[index] = 'game %d' % index + '!' * rng.randrange(0, 12)
+            text = renderer.draw(game_list, label_list)
+            self.assertEqual(stream.getvalue()[-len(text):], text)
+            lines = renderer.frame_lines(game_list, label_list)
+            screen.write(text)
+            self.assertEqual(screen.get_lines(len(lines), len(lines[0])), lines, frame_number)
+            self.assertEqual(screen.get_cursor(), (len(lines) + 1, 1))
+            if frame_number > 0:
+                self.assertNotIn('\x1b[2J', text)
+                small_amount += len(text) < len('\n'.join(lines)) // 4
+            self.assertEqual(renderer.draw(game_list, label_list), '')
+        self.assertGreater(small_amount, 150)
+
+    def test_new_frame_size(self):
+        """
+        Checks that a frame of another size is drawn whole on a cleared screen, and that reset does the same.
+        """
+        renderer = BoardRenderer(io.StringIO(), diff=True)
+        game_list = [QuoridorGame(), QuoridorGame()]
+        screen = Screen()
+        for games, clears in ((game_list, True), (game_list[:1], True), (game_list[:1], False)):
+            text = renderer.draw(games)
+            self.assertEqual('\x1b[2J' in text, clears)
+            screen.write(text)
+            lines = renderer.frame_lines(games)
+            self.assertEqual(screen.get_lines(len(lines), len(lines[0])), lines)
+        renderer.reset()
+        self.assertIn('\x1b[2J', renderer.draw(game_list[:1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# Description: Tests of the replay pipeline: legal games are replayed to the end, and every kind of bad move is
+#              flagged with its reason instead of crashing the replay.
+
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from quoridor import QuoridorGame
+from quoridor.records import GameRecordWriter
+from quoridor.replay import GameReplayer, open_games, main, MALFORMED, NOT_YOUR_TURN, REFUSED, AFTER_THE_END
+
+
+class ReplayTest(unittest.TestCase):
+    """
+    Replays short hand-written games with GameReplayer.
+    """
+
+    def test_legal_game(self):
+        """
+        Replays a legal opening, with the addresses as lists as they come from JSON.
+        """
+        result = GameReplayer().replay('legal', [[1, [4, 1]], [2, 'h', [4, 2]], (1, (3, 1))])
+        self.assertEqual(result, {'game': 'legal', 'moves': 3, 'winner': None, 'illegal_move': None,
+                                  'reason': None})
+
+    def test_malformed_moves(self):
+        """
+        Checks that a move whose player id or coordinates are not integers is flagged as malformed, rather than
+        rounded, taken as an integer or left to crash the replay.
+        """
+        for move in ((1, (4.9, 1.2)), (True, (4, 1)), (1.0, (4, 1)), ('1', (4, 1)), (1, ('4', 1)), (1, (4, 1, 2)),
+                     (1, 'ab'), (1, None), (1,), 5, (1, 'x', (4, 4)), (3, (4, 1))):
+            result = GameReplayer().replay('bad', [move])
+            self.assertEqual((result['illegal_move'], result['reason']), (0, MALFORMED), move)
+
+    def test_flagged_moves(self):
+        """
+        Checks the reasons of moves which are well formed but not allowed.
+        """
+        self.assertEqual(GameReplayer().replay('turn', [(2, (4, 7))])['reason'], NOT_YOUR_TURN)
+        self.assertEqual(GameReplayer().replay('refused', [(1, (4, 2))])['reason'], REFUSED)
+        race = [(1, (4, 1)), (2, (3, 8)), (1, (4, 2)), (2, (4, 8)), (1, (4, 3)), (2, (3, 8)), (1, (4, 4)),
+                (2, (4, 8)), (1, (4, 5)), (2, (3, 8)), (1, (4, 6)), (2, (4, 8)), (1, (4, 7)), (2, (3, 8)),
+                (1, (4, 8)), (2, (4, 8))]
+        result = GameReplayer().replay('race', race)
+        self.assertEqual((result['winner'], result['moves'], result['reason']), (1, 15, AFTER_THE_END))
+
+    def test_record_file_configuration(self):
+        """
+        Writes random games of the 7x7 four-player game with 3 fences each to a record file and checks that they
+        are replayed on that board from its header alone, and that options naming another board are refused.
+        """
+        rng = random.Random(12)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.bin')
+            with GameRecordWriter(path, 7, 4, 3) as writer:
+                for _ in range(0, 5):
+                    game = QuoridorGame(7, 3, 4)
+                    move_list = []
+                    for _ in range(0, 40):
+                        legal_list = game.legal_moves(game.get_which_turn())
+                        if not legal_list:
+                            break
+                        move = rng.choice(legal_list)
+                        game.push_move(game.get_which_turn(), move)
+                        move_list.append(move)
+                    writer.write_game(move_list)
+            configuration, games = open_games(path)
+            self.assertEqual(configuration, (7, 4, 3))
+            self.assertEqual(len(list(games)), 5)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                self.assertEqual(main([path]), 0)
+            self.assertEqual(json.loads(output.getvalue().splitlines()[-1])['summary']['illegal_games'], 0)
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    main([path, '--size', '9'])
+
+
+if __name__ == '__main__':
+    unittest.main()
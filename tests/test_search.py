@@ -0,0 +1,54 @@
+# Description: Tests of the scores of wins found by SearchEngine, which must count the plies to the win from the root
+#              however the position was reached, the transposition table included.
+
+import unittest
+
+from quoridor import QuoridorGame
+from quoridor.search import SearchEngine, WIN_SCORE
+from quoridor.transposition import TranspositionTable
+
+# player 1 walks down a corridor of column 4 and player 2 is shut in the bottom left corner, so every line is forced
+CORRIDOR_FENCES = ((('h', (0, 7)), ('v', (1, 7)), ('v', (1, 8))) +
+                   tuple(('v', (co_x, co_y)) for co_x in (4, 5) for co_y in range(3, 9)))
+
+
+def corridor_position(pos_y, oppo_pos):
+    """
+    Takes the row of player 1 in the corridor and the cell of player 2, and returns the position with player 1 to move
+    and no fence left.
+    """
+    return QuoridorGame.from_state((1, (((4, pos_y), 0, False), (oppo_pos, 0, False)), CORRIDOR_FENCES))
+
+
+class WinScoreTest(unittest.TestCase):
+    """
+    Checks the distance to the win of the scores found with a fresh and with a shared transposition table.
+    """
+
+    def test_win_through_transposition(self):
+        """
+        Searches a position, then one two plies before it with the same table: the win stored for the first position
+        must be counted from the root of the second search.
+        """
+        engine = SearchEngine(time_limit=60.0, max_depth=8, table=TranspositionTable(1024 * 1024))
+        self.assertEqual(engine.search(corridor_position(6, (0, 7)))['score'], WIN_SCORE - 3)
+        result = engine.search(corridor_position(5, (0, 8)))
+        self.assertEqual(result['score'], WIN_SCORE - 5)
+        self.assertEqual(result['move'], ('p', (4, 6)))
+
+    def test_shortest_win_with_shared_table(self):
+        """
+        Searches positions further and further down the same race with one table and compares every score with a
+        fresh engine.
+        """
+        engine = SearchEngine(time_limit=60.0, max_depth=9, table=TranspositionTable(1024 * 1024))
+        for pos_y in (4, 5, 6, 7):
+            for oppo_x in (0, 8):
+                game = QuoridorGame.from_state((1, (((4, pos_y), 0, False), ((oppo_x, 7), 0, False)), ()))
+                expected = WIN_SCORE - (2 * (8 - pos_y) - 1)
+                self.assertEqual(engine.search(game)['score'], expected)
+                self.assertEqual(SearchEngine(time_limit=60.0, max_depth=9).search(game)['score'], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# Description: Tests of the requests served by QuoridorServer, called through handle_line without a socket.
+
+import asyncio
+import json
+import unittest
+
+from quoridor import QuoridorGame
+from quoridor.server import QuoridorServer
+
+
+def serve(server, request):
+    """
+    Takes a server and a request dict, serves it as one line and returns the response dict.
+    """
+    return asyncio.run(server.handle_line(json.dumps(request)))
+
+
+class ServerTest(unittest.TestCase):
+    """
+    Checks that bad requests get an error response and never an exception.
+    """
+
+    def test_new_game_settings(self):
+        """
+        Checks that only boards from 3 to 19 cells wide and amounts of fences from 0 to 255 are hosted.
+        """
+        server = QuoridorServer()
+        for request in ({'size': 2}, {'size': 20}, {'size': 10 ** 6}, {'fences': -1}, {'size': 7, 'fences': -5},
+                        {'fences': 256}, {'fences': 10 ** 6}, {'players': 3}, {'size': 'big'}):
+            response = serve(server, dict(request, op='new_game'))
+            self.assertFalse(response['ok'], request)
+        for request in ({'size': 3}, {'size': 19, 'fences': 0}, {'size': 7, 'players': 4}, {'fences': 255}):
+            self.assertTrue(serve(server, dict(request, op='new_game'))['ok'], request)
+        self.assertEqual(server.get_session_amount(), 4)
+
+    def test_moves(self):
+        """
+        Plays a pawn move and a fence in a new game and checks the legal moves found on the default executor and on
+        the event loop.
+        """
+        for offload_legal_moves in (True, False):
+            server = QuoridorServer(offload_legal_moves=offload_legal_moves)
+            game_id = serve(server, {'op': 'new_game'})['game']
+            self.assertTrue(serve(server, {'op': 'move_pawn', 'game': game_id, 'player': 1, 'to': [4, 1]})['result'])
+            self.assertTrue(serve(server, {'op': 'place_fence', 'game': game_id, 'player': 2, 'fence': 'h',
+                                           'at': [4, 3]})['result'])
+            game = QuoridorGame()
+            game.move_pawn(1, (4, 1))
+            game.place_fence(2, 'h', (4, 3))
+            response = serve(server, {'op': 'legal_moves', 'game': game_id, 'player': 1})
+            self.assertEqual(response['moves'], [[v_or_h_or_p, list(address)]
+                                                 for v_or_h_or_p, address in game.legal_moves(1)])
+
+    def test_internal_error(self):
+        """
+        Checks that a request whose handler raises an unexpected exception gets an error response with its id, and
+        is counted as an error.
+        """
+        server = QuoridorServer()
+
+        async def broken_handler(request):
+            raise KeyError('broken')
+
+        server._handlers['broken'] = broken_handler
+        response = serve(server, {'op': 'broken', 'id': 7})
+        self.assertEqual((response['ok'], response['id']), (False, 7))
+        self.assertEqual(serve(server, {'op': 'stats'})['stats']['errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# Description: Tests of the tournament runner: short seeded games, and agents refused before any game on boards they
+#              can't play.
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from quoridor.tournament import check_agents, main, play_game, run_tournament, WIN, MOVE_LIMIT
+
+
+class TournamentTest(unittest.TestCase):
+    """
+    Plays short tournaments in this process.
+    """
+
+    def test_seeded_games(self):
+        """
+        Checks that a game plays the same way from the same seed, also on a smaller board.
+        """
+        for size in (9, 7):
+            first = play_game(0, 5, ('greedy', 'random'), size, 3, 40)
+            second = play_game(0, 5, ('greedy', 'random'), size, 3, 40)
+            self.assertIn(first['reason'], (WIN, MOVE_LIMIT))
+            self.assertEqual((first['winner'], first['moves']), (second['winner'], second['moves']))
+
+    def test_unsupported_board(self):
+        """
+        Checks that MCTS is refused on the 7x7 board and bad fence amounts on every board, before any game is played
+        and before the output file is touched.
+        """
+        with self.assertRaises(ValueError):
+            check_agents(['greedy', 'mcts'], 7)
+        with self.assertRaises(ValueError):
+            check_agents(['greedy', 'random'], 9, -1)
+        with self.assertRaises(ValueError):
+            play_game(0, 1, ('mcts:iterations=5', 'greedy'), 7)
+        with self.assertRaises(ValueError):
+            next(run_tournament(['mcts:iterations=5', 'greedy'], 2, workers=0, size=7))
+        check_agents(['search', 'mcts'], 9)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.jsonl')
+            with open(path, 'w') as results_file:
+                results_file.write('kept\n')
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                main(['greedy', 'mcts', '--size', '7', '--workers', '0', '--output', path])
+            with open(path) as results_file:
+                self.assertEqual(results_file.read(), 'kept\n')
+
+    def test_error_during_game(self):
+        """
+        Checks that a ValueError raised while the games are played comes out as it is, not as a command line error.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.jsonl')
+            with mock.patch('quoridor.tournament.play_game', side_effect=ValueError('broken game')), \
+                    contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaisesRegex(ValueError, 'broken game'):
+                    main(['greedy', 'random', '--workers', '0', '--output', path])
+
+
+if __name__ == '__main__':
+    unittest.main()